@@ -0,0 +1,318 @@
+"""
+Almacén SQLite de registros
+===========================
+Guarda los registros en una base de datos SQLite local en lugar de
+mantenerlos en memoria. Las búsquedas por ID, por nombre y por campos
+(carrera, año, departamento, título, correo) y los conteos por campo se
+resuelven con consultas SQL sobre índices, así que el registro no
+necesita caber en RAM.
+
+Igual que formato_binario, este módulo trabaja con filas en el formato de
+registros.csv y recibe las funciones de conversión, de modo que no
+depende de registro_academico.
+"""
+
+import sqlite3
+from collections.abc import MutableMapping, ValuesView
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS registros (
+    id INTEGER PRIMARY KEY,
+    tipo TEXT NOT NULL,
+    nombre TEXT NOT NULL,
+    nombre_norm TEXT NOT NULL,  -- Nombre en minúsculas y sin tildes, para buscar
+    correo TEXT NOT NULL,
+    carrera TEXT,
+    anio INTEGER,
+    departamento TEXT,
+    titulo TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_registros_nombre ON registros (nombre_norm);
+CREATE INDEX IF NOT EXISTS idx_registros_correo ON registros (correo);
+-- Correos sin distinguir mayúsculas, para exigir que sean únicos
+CREATE INDEX IF NOT EXISTS idx_registros_correo_norm ON registros (lower(correo));
+CREATE INDEX IF NOT EXISTS idx_registros_carrera ON registros (carrera, anio);
+CREATE INDEX IF NOT EXISTS idx_registros_departamento ON registros (departamento);
+CREATE TABLE IF NOT EXISTS meta (
+    clave TEXT PRIMARY KEY,
+    valor TEXT NOT NULL
+);
+"""
+
+# Índice de texto completo con trigramas para búsquedas por subcadena.
+# Requiere SQLite 3.34+ compilado con FTS5; si no está, se usa LIKE.
+ESQUEMA_FTS = """
+CREATE VIRTUAL TABLE IF NOT EXISTS nombres_fts USING fts5(
+    nombre_norm, content='registros', content_rowid='id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS registros_fts_alta AFTER INSERT ON registros BEGIN
+    INSERT INTO nombres_fts (rowid, nombre_norm) VALUES (new.id, new.nombre_norm);
+END;
+CREATE TRIGGER IF NOT EXISTS registros_fts_baja AFTER DELETE ON registros BEGIN
+    INSERT INTO nombres_fts (nombres_fts, rowid, nombre_norm)
+    VALUES ('delete', old.id, old.nombre_norm);
+END;
+CREATE TRIGGER IF NOT EXISTS registros_fts_cambio AFTER UPDATE OF nombre_norm ON registros BEGIN
+    INSERT INTO nombres_fts (nombres_fts, rowid, nombre_norm)
+    VALUES ('delete', old.id, old.nombre_norm);
+    INSERT INTO nombres_fts (rowid, nombre_norm) VALUES (new.id, new.nombre_norm);
+END;
+"""
+
+COLUMNAS = 'tipo, id, nombre, correo, carrera, anio, departamento, titulo'
+FILTRABLES = ('tipo', 'carrera', 'anio', 'departamento', 'titulo', 'correo')
+SINCRONIZACION = {'siempre': 'FULL', 'lotes': 'NORMAL', 'ninguno': 'OFF'}
+
+
+def _condiciones(criterios):
+    """
+    Convierte criterios campo -> valor en condiciones SQL con parámetros.
+    El correo se compara sin distinguir mayúsculas ni espacios alrededor,
+    como en el registro en memoria, usando idx_registros_correo_norm.
+
+    Returns:
+        tuple: (lista de condiciones, lista de parámetros)
+
+    Raises:
+        ValueError: Si algún campo no es filtrable
+    """
+    condiciones = []
+    parametros = []
+    for campo, valor in criterios.items():
+        if campo not in FILTRABLES:
+            raise ValueError(f"Campo no filtrable: {campo}")
+        if campo == 'correo':
+            condiciones.append('lower(correo) = ?')
+            parametros.append(str(valor).strip().lower())
+        else:
+            condiciones.append(f'{campo} = ?')
+            parametros.append(valor)
+    return condiciones, parametros
+
+
+class AlmacenSQLite(MutableMapping):
+    """
+    Diccionario ID -> registro guardado en una tabla SQLite.
+
+    Los cambios se acumulan en una transacción que se confirma con
+    confirmar() (guardar_datos) y se descartan al cerrar sin confirmar,
+    igual que "salir sin guardar" con el CSV.
+    """
+
+    def __init__(self, ruta, fabrica, a_fila, normalizar, modo_durabilidad='siempre'):
+        """
+        Abre (o crea) la base de datos.
+
+        Args:
+            ruta (str): Archivo de la base de datos
+            fabrica (callable): Convierte una fila en un registro
+            a_fila (callable): Convierte un registro en una fila
+            normalizar (callable): Normaliza nombres para las búsquedas
+            modo_durabilidad (str): 'siempre', 'lotes' o 'ninguno'
+        """
+        self.ruta = ruta
+        self._fabrica = fabrica
+        self._a_fila = a_fila
+        self._normalizar = normalizar
+        # Los accesos desde varios hilos los serializa RegistroAcademico
+        self._con = sqlite3.connect(ruta, check_same_thread=False)
+        self._con.execute('PRAGMA journal_mode=WAL')
+        self._con.execute(f'PRAGMA synchronous={SINCRONIZACION[modo_durabilidad]}')
+        self._con.executescript(ESQUEMA)
+        try:
+            self._con.executescript(ESQUEMA_FTS)
+            self._fts = True
+        except sqlite3.OperationalError:
+            self._fts = False  # SQLite sin FTS5 o sin tokenizador de trigramas
+        if self._fts:
+            self._completar_fts()
+        fila = self._con.execute("SELECT valor FROM meta WHERE clave = 'ultimo_id'").fetchone()
+        maximo = self._con.execute('SELECT MAX(id) FROM registros').fetchone()[0]
+        self.ultimo_id = max(int(fila[0]) if fila else 0, maximo or 0)
+
+    def _completar_fts(self):
+        """
+        Reconstruye el índice de texto completo si no cubre todas las filas:
+        las insertadas antes de que existiera (o con un SQLite sin FTS5) no
+        pasaron por los disparadores. COUNT(*) sobre nombres_fts lee la
+        tabla de contenido, así que se cuentan las filas indexadas en su
+        tabla interna nombres_fts_docsize.
+        """
+        indexadas = self._con.execute('SELECT COUNT(*) FROM nombres_fts_docsize').fetchone()[0]
+        filas = self._con.execute('SELECT COUNT(*) FROM registros').fetchone()[0]
+        if indexadas != filas:
+            with self._con:
+                self._con.execute("INSERT INTO nombres_fts (nombres_fts) VALUES ('rebuild')")
+
+    def _registro(self, columnas):
+        """
+        Convierte las columnas de una fila SQL en un registro.
+        """
+        tipo, id, nombre, correo, carrera, anio, departamento, titulo = columnas
+        if tipo == 'estudiante':
+            return self._fabrica([tipo, id, nombre, correo, carrera, anio])
+        return self._fabrica([tipo, id, nombre, correo, departamento, titulo])
+
+    def _consultar(self, where='', parametros=()):
+        """
+        Ejecuta un SELECT de registros y los genera en orden de ID.
+        """
+        cursor = self._con.execute(
+            f'SELECT {COLUMNAS} FROM registros {where} ORDER BY id', parametros)
+        for columnas in cursor:
+            yield self._registro(columnas)
+
+    def __getitem__(self, id):
+        columnas = self._con.execute(
+            f'SELECT {COLUMNAS} FROM registros WHERE id = ?', (id,)).fetchone()
+        if columnas is None:
+            raise KeyError(id)
+        return self._registro(columnas)
+
+    def __setitem__(self, id, registro):
+        tipo, id, nombre, correo, grupo, extra = self._a_fila(registro)
+        if tipo == 'estudiante':
+            carrera, anio, departamento, titulo = grupo, extra, None, None
+        else:
+            carrera, anio, departamento, titulo = None, None, grupo, extra
+        # UPSERT en lugar de INSERT OR REPLACE para que se disparen los
+        # triggers de actualización del índice de texto
+        self._con.execute(
+            """INSERT INTO registros (id, tipo, nombre, nombre_norm, correo,
+                                      carrera, anio, departamento, titulo)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+               ON CONFLICT (id) DO UPDATE SET
+                   tipo = excluded.tipo, nombre = excluded.nombre,
+                   nombre_norm = excluded.nombre_norm, correo = excluded.correo,
+                   carrera = excluded.carrera, anio = excluded.anio,
+                   departamento = excluded.departamento, titulo = excluded.titulo""",
+            (id, tipo, nombre, self._normalizar(nombre), correo,
+             carrera, anio, departamento, titulo))
+
+    def __delitem__(self, id):
+        cursor = self._con.execute('DELETE FROM registros WHERE id = ?', (id,))
+        if cursor.rowcount == 0:
+            raise KeyError(id)
+
+    def __iter__(self):
+        for (id,) in self._con.execute('SELECT id FROM registros ORDER BY id'):
+            yield id
+
+    def __len__(self):
+        return self._con.execute('SELECT COUNT(*) FROM registros').fetchone()[0]
+
+    def __contains__(self, id):
+        return self._con.execute(
+            'SELECT 1 FROM registros WHERE id = ?', (id,)).fetchone() is not None
+
+    def values(self):
+        """
+        Vista de los registros que los lee con un solo SELECT.
+        """
+        return _ValoresSQLite(self)
+
+    def buscar_nombre(self, consulta):
+        """
+        Busca registros cuyo nombre contiene la consulta (sin distinguir
+        mayúsculas ni tildes).
+
+        Returns:
+            list: Registros encontrados, en orden de ID
+        """
+        consulta = self._normalizar(consulta)
+        if self._fts and len(consulta) >= 3:
+            frase = '"' + consulta.replace('"', '""') + '"'
+            return list(self._consultar(
+                'WHERE id IN (SELECT rowid FROM nombres_fts WHERE nombres_fts MATCH ?)',
+                (frase,)))
+        patron = consulta.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        return list(self._consultar("WHERE nombre_norm LIKE ? ESCAPE '\\'",
+                                    (f'%{patron}%',)))
+
+    def filtrar(self, criterios):
+        """
+        Busca registros que cumplan todos los criterios (campo = valor).
+
+        Args:
+            criterios (dict): Campos de FILTRABLES y sus valores
+
+        Returns:
+            list: Registros encontrados, en orden de ID
+        """
+        condiciones, parametros = _condiciones(criterios)
+        where = 'WHERE ' + ' AND '.join(condiciones) if condiciones else ''
+        return list(self._consultar(where, parametros))
+
+    def contar_por(self, campo, criterios):
+        """
+        Cuenta los registros por cada valor de un campo con GROUP BY.
+
+        Args:
+            campo (str): Campo de FILTRABLES por el que agrupar
+            criterios (dict): Filtros como en filtrar()
+
+        Returns:
+            dict: Valor -> número de registros, ordenado por valor
+        """
+        if campo not in FILTRABLES:
+            raise ValueError(f"Campo no agrupable: {campo}")
+        condiciones, parametros = _condiciones(criterios)
+        condiciones.insert(0, f'{campo} IS NOT NULL')
+        cursor = self._con.execute(
+            f'SELECT {campo}, COUNT(*) FROM registros WHERE {" AND ".join(condiciones)} '
+            f'GROUP BY {campo} ORDER BY {campo}', parametros)
+        return dict(cursor.fetchall())
+
+    def buscar_correo(self, correo):
+        """
+        Busca los registros con un correo, sin distinguir mayúsculas.
+        (lower() de SQLite solo cambia letras ASCII, que es lo que llevan
+        los correos en la práctica.)
+
+        Returns:
+            list: IDs encontrados, de menor a mayor
+        """
+        cursor = self._con.execute(
+            'SELECT id FROM registros WHERE lower(correo) = ? ORDER BY id',
+            (correo.strip().lower(),))
+        return [id for (id,) in cursor]
+
+    def correos_duplicados(self):
+        """
+        Devuelve los correos que tienen más de un registro.
+
+        Returns:
+            dict: Correo en minúsculas -> lista ordenada de IDs
+        """
+        cursor = self._con.execute(
+            'SELECT lower(correo), id FROM registros WHERE lower(correo) IN '
+            '(SELECT lower(correo) FROM registros GROUP BY lower(correo) HAVING COUNT(*) > 1) '
+            'ORDER BY lower(correo), id')
+        duplicados = {}
+        for correo, id in cursor:
+            duplicados.setdefault(correo, []).append(id)
+        return duplicados
+
+    def confirmar(self, ultimo_id):
+        """
+        Guarda el último ID y confirma la transacción en curso.
+        """
+        self._con.execute(
+            "INSERT INTO meta (clave, valor) VALUES ('ultimo_id', ?) "
+            "ON CONFLICT (clave) DO UPDATE SET valor = excluded.valor", (str(ultimo_id),))
+        self._con.commit()
+
+    def cerrar(self):
+        """
+        Cierra la conexión. Lo no confirmado se descarta.
+        """
+        self._con.close()
+
+
+class _ValoresSQLite(ValuesView):
+    """
+    Vista de valores de AlmacenSQLite.
+    """
+
+    def __iter__(self):
+        return self._mapping._consultar()
@@ -0,0 +1,1146 @@
+"""
+Benchmarks del Sistema de Registro Académico
+============================================
+Mide el rendimiento de las operaciones de RegistroAcademico sobre conjuntos
+de datos sintéticos. Cada benchmark genera su propio registros.csv en un
+directorio temporal, así que nunca toca los datos reales.
+
+Uso:
+    python benchmark_registro.py suite --escalas 10000,100000,1000000 --salida base.json
+    python benchmark_registro.py suite --comparar base.json --salida nuevo.json
+    python benchmark_registro.py generar registros.csv --n 100000 --docentes 0.2
+    python benchmark_registro.py busqueda --n 1000000
+    python benchmark_registro.py memoria --n 1000000
+    python benchmark_registro.py guardado --n 100000
+    python benchmark_registro.py formatos --n 1000000
+    python benchmark_registro.py paralelo --n 5000000
+    python benchmark_registro.py servidor --n 100000 --clientes 50
+    python benchmark_registro.py concurrencia --n 100000 --hilos 8
+    python benchmark_registro.py consultas --n 1000000
+    python benchmark_registro.py listado --n 500000
+    python benchmark_registro.py metricas --n 100000
+    python benchmark_registro.py aproximado --n 1000000
+    python benchmark_registro.py autoguardado --n 100000 --intervalo 1
+    python benchmark_registro.py cache --n 100000
+    python benchmark_registro.py respaldo --n 1000000
+"""
+
+import argparse
+import asyncio
+import contextlib
+import csv
+import json
+import os
+import platform
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+
+import formato_binario
+import formato_respaldo
+import registro_academico as ra
+
+SCRIPT = os.path.abspath(__file__)  # Para relanzar este script en procesos hijos
+SERVIDOR = os.path.join(os.path.dirname(SCRIPT), 'servidor_registro.py')
+
+
+# DATOS PARA EL GENERADOR SINTÉTICO
+NOMBRES = [
+    'María', 'José', 'Juan', 'Ana', 'Luis', 'Carmen', 'Jorge', 'Rosa', 'Carlos',
+    'Lucía', 'Miguel', 'Sofía', 'Andrés', 'Valeria', 'Diego', 'Camila', 'Raúl',
+    'Daniela', 'Fernando', 'Gabriela', 'Héctor', 'Isabel', 'Julián', 'Ximena',
+    'Alejandro', 'Paola', 'Ricardo', 'Natalia', 'Eduardo', 'Verónica', 'Óscar',
+    'Mónica', 'Sebastián', 'Milagros', 'Renzo', 'Yolanda', 'Wilfredo', 'Inés',
+]
+APELLIDOS = [
+    'García', 'Rodríguez', 'González', 'Fernández', 'López', 'Martínez',
+    'Sánchez', 'Pérez', 'Gómez', 'Díaz', 'Quispe', 'Mamani', 'Huamán', 'Flores',
+    'Ramírez', 'Torres', 'Vargas', 'Castillo', 'Rojas', 'Zapana', 'Chávez',
+    'Gutiérrez', 'Mendoza', 'Núñez', 'Ibáñez', 'Condori', 'Ccallo', 'Apaza',
+]
+CARRERAS = ['Sistemas', 'Civil', 'Industrial', 'Medicina', 'Derecho', 'Contabilidad']
+DEPARTAMENTOS = ['Ingeniería', 'Ciencias', 'Humanidades', 'Salud']
+TITULOS = ['Licenciado', 'Magíster', 'Doctor']
+
+
+def generar_csv(ruta, n, semilla=42, proporcion_docentes=0.1):
+    """
+    Genera un registros.csv sintético con el mismo formato que guardar_datos.
+    La misma semilla produce siempre el mismo archivo.
+
+    Args:
+        ruta (str): Archivo de salida
+        n (int): Número de registros
+        semilla (int): Semilla para que el resultado sea reproducible
+        proporcion_docentes (float): Fracción de registros que son docentes
+    """
+    azar = random.Random(semilla)
+    with open(ruta, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file, delimiter=';')
+        writer.writerow(['ultimo_id', n])
+        for id in range(1, n + 1):
+            nombre = azar.choice(NOMBRES)
+            if azar.random() < 0.2:  # Uno de cada cinco tiene dos nombres de pila
+                nombre += ' ' + azar.choice(NOMBRES)
+            nombre += f" {azar.choice(APELLIDOS)} {azar.choice(APELLIDOS)}"
+            correo = f"usuario{id}@universidad.edu"
+            if azar.random() < proporcion_docentes:
+                writer.writerow(['docente', id, nombre, correo,
+                                 azar.choice(DEPARTAMENTOS), azar.choice(TITULOS)])
+            else:
+                writer.writerow(['estudiante', id, nombre, correo,
+                                 azar.choice(CARRERAS), azar.randint(2010, 2025)])
+
+
+@contextlib.contextmanager
+def directorio_temporal():
+    """
+    Ejecuta el bloque dentro de un directorio temporal (el sistema lee y
+    escribe sus archivos en el directorio actual).
+    """
+    anterior = os.getcwd()
+    with tempfile.TemporaryDirectory() as directorio:
+        os.chdir(directorio)
+        try:
+            yield directorio
+        finally:
+            os.chdir(anterior)
+
+
+def medir(funcion, repeticiones):
+    """
+    Ejecuta una función varias veces y devuelve las latencias en milisegundos.
+    """
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return tiempos
+
+
+def bench_busqueda(args):
+    """
+    Compara la latencia de buscar_por_nombre con y sin índice de trigramas.
+    """
+    consultas = ['perez', 'Quispe Mamani', 'zapana', 'ximena ccallo', 'Ibáñez Núñez', 'ga']
+    with directorio_temporal():
+        print(f"Generando {args.n} registros...")
+        generar_csv('registros.csv', args.n)
+
+        for indice in (False, True):
+            inicio = time.perf_counter()
+            sistema = ra.RegistroAcademico(indice_nombres=indice, indices_campos=False)
+            carga = time.perf_counter() - inicio
+            modo = 'trigramas' if indice else 'recorrido'
+            print(f"\n[{modo}] carga: {carga:.2f} s")
+            print(f"{'consulta':<16}{'resultados':>12}{'mediana ms':>14}{'máx ms':>12}")
+            for consulta in consultas:
+                resultados = len(sistema.buscar_por_nombre(consulta))
+                tiempos = medir(lambda: sistema.buscar_por_nombre(consulta), args.repeticiones)
+                print(f"{consulta:<16}{resultados:>12}"
+                      f"{statistics.median(tiempos):>14.2f}{max(tiempos):>12.2f}")
+            del sistema
+
+
+def bench_memoria(args):
+    """
+    Compara la memoria usada por cada modo de almacenamiento: la de los
+    objetos de Python con tracemalloc y la residente (RSS) de una carga en
+    un proceso nuevo. tracemalloc no ve el archivo que el modo binario
+    abre con mmap; el RSS sí incluye las páginas que se llegaron a leer.
+    Los índices que se construyen al primer uso se fuerzan para medirlos.
+    """
+    with directorio_temporal() as directorio:
+        print(f"Generando {args.n} registros...")
+        generar_csv('registros.csv', args.n)
+        tamano = os.path.getsize('registros.csv')
+        print(f"Tamaño de registros.csv: {tamano / 2**20:.1f} MiB\n")
+
+        print(f"{'modo':<24}{'retenida MiB':>14}{'pico MiB':>12}{'bytes/registro':>16}"
+              f"{'RSS MiB':>10}")
+        formato_binario.csv_a_binario('registros.csv', 'registros.bin')
+
+        variantes = [('', False, False), (' + trigramas', True, False), (' + campos', False, True)]
+        for modo in ra.RegistroAcademico.MODOS_ALMACEN:
+            archivo = 'registros.bin' if modo == 'binario' else 'registros.csv'
+            for sufijo, nombres, campos in variantes:
+                tracemalloc.start()
+                sistema = ra.RegistroAcademico(indice_nombres=nombres, indices_campos=campos,
+                                               modo_almacen=modo, archivo_registros=archivo)
+                construir_indices(sistema, nombres, campos)
+                actual, pico = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                del sistema
+
+                comando = [sys.executable, SCRIPT, '_carga', '--modo', modo,
+                           '--archivo', os.path.join(directorio, archivo)]
+                comando += ['--nombres'] * nombres + ['--campos'] * campos
+                salida = subprocess.run(comando, capture_output=True, text=True, check=True)
+                rss = json.loads(salida.stdout.strip().splitlines()[-1])['rss_bytes']
+                etiqueta = modo + sufijo
+                print(f"{etiqueta:<24}{actual / 2**20:>14.1f}{pico / 2**20:>12.1f}"
+                      f"{actual / args.n:>16.0f}{rss / 2**20:>10.1f}")
+        print("\nEn el modo binario la memoria retenida no incluye registros.bin "
+              "(mapeado con mmap): ver la columna RSS.")
+
+
+def construir_indices(sistema, nombres, campos):
+    """
+    Construye los índices que el sistema arma al primer uso: el de
+    trigramas en la primera búsqueda por nombre y, en los modos perezoso
+    y binario, los de campos y correos.
+    """
+    if nombres:
+        sistema._asegurar_indice_nombres()
+    if campos:
+        sistema._asegurar_indices()
+
+
+def bench_guardado(args):
+    """
+    Mide la latencia de una instantánea completa (lo que escribe
+    guardar_datos cuando hay cambios) y de cada anotación del journal en
+    cada modo de durabilidad.
+    """
+    with directorio_temporal():
+        print(f"Generando {args.n} registros...")
+        generar_csv('registros.csv', args.n)
+
+        print(f"\n{'modo':<10}{'guardar ms (mediana)':>22}{'guardar ms (máx)':>18}"
+              f"{'alta + journal µs':>20}")
+        for modo in ra.RegistroAcademico.MODOS_DURABILIDAD:
+            sistema = ra.RegistroAcademico(indice_nombres=False, indices_campos=False,
+                                           modo_durabilidad=modo, usar_journal=True,
+                                           umbral_compactacion=0)
+            guardados = medir(sistema.compactar, args.repeticiones)
+            altas = medir(lambda: sistema.agregar_docente(
+                'Nombre Apellido', f"nuevo{sistema.ultimo_id + 1}@universidad.edu",
+                'Ciencias', 'Doctor'), args.operaciones)
+            sistema.compactar()
+            sistema.cerrar()
+            print(f"{modo:<10}{statistics.median(guardados):>22.1f}{max(guardados):>18.1f}"
+                  f"{statistics.median(altas) * 1000:>20.1f}")
+
+
+def memoria_residente():
+    """
+    Memoria residente (RSS) actual del proceso en bytes. En sistemas sin
+    /proc devuelve el pico, que es lo que ofrece resource.
+    """
+    try:
+        with open('/proc/self/statm', encoding='utf-8') as file:
+            return int(file.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def memoria_pico():
+    """
+    Pico de memoria residente del proceso en bytes (VmHWM en Linux,
+    ru_maxrss en los demás sistemas).
+    """
+    try:
+        with open('/proc/self/status', encoding='utf-8') as file:
+            for linea in file:
+                if linea.startswith('VmHWM:'):
+                    return int(linea.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    import resource
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico if sys.platform == 'darwin' else pico * 1024  # macOS la da en bytes
+
+
+def bench_carga_hija(args):
+    """
+    Carga el sistema en un proceso nuevo y reporta tiempo y RSS en JSON
+    (lo usan bench_memoria, bench_formatos y bench_paralelo para que cada
+    medición empiece de cero).
+    """
+    nombres = args.indices or args.nombres
+    campos = args.indices or args.campos
+    base = memoria_residente()
+    inicio = time.perf_counter()
+    sistema = ra.RegistroAcademico(indice_nombres=nombres, indices_campos=campos,
+                                   modo_almacen=args.modo, archivo_registros=args.archivo,
+                                   procesos_carga=args.procesos)
+    carga = time.perf_counter() - inicio
+    construir_indices(sistema, nombres, campos)  # Fuera del tiempo de carga
+    rss = memoria_residente() - base
+    inicio = time.perf_counter()
+    total = sum(1 for _ in sistema.registros)
+    recorrido = time.perf_counter() - inicio
+    print(json.dumps({'carga_s': carga, 'rss_bytes': rss, 'recorrido_s': recorrido,
+                      'registros': total}))
+
+
+def bench_formatos(args):
+    """
+    Compara el tiempo de carga y la memoria residente del CSV frente al
+    formato binario con mmap.
+    """
+    with directorio_temporal() as directorio:
+        print(f"Generando {args.n} registros...")
+        generar_csv('registros.csv', args.n)
+        formato_binario.csv_a_binario('registros.csv', 'registros.bin')
+        print(f"registros.csv: {os.path.getsize('registros.csv') / 2**20:.1f} MiB, "
+              f"registros.bin: {os.path.getsize('registros.bin') / 2**20:.1f} MiB\n")
+
+        casos = [('csv', 'objetos', 'registros.csv'), ('csv', 'perezoso', 'registros.csv'),
+                 ('binario', 'binario', 'registros.bin')]
+        print(f"{'formato':<10}{'modo':<10}{'carga s':>10}{'RSS MiB':>10}{'recorrido s':>14}")
+        for formato, modo, archivo in casos:
+            salida = subprocess.run(
+                [sys.executable, SCRIPT, '_carga', '--modo', modo,
+                 '--archivo', os.path.join(directorio, archivo)],
+                capture_output=True, text=True, check=True)
+            datos = json.loads(salida.stdout.strip().splitlines()[-1])
+            print(f"{formato:<10}{modo:<10}{datos['carga_s']:>10.2f}"
+                  f"{datos['rss_bytes'] / 2**20:>10.1f}{datos['recorrido_s']:>14.2f}")
+
+
+def bench_paralelo(args):
+    """
+    Mide cómo escala la carga de registros.csv por fragmentos al aumentar
+    los procesos, de 1 (lectura secuencial) hasta todos los núcleos.
+    """
+    nucleos = os.cpu_count() or 1
+    maximo = args.maximo or nucleos
+    niveles = sorted({1, maximo, *(2 ** k for k in range(1, 7) if 2 ** k < maximo)})
+    with directorio_temporal() as directorio:
+        print(f"Generando {args.n} registros...")
+        generar_csv('registros.csv', args.n)
+        print(f"registros.csv: {os.path.getsize('registros.csv') / 2**20:.1f} MiB, "
+              f"{nucleos} núcleos, índices {'sí' if args.indices else 'no'}\n")
+
+        print(f"{'procesos':>9}{'carga s':>10}{'aceleración':>13}{'eficiencia':>12}{'RSS MiB':>10}")
+        base = None
+        for procesos in niveles:
+            comando = [sys.executable, SCRIPT, '_carga', '--modo', 'objetos',
+                       '--archivo', os.path.join(directorio, 'registros.csv'),
+                       '--procesos', str(procesos)]
+            if args.indices:
+                comando.append('--indices')
+            salida = subprocess.run(comando, capture_output=True, text=True, check=True)
+            datos = json.loads(salida.stdout.strip().splitlines()[-1])
+            base = base or datos['carga_s']
+            aceleracion = base / datos['carga_s']
+            print(f"{procesos:>9}{datos['carga_s']:>10.2f}{aceleracion:>12.2f}x"
+                  f"{aceleracion / procesos:>12.0%}{datos['rss_bytes'] / 2**20:>10.1f}")
+
+
+def peticion_aleatoria(azar, n, escrituras):
+    """
+    Elige una petición de la mezcla de carga: lecturas por ID, búsquedas,
+    páginas del listado y (con probabilidad `escrituras`) modificaciones.
+
+    Returns:
+        tuple: (método, ruta, cuerpo en bytes)
+    """
+    if azar.random() < escrituras:
+        cuerpo = json.dumps({'correo': f"cambio{azar.randint(1, 10**9)}@universidad.edu"})
+        return 'PATCH', f"/registros/{azar.randint(1, n)}", cuerpo.encode('utf-8')
+    tirada = azar.random()
+    if tirada < 0.65:
+        return 'GET', f"/registros/{azar.randint(1, n)}", b''
+    if tirada < 0.85:
+        nombre = quote(f"{azar.choice(NOMBRES)} {azar.choice(APELLIDOS)}")
+        return 'GET', f"/registros?nombre={nombre}&limite=20", b''
+    return 'GET', f"/registros?offset={azar.randint(0, n)}&limite=50", b''
+
+
+async def cliente_http(puerto, azar, args, latencias, errores, fin):
+    """
+    Cliente keep-alive: envía peticiones por una sola conexión hasta `fin`
+    y anota la latencia de cada una en milisegundos.
+    """
+    reader, writer = await asyncio.open_connection('127.0.0.1', puerto)
+    try:
+        while time.perf_counter() < fin:
+            metodo, ruta, cuerpo = peticion_aleatoria(azar, args.n, args.escrituras)
+            inicio = time.perf_counter()
+            writer.write(f"{metodo} {ruta} HTTP/1.1\r\nHost: localhost\r\n"
+                         f"Content-Length: {len(cuerpo)}\r\n\r\n".encode('latin-1') + cuerpo)
+            estado = int((await reader.readline()).split()[1])
+            largo = 0
+            while True:
+                linea = await reader.readline()
+                if linea in (b'\r\n', b''):
+                    break
+                clave, _, valor = linea.decode('latin-1').partition(':')
+                if clave.lower() == 'content-length':
+                    largo = int(valor)
+            await reader.readexactly(largo)
+            latencias.append((time.perf_counter() - inicio) * 1000)
+            if estado >= 400:
+                errores.append(estado)
+    finally:
+        writer.close()
+
+
+async def generar_carga(puerto, args):
+    """
+    Lanza los clientes concurrentes durante args.duracion segundos.
+
+    Returns:
+        tuple: (latencias en ms, códigos de error, segundos transcurridos)
+    """
+    latencias = []
+    errores = []
+    inicio = time.perf_counter()
+    fin = inicio + args.duracion
+    await asyncio.gather(*(
+        cliente_http(puerto, random.Random(i), args, latencias, errores, fin)
+        for i in range(args.clientes)))
+    return latencias, errores, time.perf_counter() - inicio
+
+
+def bench_servidor(args):
+    """
+    Prueba de carga de servidor_registro.py: lo arranca en otro proceso y
+    mide peticiones por segundo y latencias con clientes keep-alive.
+    """
+    with directorio_temporal() as directorio:
+        print(f"Generando {args.n} registros...")
+        generar_csv('registros.csv', args.n)
+        with socket.socket() as libre:  # Pide al sistema un puerto libre
+            libre.bind(('127.0.0.1', 0))
+            puerto = libre.getsockname()[1]
+
+        proceso = subprocess.Popen([sys.executable, SERVIDOR, '--puerto', str(puerto)],
+                                   cwd=directorio, stdout=subprocess.PIPE, text=True)
+        try:
+            for linea in proceso.stdout:  # Espera a que termine de cargar
+                if 'Servidor escuchando' in linea:
+                    break
+            else:
+                raise RuntimeError("El servidor terminó sin arrancar")
+            print(f"Carga: {args.clientes} clientes durante {args.duracion} s "
+                  f"({args.escrituras:.0%} escrituras)")
+            latencias, errores, transcurrido = asyncio.run(generar_carga(puerto, args))
+        finally:
+            proceso.terminate()
+            proceso.wait()
+
+    percentiles = statistics.quantiles(latencias, n=100)
+    print(f"\n{'peticiones':>12}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}"
+          f"{'máx ms':>10}{'errores':>10}")
+    print(f"{len(latencias):>12}{len(latencias) / transcurrido:>10.0f}"
+          f"{percentiles[49]:>10.2f}{percentiles[98]:>10.2f}{max(latencias):>10.2f}"
+          f"{len(errores):>10}")
+
+
+def trabajador_mixto(sistema, semilla, args, fin):
+    """
+    Ejecuta operaciones al azar sobre el sistema hasta `fin` y comprueba que
+    ningún registro leído esté a medio modificar: los cambios ponen siempre
+    a la vez el nombre "Cambio k" y el correo "cambio.k@...".
+
+    Returns:
+        tuple: (Counter de operaciones, lista de errores)
+    """
+    azar = random.Random(semilla)
+    operaciones = Counter()
+    errores = []
+
+    def comprobar(registro):
+        if registro is not None and registro.nombre.startswith('Cambio '):
+            k = registro.nombre.split()[1]
+            if registro.correo != f"cambio.{k}@universidad.edu":
+                errores.append(f"Registro {registro.id} a medio modificar: "
+                               f"{registro.nombre} / {registro.correo}")
+
+    while time.perf_counter() < fin:
+        tirada = azar.random()
+        id = azar.randint(1, sistema.ultimo_id)
+        try:
+            if tirada < args.escrituras / 3:
+                correo = f"nuevo.{semilla}.{operaciones['alta']}@universidad.edu"
+                sistema.agregar_estudiante(f"{azar.choice(NOMBRES)} {azar.choice(APELLIDOS)}",
+                                           correo, 'Sistemas', 2024)
+                operaciones['alta'] += 1
+            elif tirada < args.escrituras * 2 / 3:
+                k = azar.randint(1, 10**9)
+                sistema.modificar_registro(id, nombre=f"Cambio {k}",
+                                           correo=f"cambio.{k}@universidad.edu")
+                operaciones['cambio'] += 1
+            elif tirada < args.escrituras:
+                sistema.eliminar_registro(id)
+                operaciones['baja'] += 1
+            elif tirada < 0.8:
+                comprobar(sistema.buscar_por_id(id))
+                operaciones['buscar_por_id'] += 1
+            elif tirada < 0.98:  # filtrar devuelve cientos de registros: pocas veces
+                nombre = f"{azar.choice(NOMBRES)} {azar.choice(APELLIDOS)}"
+                for registro in sistema.buscar_por_nombre(nombre):
+                    comprobar(registro)
+                operaciones['buscar_por_nombre'] += 1
+            else:
+                for registro in sistema.filtrar(carrera=azar.choice(CARRERAS),
+                                                anio=azar.randint(2010, 2025)):
+                    comprobar(registro)
+                operaciones['filtrar'] += 1
+        except ra.RegistroNoEncontrado:
+            pass  # Otro hilo ya eliminó el registro elegido: es lo esperado
+        except ra.CorreoDuplicado:
+            pass  # Dos hilos sortearon el mismo correo de cambio: se rechaza uno
+        except Exception as e:
+            errores.append(f"{type(e).__name__}: {e}")
+    return operaciones, errores
+
+
+def bench_concurrencia(args):
+    """
+    Prueba de estrés: varios hilos mezclan lecturas y escrituras sobre el
+    mismo RegistroAcademico. Informa operaciones por segundo y verifica que
+    no haya excepciones, registros a medio modificar ni índices desfasados.
+    """
+    with directorio_temporal():
+        print(f"Generando {args.n} registros...")
+        generar_csv('registros.csv', args.n)
+        archivo = 'registros.csv'
+        if args.modo == 'binario':
+            archivo = 'registros.bin'
+            formato_binario.csv_a_binario('registros.csv', archivo)
+        sistema = ra.RegistroAcademico(modo_almacen=args.modo, archivo_registros=archivo)
+        print(f"Carga: {args.hilos} hilos durante {args.duracion} s, modo {args.modo} "
+              f"({args.escrituras:.0%} escrituras)")
+
+        fin = time.perf_counter() + args.duracion
+        with ThreadPoolExecutor(args.hilos) as grupo:
+            futuros = [grupo.submit(trabajador_mixto, sistema, semilla, args, fin)
+                       for semilla in range(args.hilos)]
+            resultados = [futuro.result() for futuro in futuros]
+
+        operaciones = Counter()
+        errores = []
+        for contador, lista in resultados:
+            operaciones.update(contador)
+            errores.extend(lista)
+
+        # El índice de nombres debe coincidir exactamente con los registros
+        sistema._asegurar_indices()
+        if sistema._indice_nombres is not None:
+            indexados = sistema._indice_nombres._textos
+            for registro in sistema.registros:
+                if indexados.get(registro.id) != ra.normalizar_texto(registro.nombre):
+                    errores.append(f"Índice desfasado en el registro {registro.id}")
+            if len(indexados) != len(sistema.registros):
+                errores.append(f"El índice tiene {len(indexados)} nombres y hay "
+                               f"{len(sistema.registros)} registros")
+        # Cada registro debe poder encontrarse por su correo
+        for registro in sistema.registros:
+            if registro.id not in sistema._indice_correos.ids(registro.correo):
+                errores.append(f"Correo sin indexar en el registro {registro.id}")
+        # Y los conteos de los índices por campo, con un recorrido completo
+        if sistema._indice_campos is not None:
+            for campo in ra.IndiceCampos.CAMPOS:
+                if campo == 'tipo':
+                    esperado = Counter(ra.fila_de_registro(r)[0] for r in sistema.registros)
+                else:
+                    esperado = Counter(getattr(r, campo, None) for r in sistema.registros)
+                    esperado.pop(None, None)
+                if sistema.contar_por(campo) != dict(sorted(esperado.items())):
+                    errores.append(f"Conteos por {campo} desfasados")
+        sistema.cerrar()
+
+    print(f"\n{'operación':<20}{'total':>10}{'por segundo':>14}")
+    for operacion, total in sorted(operaciones.items()):
+        print(f"{operacion:<20}{total:>10}{total / args.duracion:>14.0f}")
+    print(f"{'total':<20}{sum(operaciones.values()):>10}"
+          f"{sum(operaciones.values()) / args.duracion:>14.0f}")
+    if errores:
+        print(f"\n❌ {len(errores)} errores; primeros:")
+        for error in errores[:10]:
+            print(f"   {error}")
+        sys.exit(1)
+    print("\n✅ Sin errores ni registros inconsistentes")
+
+
+def bench_consultas(args):
+    """
+    Compara filtrar y contar_por recorriendo todos los registros frente a
+    los índices por campo, y el costo que esos índices suman a cada cambio.
+    """
+    consultas = [
+        ('filtrar carrera+anio', lambda s: s.filtrar(carrera='Sistemas', anio=2023)),
+        ('filtrar departamento', lambda s: s.filtrar(tipo='docente', departamento='Salud')),
+        ('filtrar titulo+depto', lambda s: s.filtrar(departamento='Ciencias', titulo='Doctor')),
+        ('contar_por carrera', lambda s: s.contar_por('carrera')),
+        ('contar_por depto', lambda s: s.contar_por('departamento')),
+        ('contar_por anio|carr', lambda s: s.contar_por('anio', carrera='Medicina')),
+    ]
+    with directorio_temporal():
+        print(f"Generando {args.n} registros...")
+        generar_csv('registros.csv', args.n)
+
+        for indices in (False, True):
+            inicio = time.perf_counter()
+            sistema = ra.RegistroAcademico(indice_nombres=False, indices_campos=indices)
+            carga = time.perf_counter() - inicio
+            modo = 'índices' if indices else 'recorrido'
+            print(f"\n[{modo}] carga: {carga:.2f} s")
+            print(f"{'consulta':<22}{'resultados':>12}{'mediana ms':>14}{'máx ms':>12}")
+            for nombre, consulta in consultas:
+                resultados = len(consulta(sistema))
+                tiempos = medir(lambda: consulta(sistema), args.repeticiones)
+                print(f"{nombre:<22}{resultados:>12}"
+                      f"{statistics.median(tiempos):>14.2f}{max(tiempos):>12.2f}")
+
+            azar = random.Random(1)
+            estudiantes = [r.id for r in sistema.filtrar(tipo='estudiante')]
+            cambios = medir(lambda: sistema.modificar_registro(
+                azar.choice(estudiantes), carrera=azar.choice(CARRERAS),
+                anio=azar.randint(2010, 2025)), 2000)
+            print(f"{'modificar carrera+anio':<22}{'':>12}"
+                  f"{statistics.median(cambios) * 1000:>11.1f} µs{max(cambios):>12.2f}")
+            del sistema
+
+
+def bench_listado(args):
+    """
+    Compara registros por segundo al listar: un print por registro (como
+    el mostrar_todos original) frente a escribir_listado por bloques, en
+    un archivo con búfer de línea (lo que hace una terminal) y en uno con
+    búfer grande (redirección a archivo o tubería).
+    """
+    with directorio_temporal():
+        print(f"Generando {args.n} registros...")
+        generar_csv('registros.csv', args.n)
+        sistema = ra.RegistroAcademico(indice_nombres=False, indices_campos=False)
+
+        def print_por_registro(file):
+            for registro in sistema.registros:
+                print(registro.mostrar_info(), file=file)
+
+        casos = [
+            ('print por registro', 'línea', print_por_registro),
+            ('escribir_listado', 'línea', lambda file: ra.escribir_listado(sistema.registros, file)),
+            ('print por registro', '1 MiB', print_por_registro),
+            ('escribir_listado', '1 MiB', lambda file: ra.escribir_listado(sistema.registros, file)),
+        ]
+        print(f"\n{'método':<22}{'búfer':>8}{'segundos':>12}{'registros/s':>14}")
+        for nombre, bufer, funcion in casos:
+            with open('listado.txt', 'w', encoding='utf-8',
+                      buffering=1 if bufer == 'línea' else 1 << 20) as file:
+                inicio = time.perf_counter()
+                funcion(file)
+                file.flush()
+                transcurrido = time.perf_counter() - inicio
+            print(f"{nombre:<22}{bufer:>8}{transcurrido:>12.2f}{args.n / transcurrido:>14.0f}")
+
+        print(f"\n{'orden':<10}{'listar s':>12}{'página 1 s':>12}")
+        for orden in ra.RegistroAcademico.ORDENES:
+            todo = medir(lambda: sistema.listar(orden), 1)[0] / 1000
+            pagina = medir(lambda: sistema.listar(orden, 0, 50), 1)[0] / 1000
+            print(f"{orden:<10}{todo:>12.2f}{pagina:>12.2f}")
+        sistema.cerrar()
+
+
+def bench_aproximado(args):
+    """
+    Búsqueda aproximada con el índice difuso frente a recorrer todos los
+    registros: construcción, memoria del índice y latencia por consulta.
+    """
+    consultas = ['Gonzales Rodrigues', 'Qispe Mamanni', 'Rosa Perz', 'Ximena Chaves',
+                 'Guaman Lopes', 'gonz']
+    with directorio_temporal():
+        print(f"Generando {args.n} registros...")
+        generar_csv('registros.csv', args.n)
+        for indice in (False, True):
+            sistema = ra.RegistroAcademico(indice_nombres=False, indices_campos=False,
+                                           indice_difuso=indice)
+            modo = 'índice difuso' if indice else 'recorrido'
+            if indice:
+                tracemalloc.start()
+                inicio = time.perf_counter()
+                sistema.buscar_aproximado(consultas[0])  # Construye el índice
+                construccion = time.perf_counter() - inicio
+                memoria = tracemalloc.get_traced_memory()[0]
+                tracemalloc.stop()
+                print(f"\n[{modo}] construcción: {construccion:.2f} s, "
+                      f"{memoria / 2**20:.1f} MiB")
+            else:
+                print(f"\n[{modo}]")
+            print(f"{'consulta':<20}{'mejor resultado':<34}{'puntos':>8}{'mediana ms':>12}")
+            for consulta in consultas:
+                resultados = sistema.buscar_aproximado(consulta, 10)
+                tiempos = medir(lambda: sistema.buscar_aproximado(consulta, 10),
+                                args.repeticiones if indice else 1)
+                mejor, puntos = resultados[0] if resultados else (None, 0)
+                print(f"{consulta:<20}{mejor.nombre if mejor else '-':<34}{puntos:>8.2f}"
+                      f"{statistics.median(tiempos):>12.2f}")
+            sistema.cerrar()
+
+
+def bench_cache(args):
+    """
+    Consultas repetidas con y sin caché: una mezcla sesgada de búsquedas
+    por nombre, aproximadas y por ID (como la de un servidor con nombres
+    populares) intercalada con cambios que invalidan la caché.
+    """
+    with directorio_temporal():
+        print(f"Generando {args.n} registros...")
+        generar_csv('registros.csv', args.n)
+        azar = random.Random(11)
+        # Pocas consultas distintas repetidas muchas veces (distribución de Zipf)
+        populares = [f"{azar.choice(NOMBRES)} {azar.choice(APELLIDOS)}" for _ in range(50)]
+        pesos = [1 / (i + 1) for i in range(len(populares))]
+        operaciones = []
+        for _ in range(args.consultas):
+            consulta = azar.choices(populares, pesos)[0]
+            tipo = azar.choice(('nombre', 'aproximado', 'id'))
+            operaciones.append((tipo, consulta.split()[1] if tipo == 'nombre' else consulta))
+        cambios = set(range(0, args.consultas, args.cada)) if args.cada else set()
+        formato_binario.csv_a_binario('registros.csv', 'registros.bin')
+
+        print(f"\n{'almacén':<10}{'caché':>8}{'total s':>10}{'mediana ms':>12}"
+              f"{'p95 ms':>10}{'aciertos':>10}")
+        for modo in ('objetos', 'binario'):
+            for tamano in (0, args.tamano):
+                archivo = 'registros.bin' if modo == 'binario' else 'registros.csv'
+                sistema = ra.RegistroAcademico(modo_almacen=modo, archivo_registros=archivo,
+                                               indices_campos=False, tamano_cache=tamano)
+                sistema.buscar_aproximado(populares[0])  # Construye los índices
+                sistema.buscar_por_nombre(populares[0])
+                tiempos = []
+                for i, (tipo, consulta) in enumerate(operaciones):
+                    if i in cambios:
+                        sistema.modificar_registro(azar.randint(1, args.n),
+                                                   correo=f"cache{i}@uni.edu")
+                    t0 = time.perf_counter()
+                    if tipo == 'nombre':
+                        for registro in sistema.buscar_por_nombre(consulta)[:20]:
+                            sistema.info_registro(registro)
+                    elif tipo == 'aproximado':
+                        sistema.buscar_aproximado(consulta)
+                    else:
+                        id = populares.index(consulta) * 997 % args.n + 1
+                        sistema.info_registro(sistema.buscar_por_id(id))
+                    tiempos.append((time.perf_counter() - t0) * 1000)
+                total = sum(tiempos) / 1000  # Sin contar los cambios
+                tiempos.sort()
+                tasa = sistema.estadisticas_cache()['consultas']['tasa_aciertos']
+                print(f"{modo:<10}{tamano:>8}{total:>10.2f}{statistics.median(tiempos):>12.3f}"
+                      f"{tiempos[int(len(tiempos) * 0.95)]:>10.3f}{tasa:>10.0%}")
+                sistema.cerrar(guardar=False)
+
+
+def bench_respaldo(args):
+    """
+    Respaldos comprimidos por formato, compresión y nivel: tamaño frente a
+    registros.csv y MB/s (sin comprimir) al exportar, al verificar y al
+    restaurar con cargar_datos (que además escribe la instantánea).
+    """
+    with directorio_temporal():
+        print(f"Generando {args.n} registros...")
+        generar_csv('registros.csv', args.n)
+        tamano_csv = os.path.getsize('registros.csv')
+        sistema = ra.RegistroAcademico(indices_campos=False, indice_nombres=False)
+        print(f"registros.csv: {tamano_csv / 2**20:.1f} MiB "
+              f"(compresiones disponibles: {', '.join(formato_respaldo.compresiones_disponibles())})")
+        print(f"\n{'formato':<8}{'compresión':<12}{'nivel':>6}{'MiB':>9}{'ratio':>8}"
+              f"{'exportar MB/s':>15}{'verificar MB/s':>16}{'restaurar MB/s':>16}")
+        for compresion in formato_respaldo.compresiones_disponibles():
+            for nivel in args.niveles:
+                for formato in formato_respaldo.FORMATOS:
+                    ruta = f'respaldo.{formato}.{compresion}'
+                    exportado = sistema.exportar_respaldo(ruta, formato, compresion, nivel,
+                                                          args.filas_por_bloque)
+                    inicio = time.perf_counter()
+                    formato_respaldo.verificar(ruta)
+                    verificado = exportado['bytes_datos'] / 1e6 / (time.perf_counter() - inicio)
+                    restaurado = sistema.cargar_datos(respaldo=ruta)
+                    tamano = os.path.getsize(ruta)
+                    print(f"{formato:<8}{compresion:<12}{nivel:>6}{tamano / 2**20:>9.1f}"
+                          f"{tamano_csv / tamano:>8.1f}{exportado['mb_por_segundo']:>15.1f}"
+                          f"{verificado:>16.1f}{restaurado['mb_por_segundo']:>16.1f}")
+                    os.remove(ruta)
+        sistema.cerrar()
+
+
+def bench_metricas(args):
+    """
+    Costo de la instrumentación: latencia de buscar_por_id y
+    buscar_por_nombre sin métricas, con métricas y tras desactivarlas.
+    """
+    with directorio_temporal():
+        print(f"Generando {args.n} registros...")
+        generar_csv('registros.csv', args.n)
+        sistema = ra.RegistroAcademico(indices_campos=False)
+        azar = random.Random(7)
+        ids = [azar.randint(1, args.n) for _ in range(args.repeticiones)]
+        consultas = [azar.choice(APELLIDOS) for _ in range(args.repeticiones // 100 or 1)]
+
+        def por_id():
+            for id in ids:
+                sistema.buscar_por_id(id)
+
+        def por_nombre():
+            for consulta in consultas:
+                sistema.buscar_por_nombre(consulta)
+
+        print(f"\n{'métricas':<14}{'por ID µs':>12}{'por nombre ms':>16}")
+        for estado in ('desactivadas', 'activadas', 'quitadas'):
+            if estado == 'activadas':
+                sistema.activar_metricas()
+            elif estado == 'quitadas':
+                sistema.desactivar_metricas()
+            id_us = min(medir(por_id, 5)) * 1000 / len(ids)
+            nombre_ms = min(medir(por_nombre, 5)) / len(consultas)
+            print(f"{estado:<14}{id_us:>12.3f}{nombre_ms:>16.3f}")
+        sistema.cerrar()
+
+
+def bench_autoguardado(args):
+    """
+    Ráfagas de cambios con el guardado automático activo: cuántas
+    escrituras se hacen, cuánto esperan los cambios al cerrojo mientras se
+    guarda y cuánto cuesta guardar_datos sin cambios.
+    """
+    with directorio_temporal():
+        print(f"Generando {args.n} registros...")
+        generar_csv('registros.csv', args.n)
+        sistema = ra.RegistroAcademico(indice_nombres=False, indices_campos=False,
+                                       autoguardado=args.intervalo,
+                                       cambios_autoguardado=args.cambios)
+        azar = random.Random(3)
+        tiempos = []
+        inicio = time.perf_counter()
+        for rafaga in range(args.rafagas):
+            for _ in range(args.por_rafaga):
+                id = azar.randint(1, args.n)
+                t = time.perf_counter()
+                sistema.modificar_registro(id, nombre=f"Editado {rafaga}")
+                tiempos.append((time.perf_counter() - t) * 1000)
+            time.sleep(args.pausa)
+        total = time.perf_counter() - inicio
+        guardados = sistema.guardados_automaticos
+        pendientes = sistema.cambios_sin_guardar
+        sistema.cerrar()  # Guarda lo que quedó pendiente
+        cambios = args.rafagas * args.por_rafaga
+        print(f"\n{cambios} cambios en {args.rafagas} ráfagas ({total:.1f} s): "
+              f"{guardados} guardados automáticos, {pendientes} registros pendientes al cerrar")
+        print(f"cambio ms: mediana {statistics.median(tiempos):.3f}, "
+              f"p99 {sorted(tiempos)[int(len(tiempos) * 0.99)]:.3f}, máx {max(tiempos):.1f}")
+
+        sistema = ra.RegistroAcademico(indice_nombres=False, indices_campos=False)
+        sin_cambios = medir(sistema.guardar_datos, 5)
+        con_cambios = medir(sistema.compactar, 5)
+        sistema.cerrar()
+        print(f"guardar_datos sin cambios: {statistics.median(sin_cambios):.3f} ms "
+              f"(instantánea completa: {statistics.median(con_cambios):.1f} ms)")
+
+
+# SUITE COMPLETA CON RESULTADOS EN JSON
+OPERACIONES_SUITE = ('cargar_datos', 'buscar_por_id', 'buscar_por_nombre', 'mostrar_todos',
+                     'eliminar_registro', 'guardar_datos')
+
+
+def resumir(tiempos):
+    """
+    Resume una lista de latencias en milisegundos.
+
+    Returns:
+        dict: Repeticiones, mediana, percentil 95 y máximo
+    """
+    ordenados = sorted(tiempos)
+    return {'repeticiones': len(ordenados),
+            'mediana_ms': statistics.median(ordenados),
+            'p95_ms': ordenados[min(len(ordenados) - 1, int(len(ordenados) * 0.95))],
+            'max_ms': ordenados[-1]}
+
+
+def bench_generar(args):
+    """
+    Escribe un registros.csv sintético para pruebas manuales.
+    """
+    generar_csv(args.ruta, args.n, args.semilla, args.docentes)
+    print(f"✅ {args.n} registros escritos en {args.ruta} "
+          f"({os.path.getsize(args.ruta) / 2**20:.1f} MiB)")
+
+
+def bench_suite_hija(args):
+    """
+    Mide todas las operaciones de la suite sobre un registros.csv en un
+    proceso nuevo (así el pico de memoria es solo el de esta escala) y
+    escribe los resultados como una línea JSON.
+    """
+    azar = random.Random(args.semilla)
+    resultados = {}
+
+    inicio = time.perf_counter()
+    sistema = ra.RegistroAcademico(modo_almacen=args.modo, archivo_registros=args.archivo)
+    resultados['cargar_datos'] = resumir([(time.perf_counter() - inicio) * 1000])
+    n = len(sistema.registros)
+
+    ids = [azar.randint(1, n) for _ in range(args.repeticiones * 50)]
+    it = iter(ids)
+    resultados['buscar_por_id'] = resumir(medir(lambda: sistema.buscar_por_id(next(it)), len(ids)))
+
+    # Mezcla de apellidos sueltos, nombre y apellido, y nombres completos
+    consultas = [azar.choice([azar.choice(APELLIDOS),
+                              f"{azar.choice(NOMBRES)} {azar.choice(APELLIDOS)}",
+                              f"{azar.choice(APELLIDOS)} {azar.choice(APELLIDOS)}"])
+                 for _ in range(args.repeticiones)]
+    it = iter(consultas)
+    resultados['buscar_por_nombre'] = resumir(
+        medir(lambda: sistema.buscar_por_nombre(next(it)), len(consultas)))
+
+    # mostrar_todos es interactivo: se mide su salida, escribir_listado de todos
+    with open(os.devnull, 'w', encoding='utf-8') as nulo:
+        resultados['mostrar_todos'] = resumir(
+            medir(lambda: ra.escribir_listado(sistema.listar(), nulo), 1))
+
+    bajas = azar.sample(range(1, n + 1), min(n, args.repeticiones * 10))
+    it = iter(bajas)
+    resultados['eliminar_registro'] = resumir(
+        medir(lambda: sistema.eliminar_registro(next(it)), len(bajas)))
+
+    # Sin cambios guardar_datos no escribe: se mide la instantánea completa
+    resultados['guardar_datos'] = resumir(medir(sistema.compactar, 3))
+    sistema.cerrar()
+    print(json.dumps({'registros': n, 'pico_memoria_bytes': memoria_pico(),
+                      'operaciones': resultados}))
+
+
+def comparar_resultados(actual, anterior, umbral):
+    """
+    Imprime la relación entre dos ejecuciones de la suite (actual / anterior)
+    y marca las operaciones que empeoraron más que el umbral.
+
+    Returns:
+        int: Número de regresiones encontradas
+    """
+    previas = {escala['registros']: escala for escala in anterior['escalas']}
+    regresiones = 0
+    print(f"\nComparación con {anterior.get('fecha', 'la ejecución anterior')} "
+          f"(actual / anterior, mediana):")
+    for escala in actual['escalas']:
+        previa = previas.get(escala['registros'])
+        if previa is None:
+            continue
+        metricas = [(operacion, escala['operaciones'][operacion]['mediana_ms'],
+                     previa['operaciones'][operacion]['mediana_ms'])
+                    for operacion in OPERACIONES_SUITE if operacion in previa['operaciones']]
+        metricas.append(('pico_memoria', escala['pico_memoria_bytes'],
+                         previa['pico_memoria_bytes']))
+        for nombre, valor, referencia in metricas:
+            relacion = valor / referencia if referencia else float('inf')
+            marca = ''
+            if relacion > 1 + umbral:
+                marca = '  ⚠️ regresión'
+                regresiones += 1
+            print(f"{escala['registros']:>10}  {nombre:<20}{relacion:>8.2f}x{marca}")
+    return regresiones
+
+
+def bench_suite(args):
+    """
+    Suite completa: genera registros.csv a cada escala, mide las operaciones
+    principales y el pico de memoria, y guarda todo en un JSON que puede
+    compararse con el de otra ejecución (--comparar).
+    """
+    resultados = {
+        'fecha': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'nucleos': os.cpu_count(),
+        'parametros': {'semilla': args.semilla, 'docentes': args.docentes,
+                       'modo': args.modo, 'repeticiones': args.repeticiones},
+        'escalas': [],
+    }
+    with directorio_temporal() as directorio:
+        for n in args.escalas:
+            print(f"\nGenerando {n} registros...")
+            generar_csv('registros.csv', n, args.semilla, args.docentes)
+            salida = subprocess.run(
+                [sys.executable, SCRIPT, '_suite', '--archivo',
+                 os.path.join(directorio, 'registros.csv'), '--modo', args.modo,
+                 '--semilla', str(args.semilla), '--repeticiones', str(args.repeticiones)],
+                capture_output=True, text=True, check=True, cwd=directorio)
+            datos = json.loads(salida.stdout.strip().splitlines()[-1])
+            resultados['escalas'].append(datos)
+
+            print(f"{'operación':<20}{'mediana ms':>12}{'p95 ms':>10}{'máx ms':>10}")
+            for operacion in OPERACIONES_SUITE:
+                medida = datos['operaciones'][operacion]
+                print(f"{operacion:<20}{medida['mediana_ms']:>12.3f}"
+                      f"{medida['p95_ms']:>10.3f}{medida['max_ms']:>10.3f}")
+            print(f"{'pico de memoria':<20}{datos['pico_memoria_bytes'] / 2**20:>9.1f} MiB")
+
+    with open(args.salida, 'w', encoding='utf-8') as file:
+        json.dump(resultados, file, ensure_ascii=False, indent=2)
+    print(f"\n💾 Resultados guardados en {args.salida}")
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as file:
+            anterior = json.load(file)
+        if comparar_resultados(resultados, anterior, args.umbral):
+            sys.exit(1)
+
+
+def lista_de_enteros(texto):
+    """
+    Convierte '10000,100000' en [10000, 100000] (para argparse).
+    """
+    try:
+        return [int(parte) for parte in texto.split(',') if parte.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"lista de enteros no válida: {texto}")
+
+
+def main():
+    """
+    Punto de entrada de los benchmarks.
+    """
+    parser = argparse.ArgumentParser(description="Benchmarks del registro académico")
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+
+    suite = subparsers.add_parser('suite', help="Suite completa a varias escalas, con salida JSON")
+    suite.add_argument('--escalas', type=lista_de_enteros, default=[10_000, 100_000, 1_000_000],
+                       help="Números de registros separados por comas")
+    suite.add_argument('--docentes', type=float, default=0.1, help="Fracción de docentes")
+    suite.add_argument('--semilla', type=int, default=42)
+    suite.add_argument('--modo', choices=ra.RegistroAcademico.MODOS_ALMACEN[:3],
+                       default='objetos', help="Modo de almacenamiento (sobre CSV)")
+    suite.add_argument('--repeticiones', type=int, default=20,
+                       help="Búsquedas por nombre (x50 por ID, x10 bajas)")
+    suite.add_argument('--salida', default='resultados_benchmark.json')
+    suite.add_argument('--comparar', metavar='JSON', help="Resultados anteriores con los que comparar")
+    suite.add_argument('--umbral', type=float, default=0.1,
+                       help="Empeoramiento tolerado al comparar (0.1 = 10%%)")
+    suite.set_defaults(funcion=bench_suite)
+
+    generar = subparsers.add_parser('generar', help="Escribe un registros.csv sintético")
+    generar.add_argument('ruta')
+    generar.add_argument('--n', type=int, default=100_000, help="Número de registros")
+    generar.add_argument('--docentes', type=float, default=0.1, help="Fracción de docentes")
+    generar.add_argument('--semilla', type=int, default=42)
+    generar.set_defaults(funcion=bench_generar)
+
+    busqueda = subparsers.add_parser('busqueda', help="Latencia de buscar_por_nombre")
+    busqueda.add_argument('--n', type=int, default=1_000_000, help="Número de registros")
+    busqueda.add_argument('--repeticiones', type=int, default=5)
+    busqueda.set_defaults(funcion=bench_busqueda)
+
+    memoria = subparsers.add_parser('memoria', help="Memoria por modo de almacenamiento")
+    memoria.add_argument('--n', type=int, default=1_000_000, help="Número de registros")
+    memoria.set_defaults(funcion=bench_memoria)
+
+    guardado = subparsers.add_parser('guardado', help="Latencia de guardado por modo de durabilidad")
+    guardado.add_argument('--n', type=int, default=100_000, help="Número de registros")
+    guardado.add_argument('--repeticiones', type=int, default=5)
+    guardado.add_argument('--operaciones', type=int, default=200, help="Altas anotadas en el journal")
+    guardado.set_defaults(funcion=bench_guardado)
+
+    formatos = subparsers.add_parser('formatos', help="Carga de CSV frente a binario con mmap")
+    formatos.add_argument('--n', type=int, default=1_000_000, help="Número de registros")
+    formatos.set_defaults(funcion=bench_formatos)
+
+    servidor = subparsers.add_parser('servidor', help="Prueba de carga del servidor HTTP")
+    servidor.add_argument('--n', type=int, default=100_000, help="Número de registros")
+    servidor.add_argument('--clientes', type=int, default=50, help="Conexiones concurrentes")
+    servidor.add_argument('--duracion', type=float, default=10, help="Segundos de carga")
+    servidor.add_argument('--escrituras', type=float, default=0.05,
+                          help="Fracción de peticiones que modifican registros")
+    servidor.set_defaults(funcion=bench_servidor)
+
+    concurrencia = subparsers.add_parser('concurrencia', help="Estrés con varios hilos")
+    concurrencia.add_argument('--n', type=int, default=100_000, help="Número de registros")
+    concurrencia.add_argument('--hilos', type=int, default=8)
+    concurrencia.add_argument('--duracion', type=float, default=10, help="Segundos de carga")
+    concurrencia.add_argument('--escrituras', type=float, default=0.2,
+                              help="Fracción de operaciones que escriben")
+    concurrencia.add_argument('--modo', choices=ra.RegistroAcademico.MODOS_ALMACEN,
+                              default='objetos')
+    concurrencia.set_defaults(funcion=bench_concurrencia)
+
+    consultas = subparsers.add_parser('consultas', help="filtrar y contar_por con y sin índices")
+    consultas.add_argument('--n', type=int, default=1_000_000, help="Número de registros")
+    consultas.add_argument('--repeticiones', type=int, default=5)
+    consultas.set_defaults(funcion=bench_consultas)
+
+    listado = subparsers.add_parser('listado', help="Registros por segundo al listar")
+    listado.add_argument('--n', type=int, default=500_000, help="Número de registros")
+    listado.set_defaults(funcion=bench_listado)
+
+    paralelo = subparsers.add_parser('paralelo', help="Escalado de la carga por fragmentos")
+    paralelo.add_argument('--n', type=int, default=5_000_000, help="Número de registros")
+    paralelo.add_argument('--sin-indices', dest='indices', action='store_false',
+                          help="Medir solo la lectura, sin construir los índices")
+    paralelo.add_argument('--maximo', type=int, default=None,
+                          help="Máximo de procesos (por defecto, los núcleos disponibles)")
+    paralelo.set_defaults(funcion=bench_paralelo)
+
+    aproximado = subparsers.add_parser('aproximado', help="Búsqueda aproximada por nombre")
+    aproximado.add_argument('--n', type=int, default=1_000_000)
+    aproximado.add_argument('--repeticiones', type=int, default=20)
+    aproximado.set_defaults(funcion=bench_aproximado)
+
+    cache = subparsers.add_parser('cache', help="Consultas repetidas con y sin caché LRU")
+    cache.add_argument('--n', type=int, default=100_000)
+    cache.add_argument('--consultas', type=int, default=5_000)
+    cache.add_argument('--tamano', type=int, default=1024, help="Entradas de la caché")
+    cache.add_argument('--cada', type=int, default=50,
+                       help="Un cambio de correo cada tantas consultas (0 = ninguno)")
+    cache.set_defaults(funcion=bench_cache)
+
+    respaldo = subparsers.add_parser('respaldo', help="Respaldos comprimidos: tamaño y MB/s")
+    respaldo.add_argument('--n', type=int, default=200_000)
+    respaldo.add_argument('--niveles', type=lista_de_enteros, default=[1, 6],
+                          help="Niveles de compresión separados por comas")
+    respaldo.add_argument('--filas-por-bloque', type=int,
+                          default=formato_respaldo.FILAS_POR_BLOQUE)
+    respaldo.set_defaults(funcion=bench_respaldo)
+
+    metricas = subparsers.add_parser('metricas', help="Costo de las métricas activadas o no")
+    metricas.add_argument('--n', type=int, default=100_000)
+    metricas.add_argument('--repeticiones', type=int, default=100_000,
+                          help="Búsquedas por ID por medición")
+    metricas.set_defaults(funcion=bench_metricas)
+
+    autoguardado = subparsers.add_parser('autoguardado', help="Ráfagas de cambios con autoguardado")
+    autoguardado.add_argument('--n', type=int, default=100_000)
+    autoguardado.add_argument('--rafagas', type=int, default=10)
+    autoguardado.add_argument('--por-rafaga', type=int, default=500, help="Cambios por ráfaga")
+    autoguardado.add_argument('--pausa', type=float, default=0.5, help="Segundos entre ráfagas")
+    autoguardado.add_argument('--intervalo', type=float, default=1.0,
+                              help="Segundos de espera del autoguardado")
+    autoguardado.add_argument('--cambios', type=int, default=None,
+                              help="Registros modificados que adelantan el guardado")
+    autoguardado.set_defaults(funcion=bench_autoguardado)
+
+    hija = subparsers.add_parser('_suite')  # Uso interno de bench_suite
+    hija.add_argument('--archivo', required=True)
+    hija.add_argument('--modo', required=True)
+    hija.add_argument('--semilla', type=int, required=True)
+    hija.add_argument('--repeticiones', type=int, required=True)
+    hija.set_defaults(funcion=bench_suite_hija)
+
+    # Uso interno de bench_memoria, bench_formatos y bench_paralelo
+    carga = subparsers.add_parser('_carga')
+    carga.add_argument('--modo', required=True)
+    carga.add_argument('--archivo', required=True)
+    carga.add_argument('--procesos', type=int, default=1)
+    carga.add_argument('--indices', action='store_true', help="Trigramas y campos")
+    carga.add_argument('--nombres', action='store_true')
+    carga.add_argument('--campos', action='store_true')
+    carga.set_defaults(funcion=bench_carga_hija)
+
+    args = parser.parse_args()
+    args.funcion(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,430 @@
+"""
+Línea de comandos del registro académico
+========================================
+Permite usar RegistroAcademico desde scripts, sin el menú interactivo.
+Cada comando escribe su resultado como una línea JSON en la salida
+estándar; los errores del sistema (ErrorRegistro) se informan en esa
+misma línea con su tipo y mensaje.
+
+Con --batch se leen comandos de la entrada estándar, uno por línea, y se
+ejecutan todos sobre los mismos datos cargados una sola vez. Los cambios
+se guardan al terminar el lote.
+
+Con --metricas el comando metrics devuelve las métricas de rendimiento
+acumuladas y, al terminar, se emite una última línea con las de toda la
+ejecución (incluida la carga y el guardado). --perfilar OPERACION perfila
+esa operación con cProfile e imprime el informe en la salida de errores.
+
+Uso:
+    python cli_registro.py add estudiante "Ana Pérez" ana@uni.edu Sistemas 2023
+    python cli_registro.py add docente "Luis Rojas" luis@uni.edu Ciencias Doctor
+    python cli_registro.py get 5
+    python cli_registro.py get ana@uni.edu
+    python cli_registro.py duplicates
+    python cli_registro.py search perez
+    python cli_registro.py search "gonzales basques" --aproximado --limite 5
+    python cli_registro.py filter --carrera Sistemas --anio 2023
+    python cli_registro.py count departamento --tipo docente
+    python cli_registro.py list --orden nombre --offset 100 --limite 50
+    python cli_registro.py list --orden carrera --salida listado.txt
+    python cli_registro.py update 5 --correo nuevo@uni.edu --anio 2024
+    python cli_registro.py delete 5
+    python cli_registro.py export respaldo.jsonl
+    python cli_registro.py export respaldo-2024-1.csv.gz
+    python cli_registro.py export respaldo.jsonl.zst --filas-por-bloque 50000
+    python cli_registro.py restore respaldo-2024-1.csv.gz
+    python cli_registro.py import nuevos.csv
+    python cli_registro.py --batch < comandos.txt
+    python cli_registro.py --metricas --perfilar guardar_datos --batch < comandos.txt
+"""
+
+import argparse
+import csv
+import json
+import os
+import shlex
+import sys
+
+import formato_respaldo
+import importacion
+from registro_academico import (BackendSQLite, ErrorRegistro, IndiceCampos,
+                                RegistroAcademico, diccionario_de_registro,
+                                guardar_listado)
+
+ESCRITURAS = ('add', 'update', 'delete', 'import')  # Comandos que modifican datos
+COLUMNAS_EXPORTACION = ['tipo', 'id', 'nombre', 'correo', 'carrera', 'anio',
+                        'departamento', 'titulo']
+
+
+class ErrorComando(Exception):
+    """
+    Error de un comando; se informa en su línea JSON en lugar de abortar.
+    """
+
+
+class ParserComandos(argparse.ArgumentParser):
+    """
+    ArgumentParser que lanza ErrorComando en vez de terminar el proceso o
+    escribir en la salida, para que un comando mal escrito (o un --help)
+    no corte un lote ni mezcle texto con las líneas JSON.
+    """
+
+    def error(self, message):
+        raise ErrorComando(message)
+
+    def print_help(self, file=None):
+        raise ErrorComando(self.format_help())
+
+    def print_usage(self, file=None):
+        raise ErrorComando(self.format_usage())
+
+    def exit(self, status=0, message=None):
+        raise ErrorComando(message or f"{self.prog}: fin inesperado del comando")
+
+
+def agregar_criterios(parser):
+    """
+    Agrega a un subcomando una opción por cada campo de FILTRABLES.
+    """
+    for campo in RegistroAcademico.FILTRABLES:
+        parser.add_argument(f'--{campo}', type=int if campo == 'anio' else str)
+
+
+def leer_criterios(args):
+    """
+    Devuelve los criterios de filtro indicados en un comando.
+    """
+    return {campo: getattr(args, campo) for campo in RegistroAcademico.FILTRABLES
+            if getattr(args, campo) is not None}
+
+
+def crear_parser_comandos():
+    """
+    Crea el parser de los subcomandos (compartido por el modo normal y --batch).
+    """
+    parser = ParserComandos(prog='cli_registro.py', add_help=False)
+    subparsers = parser.add_subparsers(dest='comando', required=True)
+
+    add = subparsers.add_parser('add', help="Agrega un estudiante o docente")
+    tipos = add.add_subparsers(dest='tipo', required=True)
+    estudiante = tipos.add_parser('estudiante')
+    for campo in ('nombre', 'correo', 'carrera', 'anio'):
+        estudiante.add_argument(campo)
+    docente = tipos.add_parser('docente')
+    for campo in ('nombre', 'correo', 'departamento', 'titulo'):
+        docente.add_argument(campo)
+
+    get = subparsers.add_parser('get', help="Muestra un registro por ID o por correo")
+    get.add_argument('id', help="ID o correo del registro")
+
+    search = subparsers.add_parser('search', help="Busca registros por nombre")
+    search.add_argument('nombre')
+    search.add_argument('--aproximado', action='store_true',
+                        help="Tolerar errores de tipeo y ordenar por parecido")
+    search.add_argument('--limite', type=int, default=10,
+                        help="Máximo de resultados de la búsqueda aproximada")
+
+    filtro = subparsers.add_parser('filter', help="Registros con los valores de campo dados")
+    agregar_criterios(filtro)
+
+    contar = subparsers.add_parser('count', help="Número de registros por valor de un campo")
+    contar.add_argument('campo', choices=IndiceCampos.CAMPOS)
+    agregar_criterios(contar)
+
+    listar = subparsers.add_parser('list', help="Lista registros ordenados por páginas")
+    listar.add_argument('--orden', choices=RegistroAcademico.ORDENES, default='id')
+    listar.add_argument('--offset', type=int, default=0)
+    listar.add_argument('--limite', type=int, default=None, help="Por defecto, todos")
+    listar.add_argument('--salida', metavar='RUTA',
+                        help="Escribir el listado como texto en un archivo o tubería "
+                             "en lugar de devolverlo en el JSON")
+
+    subparsers.add_parser('duplicates', help="Correos repetidos en los datos cargados")
+
+    update = subparsers.add_parser('update', help="Modifica campos de un registro")
+    update.add_argument('id')
+    for campo in ('nombre', 'correo', 'carrera', 'anio', 'departamento', 'titulo'):
+        update.add_argument(f'--{campo}')
+
+    delete = subparsers.add_parser('delete', help="Elimina un registro sin confirmación")
+    delete.add_argument('id')
+
+    export = subparsers.add_parser('export', help="Exporta todos los registros")
+    export.add_argument('archivo')
+    export.add_argument('--formato', choices=['csv', 'jsonl'], default=None,
+                        help="Por defecto se deduce de la extensión")
+    export.add_argument('--compresion', choices=formato_respaldo.COMPRESIONES, default=None,
+                        help="Escribir un respaldo comprimido por bloques, restaurable "
+                             "con restore (por defecto, si la extensión es .gz o .zst)")
+    export.add_argument('--nivel', type=int, default=None, help="Nivel de compresión")
+    export.add_argument('--filas-por-bloque', type=int,
+                        default=formato_respaldo.FILAS_POR_BLOQUE)
+
+    restore = subparsers.add_parser('restore', help="Reemplaza los registros por los de un "
+                                                    "respaldo comprimido")
+    restore.add_argument('archivo')
+
+    importar = subparsers.add_parser('import', help="Importación masiva (ver importacion.py)")
+    importar.add_argument('archivo')
+    importar.add_argument('--formato', choices=['csv', 'jsonl'], default=None,
+                          help="Por defecto se deduce de la extensión")
+    importar.add_argument('--procesos', type=int, default=None)
+
+    subparsers.add_parser('metrics', help="Métricas de rendimiento (requiere --metricas)")
+    return parser
+
+
+def deducir_formato(archivo, formato):
+    """
+    Devuelve el formato indicado o, si es None, el que corresponde a la extensión.
+    """
+    if formato is not None:
+        return formato
+    # En un respaldo comprimido cuenta la extensión anterior: respaldo.jsonl.gz
+    if formato_respaldo.deducir_compresion(archivo):
+        archivo = os.path.splitext(archivo)[0]
+    return 'jsonl' if os.path.splitext(archivo)[1] in ('.jsonl', '.json') else 'csv'
+
+
+def exportar(sistema, archivo, formato):
+    """
+    Escribe todos los registros en un archivo CSV (con encabezado, apto para
+    el comando import) o JSON lines, registro a registro.
+
+    Returns:
+        int: Número de registros exportados
+    """
+    total = 0
+    with open(archivo, 'w', newline='', encoding='utf-8') as file:
+        if formato == 'csv':
+            writer = csv.DictWriter(file, COLUMNAS_EXPORTACION, delimiter=';')
+            writer.writeheader()
+            for registro in sistema.registros:
+                writer.writerow(diccionario_de_registro(registro))
+                total += 1
+        else:
+            for registro in sistema.registros:
+                file.write(json.dumps(diccionario_de_registro(registro), ensure_ascii=False))
+                file.write('\n')
+                total += 1
+    return total
+
+
+def ejecutar(sistema, args):
+    """
+    Ejecuta un comando ya interpretado.
+
+    Args:
+        sistema (RegistroAcademico): Registro sobre el que se opera
+        args (argparse.Namespace): Comando y sus argumentos
+
+    Returns:
+        Resultado del comando, serializable a JSON
+
+    Raises:
+        ErrorRegistro: Si el sistema rechazó la operación
+        ErrorComando: Si falló la lectura o escritura de un archivo
+    """
+    if args.comando == 'add':
+        if args.tipo == 'estudiante':
+            registro = sistema.agregar_estudiante(args.nombre, args.correo,
+                                                  args.carrera, args.anio)
+        else:
+            registro = sistema.agregar_docente(args.nombre, args.correo,
+                                               args.departamento, args.titulo)
+        return diccionario_de_registro(registro)
+
+    if args.comando == 'get':
+        if '@' in args.id:
+            return diccionario_de_registro(sistema.buscar_por_correo(args.id))
+        return diccionario_de_registro(sistema.buscar_por_id(args.id))
+
+    if args.comando == 'duplicates':
+        return [{'correo': correo, 'ids': ids}
+                for correo, ids in sistema.correos_duplicados().items()]
+
+    if args.comando == 'search':
+        if args.aproximado:
+            return [dict(diccionario_de_registro(r), puntuacion=round(p, 3))
+                    for r, p in sistema.buscar_aproximado(args.nombre, args.limite)]
+        return [diccionario_de_registro(r) for r in sistema.buscar_por_nombre(args.nombre)]
+
+    if args.comando == 'filter':
+        return [diccionario_de_registro(r) for r in sistema.filtrar(**leer_criterios(args))]
+
+    if args.comando == 'count':
+        conteos = sistema.contar_por(args.campo, **leer_criterios(args))
+        return [{'valor': valor, 'registros': n} for valor, n in conteos.items()]
+
+    if args.comando == 'list':
+        registros = sistema.listar(args.orden, args.offset, args.limite)
+        if args.salida is None:
+            return [diccionario_de_registro(r) for r in registros]
+        try:
+            total = guardar_listado(registros, args.salida)
+        except OSError as e:
+            raise ErrorComando(str(e))
+        return {'archivo': args.salida, 'registros': total}
+
+    if args.comando == 'update':
+        campos = {campo: getattr(args, campo)
+                  for campo in ('nombre', 'correo', 'carrera', 'anio', 'departamento', 'titulo')
+                  if getattr(args, campo) is not None}
+        return diccionario_de_registro(sistema.modificar_registro(args.id, **campos))
+
+    if args.comando == 'delete':
+        return {'id': sistema.eliminar_registro(args.id).id, 'eliminado': True}
+
+    if args.comando == 'export':
+        formato = deducir_formato(args.archivo, args.formato)
+        compresion = args.compresion or formato_respaldo.deducir_compresion(args.archivo)
+        if compresion:
+            resumen = sistema.exportar_respaldo(args.archivo, formato, compresion,
+                                                args.nivel, args.filas_por_bloque)
+            return dict(resumen, archivo=args.archivo, formato=formato, compresion=compresion)
+        try:
+            total = exportar(sistema, args.archivo, formato)
+        except OSError as e:
+            raise ErrorComando(str(e))
+        return {'archivo': args.archivo, 'formato': formato, 'exportados': total}
+
+    if args.comando == 'restore':
+        return dict(sistema.cargar_datos(respaldo=args.archivo), archivo=args.archivo)
+
+    if args.comando == 'import':
+        formato = deducir_formato(args.archivo, args.formato)
+        try:
+            resultado = importacion.importar(sistema, args.archivo, formato,
+                                             procesos=args.procesos)
+        except (OSError, ValueError) as e:
+            raise ErrorComando(str(e))
+        return {'importados': resultado['importados'],
+                'errores': [{'linea': numero, 'motivo': motivo}
+                            for numero, motivo in resultado['errores']]}
+
+    if args.comando == 'metrics':
+        if sistema.metricas is None:
+            raise ErrorComando("Las métricas están desactivadas (use --metricas)")
+        return sistema.metricas.instantanea()
+
+    raise ErrorComando(f"Comando desconocido: {args.comando}")
+
+
+def procesar(sistema, parser, argumentos):
+    """
+    Interpreta y ejecuta un comando.
+
+    Args:
+        sistema (RegistroAcademico): Registro sobre el que se opera
+        parser (ParserComandos): Parser de subcomandos
+        argumentos (list): Palabras del comando
+
+    Returns:
+        dict: Respuesta JSON ({'ok', 'comando', 'resultado'} o
+        {'ok', 'comando', 'error', 'tipo_error'})
+    """
+    comando = argumentos[0] if argumentos else None
+    try:
+        args = parser.parse_args(argumentos)
+        return {'ok': True, 'comando': comando, 'resultado': ejecutar(sistema, args)}
+    except (ErrorComando, ErrorRegistro) as e:
+        return {'ok': False, 'comando': comando, 'error': str(e),
+                'tipo_error': type(e).__name__}
+
+
+def emitir(respuesta):
+    """
+    Escribe una respuesta como una línea JSON.
+    """
+    sys.stdout.write(json.dumps(respuesta, ensure_ascii=False) + '\n')
+    sys.stdout.flush()
+
+
+def main():
+    """
+    Punto de entrada: carga el registro una vez y ejecuta uno o varios comandos.
+    """
+    parser = argparse.ArgumentParser(
+        description="Registro académico por línea de comandos (salida JSON)",
+        epilog="Comandos: add, get, search, filter, count, list, duplicates, update, "
+               "delete, export, restore, import, metrics")
+    parser.add_argument('--archivo', default='registros.csv', help="Archivo de registros")
+    parser.add_argument('--modo', choices=RegistroAcademico.MODOS_ALMACEN, default='objetos',
+                        help="Modo de almacenamiento")
+    parser.add_argument('--sqlite', metavar='RUTA', help="Usar una base SQLite como backend")
+    parser.add_argument('--journal', action='store_true', help="Anotar los cambios en el journal")
+    parser.add_argument('--procesos-carga', type=int, default=1, metavar='N',
+                        help="Leer un registros.csv grande con N procesos (0 = todos los núcleos)")
+    parser.add_argument('--batch', action='store_true',
+                        help="Leer comandos de la entrada estándar, uno por línea")
+    parser.add_argument('--metricas', action='store_true',
+                        help="Medir las operaciones y emitir las métricas al terminar")
+    parser.add_argument('--perfilar', metavar='OPERACION', action='append', default=[],
+                        help="Perfilar con cProfile un método (p. ej. guardar_datos); "
+                             "implica --metricas")
+    parser.add_argument('comando', nargs=argparse.REMAINDER)
+    args = parser.parse_args()
+    if args.batch == bool(args.comando):
+        parser.error("indique un comando o --batch (pero no ambos)")
+
+    comandos = crear_parser_comandos()
+    args.metricas = args.metricas or bool(args.perfilar)
+    try:
+        backend = BackendSQLite(args.sqlite) if args.sqlite else None
+        sistema = RegistroAcademico(modo_almacen=args.modo, archivo_registros=args.archivo,
+                                    usar_journal=args.journal, backend=backend,
+                                    procesos_carga=args.procesos_carga or None,
+                                    metricas=args.metricas)
+    except ErrorRegistro as e:
+        emitir({'ok': False, 'comando': None, 'error': str(e), 'tipo_error': type(e).__name__})
+        sys.exit(1)
+    for operacion in args.perfilar:
+        sistema.metricas.perfilar(operacion)
+
+    todo_ok = True
+    cambios = False
+    try:
+        if args.batch:
+            for numero, linea in enumerate(sys.stdin, start=1):
+                if not linea.strip() or linea.lstrip().startswith('#'):
+                    continue  # Líneas en blanco y comentarios
+                try:
+                    argumentos = shlex.split(linea)
+                except ValueError as e:
+                    respuesta = {'ok': False, 'comando': None, 'error': str(e),
+                                 'tipo_error': type(e).__name__}
+                else:
+                    respuesta = procesar(sistema, comandos, argumentos)
+                respuesta['linea'] = numero
+                emitir(respuesta)
+                todo_ok = todo_ok and respuesta['ok']
+                # Aunque falle: un import cortado a la mitad ya aplicó bloques
+                cambios = cambios or respuesta['comando'] in ESCRITURAS
+        else:
+            respuesta = procesar(sistema, comandos, args.comando)
+            emitir(respuesta)
+            todo_ok = respuesta['ok']
+            cambios = respuesta['comando'] in ESCRITURAS
+    finally:
+        try:
+            # Un solo guardado al final, aunque el lote tenga miles de cambios
+            # o se haya cortado a la mitad: lo ya aplicado no se pierde
+            if cambios:
+                try:
+                    sistema.guardar_datos()
+                except ErrorRegistro as e:
+                    emitir({'ok': False, 'comando': None, 'error': str(e),
+                            'tipo_error': type(e).__name__})
+                    todo_ok = False
+        finally:
+            sistema.cerrar()
+    if sistema.metricas is not None:
+        emitir({'ok': True, 'comando': 'metrics', 'resultado': sistema.metricas.instantanea()})
+        for operacion in sistema.metricas.perfiles():
+            sys.stderr.write(f"=== PERFIL DE {operacion} ===\n")
+            sys.stderr.write(sistema.metricas.informe_perfil(operacion))
+    sys.exit(0 if todo_ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,458 @@
+"""
+Formato binario de registros
+============================
+Formato alternativo a registros.csv pensado para abrirse con mmap sin
+analizar texto. El archivo tiene cuatro secciones:
+
+    cabecera   magia, versión, número de registros, último ID y posiciones
+    registros  filas de ancho fijo: id, tipo, año y referencias a cadenas
+    cadenas    tabla de cadenas UTF-8 con prefijo de longitud (las repetidas,
+               como carrera o departamento, se guardan una sola vez)
+    índice     pares (id, número de fila) ordenados por ID para buscar
+               por ID con búsqueda binaria sin construir ningún diccionario
+
+Este módulo trabaja con filas en el mismo formato que guardar_datos
+(['estudiante'|'docente', id, nombre, correo, carrera/departamento,
+año/título]) y no depende de registro_academico.
+
+Uso:
+    python formato_binario.py a-binario registros.csv registros.bin
+    python formato_binario.py a-csv registros.bin registros.csv
+"""
+
+import argparse
+import csv
+import mmap
+import os
+import struct
+from bisect import bisect_left
+from collections.abc import MutableMapping, ValuesView
+
+MAGIA = b'RAB1'
+VERSION = 1
+
+# Cabecera: magia, versión, (relleno), número de registros, último ID,
+# posición de la tabla de cadenas, posición del índice
+CABECERA = struct.Struct('<4sHHqqQQ')
+# Registro: id, año, tipo, (relleno), nombre, correo, carrera/departamento, título
+REGISTRO = struct.Struct('<qiB3xIIII')
+LONGITUD = struct.Struct('<I')
+ANIO_MAXIMO = 2 ** 31 - 1  # El año se guarda como entero de 32 bits con signo
+
+TIPOS = ('estudiante', 'docente')
+SIN_CADENA = 0xFFFFFFFF  # Referencia vacía (título de un estudiante)
+
+
+# ESCRITURA
+class _TablaCadenas:
+    """
+    Acumula la tabla de cadenas mientras se escriben los registros.
+    """
+
+    def __init__(self):
+        self._partes = []
+        self._tamano = 0
+        self._repetidas = {}  # Cadena -> posición (solo campos con muchos repetidos)
+
+    def agregar(self, texto, compartir=False):
+        """
+        Agrega una cadena y devuelve su posición dentro de la tabla.
+
+        Args:
+            texto (str): Cadena a guardar
+            compartir (bool): Si es True, reutiliza una cadena igual ya guardada
+        """
+        if compartir and texto in self._repetidas:
+            return self._repetidas[texto]
+        datos = texto.encode('utf-8')
+        posicion = self._tamano
+        if posicion + LONGITUD.size + len(datos) >= SIN_CADENA:
+            raise ValueError("La tabla de cadenas supera el máximo de 4 GiB")
+        self._partes.append(LONGITUD.pack(len(datos)))
+        self._partes.append(datos)
+        self._tamano += LONGITUD.size + len(datos)
+        if compartir:
+            self._repetidas[texto] = posicion
+        return posicion
+
+    def escribir(self, file):
+        """
+        Escribe la tabla completa en el archivo.
+        """
+        for parte in self._partes:
+            file.write(parte)
+
+
+def escribir_binario(file, filas, ultimo_id):
+    """
+    Escribe registros en formato binario.
+
+    Si un ID se repite gana la última fila, que ocupa el lugar de la
+    primera: igual que al cargar registros.csv en un diccionario.
+
+    Args:
+        file: Archivo abierto en modo 'wb' (permite escribir en un temporal)
+        filas (iterable): Filas con el formato de registros.csv
+        ultimo_id (int): Último ID asignado
+
+    Returns:
+        int: Número de registros escritos
+
+    Raises:
+        ValueError: Si un año no cabe en 32 bits
+    """
+    cadenas = _TablaCadenas()
+    indice = {}  # ID -> número de fila
+    file.write(b'\0' * CABECERA.size)  # Se completa al final
+    for fila in filas:
+        tipo, id, nombre, correo, grupo, extra = fila
+        id = int(id)
+        if tipo == 'estudiante':
+            anio, titulo = int(extra), SIN_CADENA
+            if not -ANIO_MAXIMO - 1 <= anio <= ANIO_MAXIMO:
+                raise ValueError(f"Año fuera de rango en el registro {id}: {anio}")
+        else:
+            anio, titulo = 0, cadenas.agregar(extra, compartir=True)
+        datos = REGISTRO.pack(
+            id, anio, TIPOS.index(tipo),
+            cadenas.agregar(nombre), cadenas.agregar(correo),
+            cadenas.agregar(grupo, compartir=True), titulo)
+        numero = indice.get(id)
+        if numero is None:
+            indice[id] = len(indice)
+            file.write(datos)
+        else:
+            # ID repetido: se sobrescribe la fila anterior (sus cadenas quedan sin uso)
+            fin = file.tell()
+            file.seek(CABECERA.size + numero * REGISTRO.size)
+            file.write(datos)
+            file.seek(fin)
+        ultimo_id = max(ultimo_id, id)
+
+    pos_cadenas = file.tell()
+    cadenas.escribir(file)
+    # Alinea el índice a 8 bytes para poder leerlo como arreglo de enteros
+    file.write(b'\0' * (-file.tell() % 8))
+    pos_indice = file.tell()
+    for id, numero in sorted(indice.items()):
+        file.write(struct.pack('<qq', id, numero))
+
+    fin = file.tell()
+    file.seek(0)
+    file.write(CABECERA.pack(MAGIA, VERSION, 0, len(indice), ultimo_id,
+                             pos_cadenas, pos_indice))
+    file.seek(fin)
+    return len(indice)
+
+
+# LECTURA
+class ArchivoBinario:
+    """
+    Vista de solo lectura sobre un archivo binario abierto con mmap.
+    Los registros se decodifican directamente del mapa de memoria.
+    """
+
+    def __init__(self, ruta):
+        """
+        Abre y valida el archivo.
+
+        Args:
+            ruta (str): Archivo binario de registros
+
+        Raises:
+            ValueError: Si el archivo no tiene el formato esperado
+        """
+        self._file = open(ruta, 'rb')
+        self._mapa = None
+        self._vista = self._indice = None
+        self.total = 0
+        self.ultimo_id = 0
+        if os.fstat(self._file.fileno()).st_size == 0:
+            # mmap no admite archivos vacíos: queda un índice vacío, así
+            # las búsquedas responden que el ID no está
+            self._pos_cadenas = 0
+            self._ids = _IdsOrdenados(())
+            return
+        self._mapa = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magia, version, _, self.total, self.ultimo_id, self._pos_cadenas, pos_indice = \
+            CABECERA.unpack_from(self._mapa, 0)
+        if magia != MAGIA or version != VERSION:
+            self.cerrar()
+            raise ValueError(f"{ruta} no es un archivo binario de registros válido")
+        # Índice (id, fila) como arreglo de enteros, sin copiar el contenido
+        self._vista = memoryview(self._mapa)
+        self._indice = self._vista[pos_indice:pos_indice + self.total * 16].cast('q')
+        self._ids = _IdsOrdenados(self._indice)
+
+    def _cadena(self, posicion):
+        """
+        Lee una cadena de la tabla.
+        """
+        inicio = self._pos_cadenas + posicion
+        (longitud,) = LONGITUD.unpack_from(self._mapa, inicio)
+        inicio += LONGITUD.size
+        return self._mapa[inicio:inicio + longitud].decode('utf-8')
+
+    def fila(self, numero):
+        """
+        Decodifica la fila indicada (0 a total - 1).
+
+        Returns:
+            list: Fila con el formato de registros.csv
+        """
+        id, anio, tipo, nombre, correo, grupo, titulo = REGISTRO.unpack_from(
+            self._mapa, CABECERA.size + numero * REGISTRO.size)
+        extra = anio if tipo == 0 else self._cadena(titulo)
+        return [TIPOS[tipo], id, self._cadena(nombre), self._cadena(correo),
+                self._cadena(grupo), extra]
+
+    def id_de(self, numero):
+        """
+        Devuelve solo el ID de la fila indicada.
+        """
+        return REGISTRO.unpack_from(self._mapa, CABECERA.size + numero * REGISTRO.size)[0]
+
+    def buscar(self, id):
+        """
+        Busca el número de fila de un ID con búsqueda binaria.
+
+        Returns:
+            int/None: Número de fila, o None si el ID no está
+        """
+        i = bisect_left(self._ids, id)
+        if i < self.total and self._indice[2 * i] == id:
+            return self._indice[2 * i + 1]
+        return None
+
+    def filas(self):
+        """
+        Genera todas las filas en el orden en que se escribieron.
+        """
+        for numero in range(self.total):
+            yield self.fila(numero)
+
+    def cerrar(self):
+        """
+        Libera el mapa de memoria y el archivo.
+        """
+        if self._mapa is not None:
+            # Las vistas deben soltarse antes de cerrar el mapa
+            if self._indice is not None:
+                self._indice.release()
+                self._vista.release()
+            self._mapa.close()
+            self._mapa = None
+        self._file.close()
+
+
+class _IdsOrdenados:
+    """
+    Secuencia de los IDs del índice, para usarla con bisect.
+    """
+
+    def __init__(self, indice):
+        self._indice = indice
+
+    def __len__(self):
+        return len(self._indice) // 2
+
+    def __getitem__(self, i):
+        return self._indice[2 * i]
+
+
+class AlmacenBinario(MutableMapping):
+    """
+    Diccionario ID -> registro respaldado por un archivo binario en mmap.
+    Abrirlo no lee los registros: cada acceso decodifica la fila del mapa
+    de memoria. Los registros nuevos o modificados y las bajas se guardan
+    en memoria hasta la siguiente instantánea.
+    """
+
+    def __init__(self, ruta, fabrica):
+        """
+        Args:
+            ruta (str): Archivo binario (puede no existir todavía)
+            fabrica (callable): Convierte una fila en un registro
+        """
+        self.ruta = ruta
+        self._fabrica = fabrica
+        self._archivo = ArchivoBinario(ruta) if os.path.exists(ruta) else None
+        self.ultimo_id = self._archivo.ultimo_id if self._archivo else 0
+        self._cambios = {}  # ID del archivo -> registro modificado, o None si se borró
+        self._nuevos = {}  # ID -> registro que no está en el archivo
+        self._borrados = 0
+
+    def _numero(self, id):
+        """
+        Número de fila de un ID en el archivo, o None.
+        """
+        if self._archivo is None or not isinstance(id, int):
+            return None
+        return self._archivo.buscar(id)
+
+    def __getitem__(self, id):
+        if id in self._nuevos:
+            return self._nuevos[id]
+        if id in self._cambios:
+            registro = self._cambios[id]
+            if registro is None:
+                raise KeyError(id)
+            return registro
+        numero = self._numero(id)
+        if numero is None:
+            raise KeyError(id)
+        return self._fabrica(self._archivo.fila(numero))
+
+    def __setitem__(self, id, registro):
+        if id in self._nuevos or self._numero(id) is None:
+            self._nuevos[id] = registro
+        else:
+            if self._cambios.get(id, registro) is None:
+                self._borrados -= 1  # Vuelve a existir un ID borrado
+            self._cambios[id] = registro
+
+    def __delitem__(self, id):
+        if id in self._nuevos:
+            del self._nuevos[id]
+        elif self._numero(id) is not None and self._cambios.get(id, True) is not None:
+            self._cambios[id] = None
+            self._borrados += 1
+        else:
+            raise KeyError(id)
+
+    def __iter__(self):
+        if self._archivo is not None:
+            for numero in range(self._archivo.total):
+                id = self._archivo.id_de(numero)
+                if self._cambios.get(id, True) is not None:
+                    yield id
+        yield from list(self._nuevos)
+
+    def __len__(self):
+        total = self._archivo.total if self._archivo else 0
+        return total - self._borrados + len(self._nuevos)
+
+    def iterar_registros(self):
+        """
+        Genera los registros en orden recorriendo el archivo secuencialmente.
+        """
+        if self._archivo is not None:
+            for fila in self._archivo.filas():
+                cambio = self._cambios.get(fila[1], False)
+                if cambio is None:
+                    continue  # Borrado
+                yield cambio if cambio is not False else self._fabrica(fila)
+        yield from list(self._nuevos.values())
+
+    def values(self):
+        """
+        Vista de los registros que recorre el archivo en orden.
+        """
+        return _ValoresBinarios(self)
+
+    def cerrar(self):
+        """
+        Cierra el archivo mapeado.
+        """
+        if self._archivo is not None:
+            self._archivo.cerrar()
+            self._archivo = None
+
+
+class _ValoresBinarios(ValuesView):
+    """
+    Vista de valores de AlmacenBinario que recorre el archivo en orden.
+    """
+
+    def __iter__(self):
+        return self._mapping.iterar_registros()
+
+
+# CONVERSIÓN CON EL FORMATO CSV
+def _ultimo_id_csv(ruta):
+    """
+    Lee el último ID de la fila ['ultimo_id', N] con que empieza un
+    registros.csv (0 si no la tiene).
+    """
+    with open(ruta, 'r', newline='', encoding='utf-8') as file:
+        row = next(csv.reader(file, delimiter=';'), None)
+    try:
+        return int(row[1]) if row and row[0] == 'ultimo_id' else 0
+    except (IndexError, ValueError):
+        return 0
+
+
+def _filas_csv(ruta):
+    """
+    Genera las filas válidas de un registros.csv leyéndolo de a una, sin
+    cargarlo entero. Las filas corruptas se omiten igual que en cargar_datos.
+    """
+    with open(ruta, 'r', newline='', encoding='utf-8') as file:
+        for row in csv.reader(file, delimiter=';'):
+            try:
+                if row[0] == 'estudiante':
+                    fila = [row[0], int(row[1]), row[2], row[3], row[4], int(row[5])]
+                elif row[0] == 'docente':
+                    fila = [row[0], int(row[1]), row[2], row[3], row[4], row[5]]
+                else:
+                    continue  # Fila ultimo_id (o desconocida)
+            except (IndexError, ValueError):
+                continue
+            yield fila
+
+
+def csv_a_binario(ruta_csv, ruta_binario):
+    """
+    Convierte un registros.csv al formato binario.
+
+    Returns:
+        int: Número de registros convertidos
+
+    Raises:
+        ValueError: Si un año no cabe en el formato binario
+    """
+    with open(ruta_binario, 'wb') as file:
+        return escribir_binario(file, _filas_csv(ruta_csv), _ultimo_id_csv(ruta_csv))
+
+
+def binario_a_csv(ruta_binario, ruta_csv):
+    """
+    Convierte un archivo binario al formato de registros.csv (con la fila
+    ultimo_id al principio, igual que guardar_datos).
+
+    Returns:
+        int: Número de registros convertidos
+    """
+    archivo = ArchivoBinario(ruta_binario)
+    try:
+        with open(ruta_csv, 'w', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file, delimiter=';')
+            writer.writerow(['ultimo_id', archivo.ultimo_id])
+            writer.writerows(archivo.filas())
+        return archivo.total
+    finally:
+        archivo.cerrar()
+
+
+def main():
+    """
+    Herramienta de conversión entre CSV y binario.
+    """
+    parser = argparse.ArgumentParser(description="Conversión de registros CSV <-> binario")
+    parser.add_argument('direccion', choices=['a-binario', 'a-csv'])
+    parser.add_argument('origen')
+    parser.add_argument('destino')
+    args = parser.parse_args()
+
+    try:
+        if args.direccion == 'a-binario':
+            total = csv_a_binario(args.origen, args.destino)
+        else:
+            total = binario_a_csv(args.origen, args.destino)
+    except (OSError, ValueError) as e:
+        parser.exit(1, f"❌ {e}\n")
+    print(f"✅ {total} registros convertidos: {args.origen} -> {args.destino}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,433 @@
+"""
+Respaldos comprimidos por bloques
+=================================
+Formato para guardar una copia de todos los registros en un momento dado
+(p. ej. un respaldo por semestre) ocupando poco y sin armar la salida
+completa en memoria. Los registros se escriben por bloques de
+FILAS_POR_BLOQUE filas y cada bloque se comprime por separado:
+
+    gzip   cada bloque es un miembro gzip con su propio CRC-32
+    zstd   cada bloque es un frame zstd con su suma de verificación
+           (requiere el paquete opcional zstandard)
+
+Como gzip y zstd admiten varios miembros o frames seguidos, el respaldo
+completo sigue siendo un .gz o .zst normal: `zcat respaldo.csv.gz`
+devuelve el mismo contenido. Al leerlo se verifica la suma de cada bloque,
+así que un respaldo dañado o truncado se detecta e informa con el número
+del bloque afectado.
+
+El último bloque es un cierre con los totales escritos. Un archivo cortado
+justo entre dos bloques tiene bloques íntegros pero no tiene cierre (o no
+coinciden los totales), así que también se rechaza.
+
+El contenido descomprimido puede ser:
+
+    csv    el mismo formato que registros.csv (separado por ';', con la
+           fila ultimo_id al principio) más la fila de cierre
+           fin;registros;N;bloques;B
+    jsonl  una línea {"ultimo_id": N} seguida de un objeto JSON por
+           registro (los campos de diccionario_de_registro) y la línea de
+           cierre {"fin": {"registros": N, "bloques": B}}
+
+Este módulo trabaja con filas en el mismo formato que guardar_datos
+(['estudiante'|'docente', id, nombre, correo, carrera/departamento,
+año/título]) y no depende de registro_academico.
+
+Uso:
+    python formato_respaldo.py verificar respaldo.csv.gz
+    python formato_respaldo.py a-csv respaldo.jsonl.zst registros.csv
+"""
+
+import argparse
+import csv
+import gzip
+import io
+import json
+import os
+import zlib
+
+try:
+    import zstandard  # Opcional: sin él solo se puede usar gzip
+except ImportError:
+    zstandard = None
+
+FORMATOS = ('csv', 'jsonl')
+COMPRESIONES = ('gzip', 'zstd')
+NIVELES = {'gzip': 6, 'zstd': 3}  # Nivel de compresión por defecto
+FILAS_POR_BLOQUE = 10_000
+TAMANO_LECTURA = 1 << 20  # Bytes comprimidos leídos por vez
+
+MAGIA_GZIP = b'\x1f\x8b'
+MAGIA_ZSTD = b'\x28\xb5\x2f\xfd'
+
+
+def compresiones_disponibles():
+    """
+    Returns:
+        tuple: Compresiones que se pueden usar con los paquetes instalados
+    """
+    return COMPRESIONES if zstandard is not None else ('gzip',)
+
+
+def deducir_compresion(ruta):
+    """
+    Devuelve la compresión que corresponde a la extensión de un archivo.
+
+    Returns:
+        str/None: 'gzip' (.gz), 'zstd' (.zst) o None si no es un respaldo
+    """
+    if ruta.endswith('.gz'):
+        return 'gzip'
+    if ruta.endswith('.zst'):
+        return 'zstd'
+    return None
+
+
+def _compresor(compresion, nivel):
+    """
+    Devuelve la función que comprime un bloque como un miembro gzip o un
+    frame zstd independiente, con su suma de verificación.
+
+    Raises:
+        ValueError: Si la compresión no existe o no está instalada
+    """
+    if compresion not in COMPRESIONES:
+        raise ValueError(f"Compresión no soportada: {compresion}")
+    if nivel is None:
+        nivel = NIVELES[compresion]
+    if compresion == 'gzip':
+        # mtime=0: el mismo contenido produce siempre los mismos bytes
+        return lambda datos: gzip.compress(datos, compresslevel=nivel, mtime=0)
+    if zstandard is None:
+        raise ValueError("La compresión zstd requiere el paquete zstandard")
+    return zstandard.ZstdCompressor(level=nivel, write_checksum=True).compress
+
+
+# CONVERSIÓN ENTRE FILAS Y TEXTO
+def _diccionario_de_fila(fila):
+    """
+    Convierte una fila (o la fila ultimo_id) en el objeto de una línea JSON.
+    """
+    tipo, id, *resto = fila
+    if tipo == 'ultimo_id':
+        return {'ultimo_id': int(id)}
+    if tipo == 'fin':
+        return {'fin': {'registros': resto[0], 'bloques': resto[2]}}
+    nombre, correo, grupo, extra = resto
+    if tipo == 'estudiante':
+        propios = {'carrera': grupo, 'anio': int(extra)}
+    else:
+        propios = {'departamento': grupo, 'titulo': extra}
+    return {'tipo': tipo, 'id': int(id), 'nombre': nombre, 'correo': correo, **propios}
+
+
+def _fila_de_diccionario(objeto):
+    """
+    Convierte el objeto de una línea JSON en una fila.
+
+    Raises:
+        KeyError: Si le falta un campo
+    """
+    if 'ultimo_id' in objeto:
+        return ['ultimo_id', objeto['ultimo_id']]
+    if 'fin' in objeto:
+        return _fila_de_cierre(objeto['fin']['registros'], objeto['fin']['bloques'])
+    if objeto['tipo'] == 'estudiante':
+        grupo, extra = objeto['carrera'], objeto['anio']
+    else:
+        grupo, extra = objeto['departamento'], objeto['titulo']
+    return [objeto['tipo'], objeto['id'], objeto['nombre'], objeto['correo'], grupo, extra]
+
+
+def _fila_de_cierre(registros, bloques):
+    """
+    Fila del bloque de cierre. El segundo campo no es numérico para que,
+    si el CSV descomprimido se usa como registros.csv, no se tome como ID.
+    """
+    return ['fin', 'registros', registros, 'bloques', bloques]
+
+
+def _texto_csv(filas):
+    salida = io.StringIO()
+    csv.writer(salida, delimiter=';').writerows(filas)
+    return salida.getvalue()
+
+
+def _texto_jsonl(filas):
+    return ''.join(json.dumps(_diccionario_de_fila(fila), ensure_ascii=False) + '\n'
+                   for fila in filas)
+
+
+# ESCRITURA
+def escribir_respaldo(file, filas, ultimo_id, formato='csv', compresion='gzip',
+                      nivel=None, filas_por_bloque=FILAS_POR_BLOQUE):
+    """
+    Escribe un respaldo bloque a bloque: en memoria solo hay un bloque a la vez.
+
+    Args:
+        file: Archivo abierto en modo 'wb'
+        filas (iterable): Filas con el formato de registros.csv
+        ultimo_id (int): Último ID asignado
+        formato (str): 'csv' o 'jsonl'
+        compresion (str): 'gzip' o 'zstd'
+        nivel (int/None): Nivel de compresión (None = NIVELES[compresion])
+        filas_por_bloque (int): Filas por bloque comprimido
+
+    Returns:
+        dict: registros, bloques (incluido el de cierre), bytes_datos (sin
+        comprimir) y bytes_comprimidos
+
+    Raises:
+        ValueError: Si el formato o la compresión no son válidos
+    """
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato no soportado: {formato}")
+    if filas_por_bloque < 1:
+        raise ValueError("Cada bloque debe tener al menos una fila")
+    comprimir = _compresor(compresion, nivel)
+    a_texto = _texto_csv if formato == 'csv' else _texto_jsonl
+
+    resumen = {'registros': 0, 'bloques': 0, 'bytes_datos': 0, 'bytes_comprimidos': 0}
+
+    def escribir_bloque(bloque):
+        datos = a_texto(bloque).encode('utf-8')
+        comprimido = comprimir(datos)
+        file.write(comprimido)
+        resumen['bloques'] += 1
+        resumen['bytes_datos'] += len(datos)
+        resumen['bytes_comprimidos'] += len(comprimido)
+
+    bloque = [['ultimo_id', ultimo_id]]  # La fila ultimo_id va al principio del primero
+    filas = iter(filas)
+    while True:
+        for fila in filas:
+            bloque.append(fila)
+            resumen['registros'] += 1
+            if len(bloque) >= filas_por_bloque:
+                break
+        if not bloque:
+            break
+        escribir_bloque(bloque)
+        bloque = []
+    # El cierre va solo en su bloque: si el archivo se corta antes, falta entero
+    escribir_bloque([_fila_de_cierre(resumen['registros'], resumen['bloques'])])
+    return resumen
+
+
+# LECTURA
+class LectorRespaldo:
+    """
+    Lee un respaldo bloque a bloque verificando la suma de cada uno.
+    La compresión se reconoce por los primeros bytes del archivo y el
+    formato por el contenido del primer bloque.
+    """
+
+    def __init__(self, file):
+        """
+        Args:
+            file: Archivo abierto en modo 'rb'
+
+        Raises:
+            ValueError: Si no es un respaldo gzip o zstd (o falta zstandard)
+        """
+        self._file = file
+        magia = file.read(4)
+        if magia.startswith(MAGIA_GZIP):
+            self.compresion = 'gzip'
+        elif magia == MAGIA_ZSTD:
+            if zstandard is None:
+                raise ValueError("Leer un respaldo zstd requiere el paquete zstandard")
+            self.compresion = 'zstd'
+        else:
+            raise ValueError("El archivo no es un respaldo gzip ni zstd")
+        self._pendiente = magia  # Bytes leídos que aún no se descomprimieron
+        self.formato = None
+        self.bloques = 0
+        self.bytes_datos = 0
+        self.bytes_comprimidos = 0
+
+    def _descompresor(self):
+        if self.compresion == 'gzip':
+            return zlib.decompressobj(zlib.MAX_WBITS | 16)  # Un miembro gzip
+        return zstandard.ZstdDecompressor().decompressobj()  # Un frame zstd
+
+    def leer_bloques(self):
+        """
+        Genera el contenido descomprimido de cada bloque.
+
+        Raises:
+            ValueError: Si un bloque está dañado o el archivo está truncado
+        """
+        errores = (zlib.error,) if zstandard is None else (zlib.error, zstandard.ZstdError)
+        descompresor, partes = self._descompresor(), []
+        while True:
+            datos = self._pendiente or self._file.read(TAMANO_LECTURA)
+            self._pendiente = b''
+            if not datos:
+                if partes:  # Se empezó un bloque que no terminó
+                    raise ValueError(f"El respaldo está truncado: el bloque "
+                                     f"{self.bloques + 1} está incompleto")
+                return
+            self.bytes_comprimidos += len(datos)
+            try:
+                partes.append(descompresor.decompress(datos))
+            except errores as e:
+                raise ValueError(f"El bloque {self.bloques + 1} del respaldo "
+                                 f"está dañado: {e}") from e
+            if descompresor.eof:
+                # Fin del miembro o frame (ya verificado): lo que sobra es
+                # el comienzo del bloque siguiente
+                self._pendiente = descompresor.unused_data
+                self.bytes_comprimidos -= len(self._pendiente)
+                bloque = b''.join(partes)
+                self.bloques += 1
+                self.bytes_datos += len(bloque)
+                yield bloque
+                descompresor, partes = self._descompresor(), []
+
+    def _filas_del_bloque(self, bloque):
+        """
+        Genera las filas de un bloque descomprimido.
+        """
+        texto = bloque.decode('utf-8')
+        if self.formato is None:
+            self.formato = 'jsonl' if texto.startswith('{') else 'csv'
+        if self.formato == 'csv':
+            try:
+                filas = [fila for fila in csv.reader(io.StringIO(texto), delimiter=';') if fila]
+            except csv.Error as e:
+                raise ValueError(f"CSV inválido en el bloque {self.bloques}: {e}") from e
+            yield from filas
+            return
+        for linea in texto.splitlines():
+            if not linea.strip():
+                continue
+            try:
+                yield _fila_de_diccionario(json.loads(linea))
+            except (json.JSONDecodeError, KeyError, TypeError) as e:
+                raise ValueError(f"Línea inválida en el bloque {self.bloques}: {e}") from e
+
+    def leer_filas(self):
+        """
+        Genera las filas de todos los bloques, empezando por la fila
+        ['ultimo_id', N]. Los valores de las filas CSV son texto. La fila
+        de cierre no se genera: se comprueba con ella que no falte nada.
+
+        Raises:
+            ValueError: Si un bloque está dañado o tiene líneas inválidas, o
+                si falta el cierre o sus totales no coinciden con lo leído
+                (la excepción llega al terminar de recorrer las filas)
+        """
+        registros = 0
+        cierre = None
+        for bloque in self.leer_bloques():
+            for fila in self._filas_del_bloque(bloque):
+                if cierre is not None:
+                    raise ValueError(f"El bloque {self.bloques} tiene datos después del cierre")
+                if fila[0] == 'fin':
+                    cierre = fila
+                    continue
+                if fila[0] != 'ultimo_id':
+                    registros += 1
+                yield fila
+
+        if cierre is None:
+            raise ValueError(f"El respaldo está incompleto: falta el bloque de cierre "
+                             f"después del bloque {self.bloques}")
+        try:
+            esperados = (int(cierre[2]), int(cierre[4]))
+        except (IndexError, ValueError) as e:
+            raise ValueError(f"El cierre del respaldo es inválido: {cierre}") from e
+        if esperados != (registros, self.bloques - 1):
+            raise ValueError(f"El respaldo está incompleto: se leyeron {registros} registros "
+                             f"en {self.bloques - 1} bloques y el cierre indica "
+                             f"{esperados[0]} en {esperados[1]}")
+
+    def resumen(self):
+        """
+        Returns:
+            dict: formato, compresion, bloques, bytes_datos y bytes_comprimidos leídos
+        """
+        return {'formato': self.formato, 'compresion': self.compresion,
+                'bloques': self.bloques, 'bytes_datos': self.bytes_datos,
+                'bytes_comprimidos': self.bytes_comprimidos}
+
+
+# HERRAMIENTAS
+def verificar(ruta):
+    """
+    Lee un respaldo completo verificando todos sus bloques.
+
+    Returns:
+        dict: Resumen del LectorRespaldo más registros y último ID
+
+    Raises:
+        ValueError: Si el respaldo está dañado o incompleto
+    """
+    registros = ultimo_id = 0
+    with open(ruta, 'rb') as file:
+        lector = LectorRespaldo(file)
+        for fila in lector.leer_filas():
+            if fila[0] == 'ultimo_id':
+                ultimo_id = int(fila[1])
+            else:
+                registros += 1
+        return dict(lector.resumen(), registros=registros, ultimo_id=ultimo_id)
+
+
+def respaldo_a_csv(ruta_respaldo, ruta_csv):
+    """
+    Descomprime un respaldo al formato de registros.csv. Se escribe en un
+    temporal que solo reemplaza al destino si el respaldo estaba completo.
+
+    Returns:
+        int: Número de registros escritos
+
+    Raises:
+        ValueError: Si el respaldo está dañado o incompleto
+    """
+    total = 0
+    temporal = ruta_csv + '.tmp'
+    try:
+        with open(ruta_respaldo, 'rb') as origen, \
+                open(temporal, 'w', newline='', encoding='utf-8') as destino:
+            writer = csv.writer(destino, delimiter=';')
+            for fila in LectorRespaldo(origen).leer_filas():
+                writer.writerow(fila)
+                total += fila[0] != 'ultimo_id'
+        os.replace(temporal, ruta_csv)
+    finally:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+    return total
+
+
+def main():
+    """
+    Verificación y descompresión de respaldos.
+    """
+    parser = argparse.ArgumentParser(description="Respaldos comprimidos de registros")
+    subparsers = parser.add_subparsers(dest='comando', required=True)
+    comando = subparsers.add_parser('verificar', help="Comprueba la suma de cada bloque")
+    comando.add_argument('respaldo')
+    comando = subparsers.add_parser('a-csv', help="Descomprime al formato de registros.csv")
+    comando.add_argument('respaldo')
+    comando.add_argument('destino')
+    args = parser.parse_args()
+
+    try:
+        if args.comando == 'verificar':
+            resumen = verificar(args.respaldo)
+            print(f"✅ {resumen['registros']} registros en {resumen['bloques']} bloques "
+                  f"({resumen['formato']} + {resumen['compresion']}), último ID "
+                  f"{resumen['ultimo_id']}: {resumen['bytes_comprimidos']} bytes "
+                  f"comprimidos, {resumen['bytes_datos']} sin comprimir")
+        else:
+            total = respaldo_a_csv(args.respaldo, args.destino)
+            print(f"✅ {total} registros descomprimidos: {args.respaldo} -> {args.destino}")
+    except (OSError, ValueError) as e:
+        parser.exit(1, f"❌ {e}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+"""
+Importación masiva de registros
+===============================
+Carga en RegistroAcademico grandes archivos de estudiantes y docentes
+(CSV o JSON lines). El archivo se lee por bloques y las filas se validan
+en paralelo en un grupo de procesos, con solo unos pocos bloques en
+vuelo a la vez. Los registros válidos de cada bloque se agregan en un
+lote (con sus IDs reservados de una vez) en cuanto el bloque se valida,
+así la memoria no crece con el tamaño del archivo. Cada fila inválida
+(o con un correo ya registrado) se informa con su número de línea y el
+motivo.
+
+Columnas esperadas (encabezado del CSV o claves del JSON):
+    tipo           'estudiante' o 'docente'
+    nombre, correo
+    carrera, anio  para estudiantes
+    departamento, titulo  para docentes
+
+Uso:
+    python importacion.py nuevos.csv
+    python importacion.py nuevos.jsonl --formato jsonl --procesos 4
+"""
+
+import argparse
+import csv
+import json
+import os
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from registro_academico import (Docente, ErrorRegistro, Estudiante, RegistroAcademico,
+                                normalizar_correo)
+
+PATRON_CORREO = re.compile(r'^[^@\s;]+@[^@\s;]+\.[^@\s;]+$')
+CAMPOS = {
+    'estudiante': ('nombre', 'correo', 'carrera', 'anio'),
+    'docente': ('nombre', 'correo', 'departamento', 'titulo'),
+}
+
+
+# LECTURA POR BLOQUES
+def leer_filas(ruta, formato='csv', delimitador=';'):
+    """
+    Genera (número de línea, diccionario de campos) para cada fila.
+
+    Args:
+        ruta (str): Archivo a importar
+        formato (str): 'csv' (con encabezado) o 'jsonl'
+        delimitador (str): Separador de columnas del CSV
+    """
+    with open(ruta, 'r', newline='', encoding='utf-8') as file:
+        if formato == 'csv':
+            reader = csv.DictReader(file, delimiter=delimitador)
+            for fila in reader:
+                yield reader.line_num, fila
+        elif formato == 'jsonl':
+            for numero, linea in enumerate(file, start=1):
+                if not linea.strip():
+                    continue
+                try:
+                    yield numero, json.loads(linea)
+                except json.JSONDecodeError as e:
+                    yield numero, {'_error': f"JSON inválido: {e.msg}"}
+        else:
+            raise ValueError(f"Formato no soportado: {formato}")
+
+
+def en_bloques(filas, tamano):
+    """
+    Agrupa un iterable en listas de hasta `tamano` elementos.
+    """
+    filas = iter(filas)
+    while True:
+        bloque = list(islice(filas, tamano))
+        if not bloque:
+            return
+        yield bloque
+
+
+# VALIDACIÓN (se ejecuta en los procesos del grupo)
+def texto_de_campo(campos, campo):
+    """
+    Devuelve un campo como texto sin espacios ('' si falta). Un valor JSON
+    como 0 o false cuenta como presente.
+    """
+    valor = campos.get(campo)
+    return '' if valor is None else str(valor).strip()
+
+
+def validar_fila(campos):
+    """
+    Valida una fila y la convierte en (tipo, nombre, correo, grupo, extra).
+
+    Args:
+        campos (dict): Campos leídos del archivo
+
+    Returns:
+        tuple: (fila normalizada, None) o (None, mensaje de error)
+    """
+    if not isinstance(campos, dict):
+        return None, "La fila debe ser un objeto con campos"
+    if '_error' in campos:
+        return None, campos['_error']
+    tipo = texto_de_campo(campos, 'tipo').lower()
+    if tipo not in CAMPOS:
+        return None, f"Tipo no válido: '{tipo}' (debe ser estudiante o docente)"
+
+    valores = []
+    for campo in CAMPOS[tipo]:
+        valor = texto_de_campo(campos, campo)
+        if not valor:
+            return None, f"Falta el campo obligatorio '{campo}'"
+        valores.append(valor)
+    nombre, correo, grupo, extra = valores
+
+    if not PATRON_CORREO.match(correo):
+        return None, f"Correo con formato inválido: '{correo}'"
+    if tipo == 'estudiante':
+        try:
+            extra = int(extra)
+        except ValueError:
+            return None, f"El año debe ser un número entero: '{extra}'"
+    return (tipo, nombre, correo, grupo, extra), None
+
+
+def validar_bloque(bloque):
+    """
+    Valida un bloque de filas.
+
+    Args:
+        bloque (list): Pares (número de línea, campos)
+
+    Returns:
+        tuple: (lista de (línea, fila válida), lista de (línea, error))
+    """
+    validas = []
+    errores = []
+    for numero, campos in bloque:
+        fila, error = validar_fila(campos)
+        if error is None:
+            validas.append((numero, fila))
+        else:
+            errores.append((numero, error))
+    return validas, errores
+
+
+# IMPORTACIÓN
+def validar_en_orden(bloques, ejecutor, ventana):
+    """
+    Genera el resultado de validar_bloque para cada bloque, en el orden del
+    archivo. Con un grupo de procesos mantiene como mucho `ventana` bloques
+    enviados sin consumir: el siguiente bloque se lee y se envía recién
+    cuando se entrega el resultado más antiguo.
+
+    Args:
+        bloques (iterable): Bloques de (número de línea, campos)
+        ejecutor (ProcessPoolExecutor/None): Grupo de procesos (None = validar aquí)
+        ventana (int): Máximo de bloques en vuelo
+    """
+    if ejecutor is None:
+        yield from map(validar_bloque, bloques)
+        return
+    pendientes = deque()
+    for bloque in bloques:
+        pendientes.append(ejecutor.submit(validar_bloque, bloque))
+        if len(pendientes) >= ventana:
+            yield pendientes.popleft().result()
+    while pendientes:
+        yield pendientes.popleft().result()
+
+
+def agregar_validas(sistema, validas, errores):
+    """
+    Agrega las filas válidas de un bloque, descartando los correos ya
+    registrados (incluidos los de bloques anteriores del mismo archivo) o
+    repetidos dentro del bloque, que agregar_lote rechazaría.
+
+    Args:
+        sistema (RegistroAcademico): Registro de destino
+        validas (list): Pares (línea, fila validada) del bloque
+        errores (list): Lista donde se anotan los (línea, motivo) descartados
+
+    Returns:
+        int: Número de registros agregados
+    """
+    # Todo bajo el cerrojo (reentrante) del registro: si otro hilo diera de
+    # alta uno de estos correos entre la comprobación y agregar_lote, el
+    # lote entero se rechazaría y sus IDs reservados se perderían
+    with sistema._cerrojo:
+        vistos = {}
+        unicas = []
+        for numero, fila in validas:
+            correo = fila[2]
+            clave = normalizar_correo(correo)
+            dueno = sistema.correo_registrado(correo)
+            if dueno is not None:
+                errores.append((numero, f"El correo {correo} ya está registrado (ID {dueno})"))
+            elif clave in vistos:
+                errores.append((numero, f"Correo repetido: {correo} (línea {vistos[clave]})"))
+            else:
+                vistos[clave] = numero
+                unicas.append(fila)
+
+        # Reserva los IDs del bloque de una vez y lo agrega en un solo lote
+        registros = []
+        for id, (tipo, nombre, correo, grupo, extra) in zip(
+                sistema.reservar_ids(len(unicas)), unicas):
+            clase = Estudiante if tipo == 'estudiante' else Docente
+            registros.append(clase(id, nombre, correo, grupo, extra))
+        return sistema.agregar_lote(registros)
+
+
+def importar(sistema, ruta, formato='csv', delimitador=';', tamano_bloque=5000, procesos=None):
+    """
+    Importa un archivo completo en el sistema, bloque a bloque. Si la
+    importación se interrumpe, los bloques anteriores ya quedan agregados.
+
+    Args:
+        sistema (RegistroAcademico): Registro de destino
+        ruta (str): Archivo a importar
+        formato (str): 'csv' o 'jsonl'
+        delimitador (str): Separador de columnas del CSV
+        tamano_bloque (int): Filas por bloque enviado a cada proceso
+        procesos (int/None): Procesos de validación (None = núcleos
+            disponibles; 1 = validar en este mismo proceso)
+
+    Returns:
+        dict: {'importados': int, 'errores': [(línea, motivo), ...]}
+    """
+    bloques = en_bloques(leer_filas(ruta, formato, delimitador), tamano_bloque)
+    importados = 0
+    errores = []
+    ejecutor = None if procesos == 1 else ProcessPoolExecutor(max_workers=procesos)
+    try:
+        # Dos bloques por proceso: mientras se agrega uno, los demás se validan.
+        # Los bloques se agregan en orden, así los IDs siguen el del archivo
+        ventana = 2 * (procesos or os.cpu_count() or 1)
+        for validas, errores_bloque in validar_en_orden(bloques, ejecutor, ventana):
+            importados += agregar_validas(sistema, validas, errores_bloque)
+            errores.extend(sorted(errores_bloque))
+    finally:
+        if ejecutor is not None:
+            ejecutor.shutdown(cancel_futures=True)
+    return {'importados': importados, 'errores': errores}
+
+
+def main():
+    """
+    Importa un archivo en el registro del directorio actual y lo guarda.
+    """
+    parser = argparse.ArgumentParser(description="Importación masiva de registros")
+    parser.add_argument('archivo')
+    parser.add_argument('--formato', choices=['csv', 'jsonl'], default=None,
+                        help="Por defecto se deduce de la extensión")
+    parser.add_argument('--delimitador', default=';')
+    parser.add_argument('--lote', type=int, default=5000, help="Filas por bloque")
+    parser.add_argument('--procesos', type=int, default=None)
+    args = parser.parse_args()
+
+    formato = args.formato
+    if formato is None:
+        formato = 'jsonl' if os.path.splitext(args.archivo)[1] in ('.jsonl', '.json') else 'csv'
+
+    try:
+        sistema = RegistroAcademico()
+    except ErrorRegistro as e:
+        print(f"\n❌ Error: {e}")
+        return
+    try:
+        resultado = importar(sistema, args.archivo, formato, args.delimitador,
+                             args.lote, args.procesos)
+        print(f"\n✅ {resultado['importados']} registros importados")
+        if resultado['errores']:
+            print(f"❌ {len(resultado['errores'])} filas con errores:")
+            for numero, motivo in resultado['errores']:
+                print(f"   Línea {numero}: {motivo}")
+    finally:
+        try:
+            # También si la importación se cortó: los bloques ya agregados
+            # se guardan en vez de perderse al salir
+            if sistema.cambios_sin_guardar:
+                try:
+                    sistema.guardar_datos()
+                    print("💾 Datos guardados exitosamente!")
+                except ErrorRegistro as e:
+                    print(f"\n❌ Error al guardar: {e}")
+        finally:
+            sistema.cerrar()
+
+
+if __name__ == "__main__":
+    main()
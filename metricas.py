@@ -0,0 +1,377 @@
+"""
+Métricas de rendimiento
+=======================
+Instrumentación opcional de RegistroAcademico. Al activarla, cada método
+público de una instancia se reemplaza por una envoltura que cuenta las
+llamadas y los errores, acumula un histograma de latencias y anota las
+filas recorridas y los bytes leídos o escritos por el backend durante la
+llamada. Sin activar no hay envolturas: los métodos de la clase se llaman
+directamente y el costo es cero.
+
+También permite perfilar con cProfile las llamadas a una operación
+elegida, para ver en qué funciones se va el tiempo.
+
+Este módulo no depende de registro_academico: recibe el objeto a
+instrumentar, y quien lee o escribe en disco informa los bytes con
+Metricas.anotar_bytes.
+"""
+
+import bisect
+import cProfile
+import inspect
+import io
+import pstats
+import threading
+import time
+from functools import wraps
+
+# Límites superiores (en ms) de los tramos del histograma de latencias; el
+# último tramo acumula todo lo que supera 10 s
+LIMITES_MS = (0.01, 0.03, 0.1, 0.3, 1, 3, 10, 30, 100, 300, 1000, 3000, 10000)
+
+
+class MetricasOperacion:
+    """
+    Contadores de una operación (un método instrumentado).
+    """
+
+    __slots__ = ('llamadas', 'errores', 'tiempo_total', 'tiempo_max', 'histograma',
+                 'filas_recorridas', 'bytes_leidos', 'bytes_escritos')
+
+    def __init__(self):
+        self.llamadas = 0
+        self.errores = 0
+        self.tiempo_total = 0.0  # Segundos
+        self.tiempo_max = 0.0
+        self.histograma = [0] * (len(LIMITES_MS) + 1)
+        self.filas_recorridas = 0
+        self.bytes_leidos = 0
+        self.bytes_escritos = 0
+
+    def percentil(self, fraccion):
+        """
+        Estima un percentil con el histograma: devuelve el límite superior
+        del tramo donde cae (o el máximo observado, en el último tramo).
+
+        Args:
+            fraccion (float): Por ejemplo 0.95 para el percentil 95
+
+        Returns:
+            float: Latencia en milisegundos
+        """
+        objetivo = fraccion * self.llamadas
+        acumulado = 0
+        for tramo, cantidad in enumerate(self.histograma):
+            acumulado += cantidad
+            if acumulado >= objetivo and cantidad:
+                if tramo < len(LIMITES_MS):
+                    return min(LIMITES_MS[tramo], self.tiempo_max * 1000)
+                break
+        return self.tiempo_max * 1000
+
+    def resumen(self):
+        """
+        Returns:
+            dict: Contadores de la operación listos para JSON
+        """
+        etiquetas = [f"<={limite}ms" for limite in LIMITES_MS] + [f">{LIMITES_MS[-1]}ms"]
+        return {
+            'llamadas': self.llamadas,
+            'errores': self.errores,
+            'total_ms': self.tiempo_total * 1000,
+            'media_ms': self.tiempo_total * 1000 / self.llamadas if self.llamadas else 0.0,
+            'p50_ms': self.percentil(0.5),
+            'p95_ms': self.percentil(0.95),
+            'max_ms': self.tiempo_max * 1000,
+            'histograma': {etiqueta: cantidad
+                           for etiqueta, cantidad in zip(etiquetas, self.histograma) if cantidad},
+            'filas_recorridas': self.filas_recorridas,
+            'bytes_leidos': self.bytes_leidos,
+            'bytes_escritos': self.bytes_escritos,
+        }
+
+
+class Metricas:
+    """
+    Registro de métricas de un objeto instrumentado.
+
+    Las llamadas anidadas (p. ej. guardar_datos llama a compactar) se
+    cuentan en las dos operaciones: los tiempos y los bytes son
+    inclusivos. Las filas recorridas se anotan en la operación más interna
+    en curso del hilo. Filas y bytes se anotan solo en las operaciones del
+    hilo que los leyó, así que las llamadas concurrentes de otros hilos no
+    se atribuyen entre sí.
+    """
+
+    def __init__(self):
+        """
+        Constructor de las métricas (vacías, sin nada instrumentado).
+        """
+        self._cerrojo = threading.Lock()
+        self._local = threading.local()  # Pila de operaciones en curso de cada hilo
+        self._instrumentados = []  # (objeto, nombres de métodos envueltos)
+        self._perfilar = set()  # Operaciones cuyas llamadas se perfilan
+        self._perfiles = {}  # Operación -> cProfile.Profile acumulado
+        self._perfilando = threading.Lock()  # cProfile admite un solo perfil activo
+        self.reiniciar()
+
+    def reiniciar(self):
+        """
+        Vacía todos los contadores (los perfiles capturados se conservan).
+        """
+        with self._cerrojo:
+            self.operaciones = {}
+            self.desde = time.time()
+
+    # INSTRUMENTACIÓN
+    def instrumentar(self, objeto, excluir=()):
+        """
+        Envuelve los métodos públicos de un objeto. Las envolturas se
+        guardan como atributos de la instancia, así que la clase (y las
+        demás instancias) no cambian.
+
+        Args:
+            objeto: Instancia a instrumentar
+            excluir (iterable): Nombres de métodos que no se envuelven
+        """
+        nombres = [nombre for nombre, funcion in inspect.getmembers(type(objeto), inspect.isfunction)
+                   if not nombre.startswith('_') and nombre not in excluir]
+        for nombre in nombres:
+            setattr(objeto, nombre, self._envolver(nombre, getattr(objeto, nombre)))
+        self._instrumentados.append((objeto, nombres))
+
+    def desinstrumentar(self):
+        """
+        Quita las envolturas: los métodos vuelven a ser los de la clase.
+        """
+        for objeto, nombres in self._instrumentados:
+            for nombre in nombres:
+                objeto.__dict__.pop(nombre, None)
+        self._instrumentados = []
+
+    def envolver_recorrido(self, recorrer):
+        """
+        Envuelve una función que genera registros para contar las filas que
+        se recorren (se suman al terminar o abandonar el recorrido).
+
+        Args:
+            recorrer (callable): Función sin argumentos que genera registros
+
+        Returns:
+            callable: Función equivalente que cuenta las filas
+        """
+        metricas = self
+
+        @wraps(recorrer)
+        def recorrer_contando():
+            filas = 0
+            try:
+                for registro in recorrer():
+                    filas += 1
+                    yield registro
+            finally:
+                metricas.anotar_filas(filas)
+        return recorrer_contando
+
+    def anotar_filas(self, filas):
+        """
+        Suma filas recorridas a la operación en curso del hilo.
+        """
+        pila = getattr(self._local, 'pila', None)
+        if not pila:
+            return  # Recorrido fuera de una operación instrumentada
+        with self._cerrojo:
+            self._operacion(pila[-1]).filas_recorridas += filas
+
+    def anotar_bytes(self, leidos=0, escritos=0):
+        """
+        Suma bytes leídos o escritos a las operaciones en curso del hilo
+        (la más interna y las que la llamaron).
+        """
+        pila = getattr(self._local, 'pila', None)
+        if not pila:
+            return  # E/S fuera de una operación instrumentada (p. ej. la carga inicial)
+        with self._cerrojo:
+            for nombre in set(pila):
+                operacion = self._operacion(nombre)
+                operacion.bytes_leidos += leidos
+                operacion.bytes_escritos += escritos
+
+    def _operacion(self, nombre):
+        """
+        Contadores de una operación (se crean la primera vez). Debe
+        llamarse con el cerrojo tomado.
+        """
+        operacion = self.operaciones.get(nombre)
+        if operacion is None:
+            operacion = self.operaciones[nombre] = MetricasOperacion()
+        return operacion
+
+    def _envolver(self, nombre, metodo):
+        """
+        Crea la envoltura que mide cada llamada a un método.
+        """
+        metricas = self
+
+        @wraps(metodo)
+        def medido(*args, **kwargs):
+            local = metricas._local
+            pila = getattr(local, 'pila', None)
+            if pila is None:
+                pila = local.pila = []
+            pila.append(nombre)
+            error = False
+            inicio = time.perf_counter()
+            try:
+                if nombre in metricas._perfilar:
+                    return metricas._perfilado(nombre, metodo, args, kwargs)
+                return metodo(*args, **kwargs)
+            except BaseException:
+                error = True
+                raise
+            finally:
+                duracion = time.perf_counter() - inicio
+                pila.pop()
+                with metricas._cerrojo:
+                    operacion = metricas._operacion(nombre)
+                    operacion.llamadas += 1
+                    operacion.errores += error
+                    operacion.tiempo_total += duracion
+                    operacion.tiempo_max = max(operacion.tiempo_max, duracion)
+                    operacion.histograma[bisect.bisect_left(LIMITES_MS, duracion * 1000)] += 1
+        return medido
+
+    # PERFILADO CON CPROFILE
+    def perfilar(self, operacion, activo=True):
+        """
+        Empieza (o deja) de perfilar las llamadas a una operación. Los
+        perfiles se acumulan entre llamadas hasta descartar_perfil.
+
+        Args:
+            operacion (str): Nombre del método, p. ej. 'guardar_datos'
+            activo (bool): False para dejar de perfilarla
+        """
+        if activo:
+            self._perfilar.add(operacion)
+        else:
+            self._perfilar.discard(operacion)
+
+    def perfiladas(self):
+        """
+        Returns:
+            list: Operaciones que se están perfilando
+        """
+        return sorted(self._perfilar)
+
+    def _perfilado(self, nombre, metodo, args, kwargs):
+        """
+        Ejecuta una llamada bajo cProfile. Si ya hay un perfil activo (una
+        llamada anidada u otro hilo) se ejecuta sin perfilar.
+        """
+        if not self._perfilando.acquire(blocking=False):
+            return metodo(*args, **kwargs)
+        try:
+            perfil = self._perfiles.get(nombre)
+            if perfil is None:
+                perfil = self._perfiles[nombre] = cProfile.Profile()
+            return perfil.runcall(metodo, *args, **kwargs)
+        finally:
+            self._perfilando.release()
+
+    def perfiles(self):
+        """
+        Returns:
+            list: Operaciones con un perfil capturado
+        """
+        return sorted(self._perfiles)
+
+    def informe_perfil(self, operacion, limite=20, orden='cumulative'):
+        """
+        Texto con las funciones que más tiempo tomaron en las llamadas
+        perfiladas de una operación.
+
+        Args:
+            operacion (str): Operación perfilada
+            limite (int): Número de funciones a mostrar
+            orden (str): Criterio de pstats ('cumulative', 'tottime', ...)
+
+        Returns:
+            str/None: Informe de pstats, o None si no hay perfil
+        """
+        perfil = self._perfiles.get(operacion)
+        if perfil is None:
+            return None
+        salida = io.StringIO()
+        pstats.Stats(perfil, stream=salida).sort_stats(orden).print_stats(limite)
+        return salida.getvalue()
+
+    def guardar_perfil(self, operacion, ruta):
+        """
+        Guarda el perfil de una operación en formato pstats (para abrirlo
+        con pstats, snakeviz, etc.).
+
+        Returns:
+            bool: False si la operación no tiene perfil
+        """
+        perfil = self._perfiles.get(operacion)
+        if perfil is None:
+            return False
+        perfil.dump_stats(ruta)
+        return True
+
+    def descartar_perfil(self, operacion):
+        """
+        Deja de perfilar una operación y descarta lo capturado.
+        """
+        self._perfilar.discard(operacion)
+        self._perfiles.pop(operacion, None)
+
+    # CONSULTA
+    def instantanea(self):
+        """
+        Copia de todos los contadores en un diccionario listo para JSON.
+
+        Returns:
+            dict: {'desde', 'segundos', 'operaciones': {nombre: resumen},
+            'perfiles': [operaciones perfiladas]}
+        """
+        with self._cerrojo:
+            operaciones = {nombre: operacion.resumen()
+                           for nombre, operacion in sorted(self.operaciones.items())}
+            desde = self.desde
+        return {'desde': desde, 'segundos': time.time() - desde,
+                'operaciones': operaciones, 'perfiles': self.perfiles()}
+
+
+def formatear_instantanea(instantanea):
+    """
+    Convierte una instantánea de métricas en una tabla de texto.
+
+    Args:
+        instantanea (dict): Resultado de Metricas.instantanea
+
+    Returns:
+        str: Tabla con una fila por operación
+    """
+    lineas = [f"Métricas de los últimos {instantanea['segundos']:.0f} s",
+              f"{'operación':<22}{'llamadas':>9}{'errores':>8}{'media ms':>10}"
+              f"{'p95 ms':>9}{'máx ms':>10}{'filas':>10}{'leído':>10}{'escrito':>10}"]
+    for nombre, datos in instantanea['operaciones'].items():
+        lineas.append(f"{nombre:<22}{datos['llamadas']:>9}{datos['errores']:>8}"
+                      f"{datos['media_ms']:>10.3f}{datos['p95_ms']:>9.3f}{datos['max_ms']:>10.3f}"
+                      f"{datos['filas_recorridas']:>10}{formatear_bytes(datos['bytes_leidos']):>10}"
+                      f"{formatear_bytes(datos['bytes_escritos']):>10}")
+    if not instantanea['operaciones']:
+        lineas.append("(ninguna operación registrada)")
+    return '\n'.join(lineas)
+
+
+def formatear_bytes(cantidad):
+    """
+    Tamaño legible: 512 B, 1.5 KiB, 3.2 MiB...
+    """
+    for unidad in ('B', 'KiB', 'MiB'):
+        if cantidad < 1024:
+            return f"{cantidad:.0f} {unidad}" if unidad == 'B' else f"{cantidad:.1f} {unidad}"
+        cantidad /= 1024
+    return f"{cantidad:.1f} GiB"
@@ -7,8 +7,705 @@ Los datos se guardan en archivos CSV para persistencia.
 """
 
 import os
+import copy
 import csv
+import gc
+import bisect
+import heapq
+import io
+import json
+import re
+import sys
+import threading
+import time
+import unicodedata  # Para quitar tildes en las búsquedas
 from abc import ABC, abstractmethod  # Para crear clases abstractas
+from array import array  # Arreglos compactos de enteros
+from collections import Counter, OrderedDict, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, nullcontext
+from functools import lru_cache
+from itertools import islice, repeat
+from collections.abc import MutableMapping, ValuesView
+
+from almacen_sqlite import AlmacenSQLite
+from formato_binario import AlmacenBinario, escribir_binario
+from formato_respaldo import FILAS_POR_BLOQUE, LectorRespaldo, escribir_respaldo
+from metricas import Metricas, formatear_instantanea
+
+
+# FUNCIONES AUXILIARES DE TEXTO
+def normalizar_texto(texto):
+    """
+    Normaliza un texto para búsquedas: minúsculas y sin tildes.
+    Así "Pérez" y "perez" se consideran iguales.
+
+    Args:
+        texto (str): Texto a normalizar
+
+    Returns:
+        str: Texto en minúsculas y sin marcas diacríticas
+    """
+    texto = texto.lower()
+    if texto.isascii():  # Camino rápido: no hay tildes que quitar
+        return texto
+    descompuesto = unicodedata.normalize('NFKD', texto)
+    return ''.join(c for c in descompuesto if not unicodedata.combining(c))
+
+
+def normalizar_correo(correo):
+    """
+    Normaliza un correo para compararlo: sin espacios alrededor y en
+    minúsculas. Así "Ana@Uni.edu " y "ana@uni.edu" son el mismo correo.
+
+    Args:
+        correo (str): Correo a normalizar
+
+    Returns:
+        str: Correo normalizado
+    """
+    return correo.strip().lower()
+
+
+# ÍNDICE INVERTIDO DE N-GRAMAS PARA BÚSQUEDA PARCIAL
+class IndiceNgramas:
+    """
+    Índice invertido de n-gramas (trigramas por defecto) sobre textos normalizados.
+    Permite encontrar subcadenas sin recorrer todos los registros: solo se
+    comparan los candidatos que contienen todos los n-gramas de la consulta.
+    """
+
+    def __init__(self, n=3):
+        """
+        Constructor del índice.
+
+        Args:
+            n (int): Longitud de los n-gramas
+        """
+        self.n = n
+        self._textos = {}  # ID -> texto normalizado
+        self._postings = defaultdict(set)  # n-grama -> conjunto de IDs
+
+    def _ngramas(self, texto):
+        """
+        Devuelve el conjunto de n-gramas de un texto ya normalizado.
+        """
+        n = self.n
+        return {texto[i:i + n] for i in range(len(texto) - n + 1)}
+
+    def agregar(self, id, texto):
+        """
+        Indexa el texto asociado a un ID.
+
+        Args:
+            id (int): ID del registro
+            texto (str): Texto original (se normaliza aquí)
+        """
+        normalizado = normalizar_texto(texto)
+        self._textos[id] = normalizado
+        for ngrama in self._ngramas(normalizado):
+            self._postings[ngrama].add(id)
+
+    def quitar(self, id):
+        """
+        Elimina del índice el texto asociado a un ID (si existe).
+
+        Args:
+            id (int): ID del registro
+        """
+        normalizado = self._textos.pop(id, None)
+        if normalizado is None:
+            return
+        for ngrama in self._ngramas(normalizado):
+            ids = self._postings.get(ngrama)
+            if ids is not None:
+                ids.discard(id)
+                if not ids:  # Libera n-gramas que ya no tienen registros
+                    del self._postings[ngrama]
+
+    def buscar(self, consulta):
+        """
+        Busca los IDs cuyo texto contiene la consulta (sin distinguir
+        mayúsculas ni tildes). Puede llamarse mientras otro hilo agrega o
+        quita textos: solo lee copias hechas en una operación atómica.
+
+        Args:
+            consulta (str): Texto a buscar
+
+        Returns:
+            list: IDs encontrados, ordenados de menor a mayor
+        """
+        consulta = normalizar_texto(consulta)
+        if len(consulta) < self.n:
+            # Consulta demasiado corta para usar n-gramas: recorre los textos ya normalizados
+            return sorted(id for id, texto in list(self._textos.items()) if consulta in texto)
+
+        # Intersección de las listas de IDs, empezando por la más pequeña
+        listas = []
+        for ngrama in self._ngramas(consulta):
+            ids = self._postings.get(ngrama)
+            if not ids:
+                return []  # Algún n-grama no aparece: no hay coincidencias
+            listas.append(ids)
+        listas.sort(key=len)
+        candidatos = listas[0].intersection(*listas[1:])
+
+        # Verifica solo los candidatos (los n-gramas pueden coincidir en otro orden)
+        textos = self._textos
+        return sorted(id for id in candidatos if consulta in textos.get(id, ''))
+
+    def combinar(self, otro):
+        """
+        Agrega al índice todo el contenido de otro índice con IDs distintos
+        (p. ej. el de un fragmento del CSV cargado en otro proceso). Los
+        conjuntos de IDs se unen de una vez, sin recorrer los textos.
+
+        Args:
+            otro (IndiceNgramas): Índice a incorporar (no debe usarse después)
+        """
+        self._textos.update(otro._textos)
+        for ngrama, ids in otro._postings.items():
+            actuales = self._postings.get(ngrama)
+            if actuales is None:
+                self._postings[ngrama] = ids
+            else:
+                actuales |= ids
+
+
+# BÚSQUEDA APROXIMADA: TOKENS, CLAVE FONÉTICA Y DISTANCIA DE EDICIÓN
+PATRON_TOKEN = re.compile(r'[a-z0-9]+')
+
+# Reglas de pronunciación del español, aplicadas en orden sobre un texto
+# ya normalizado (minúsculas y sin tildes). '#' marca temporalmente la 'ch'
+# y 'G' la 'g' fuerte de "gue"/"gui", para que las reglas de 'h' y de 'g'
+# suave no las toquen.
+REGLAS_FONETICAS = [(re.compile(patron), reemplazo) for patron, reemplazo in (
+    (r'ch', '#'),
+    (r'hu(?=[aeio])|gu(?=[ao])', 'w'),  # "Huamán", "Guamán" y "Wamán" suenan igual
+    (r'h', ''),  # La hache es muda
+    (r'qu(?=[ei])', 'k'),
+    (r'gu(?=[ei])', 'G'),
+    (r'g(?=[ei])', 'j'),  # "ge", "gi" suenan como "je", "ji"
+    (r'c(?=[ei])', 's'),
+    (r'[cq]', 'k'),
+    (r'z', 's'),
+    (r'x', 'ks'),
+    (r'v', 'b'),
+    (r'll', 'y'),
+    (r'y$', 'i'),
+    (r'G', 'g'),
+    (r'#', 'ch'),
+    (r'(.)\1+', r'\1'),  # Letras repetidas ("rr", "ss") cuentan una vez
+)]
+
+
+@lru_cache(maxsize=1 << 16)
+def _tokens_de_palabra(palabra):
+    """
+    Tokens normalizados de una palabra. Los nombres repiten pocas palabras
+    distintas, así que la caché evita normalizar las tildes una y otra vez.
+    """
+    return tuple(PATRON_TOKEN.findall(normalizar_texto(palabra)))
+
+
+def tokenizar(texto):
+    """
+    Separa un texto en palabras normalizadas (minúsculas y sin tildes).
+
+    Returns:
+        list: Palabras en orden, sin repetir
+    """
+    tokens = []
+    for palabra in texto.split():
+        tokens.extend(_tokens_de_palabra(palabra))
+    return list(dict.fromkeys(tokens))
+
+
+def clave_fonetica(palabra):
+    """
+    Clave de pronunciación de una palabra normalizada: palabras que suenan
+    igual en español tienen la misma clave ("gonzalez" y "gonsales" dan
+    "gonsales"; "vasquez" y "bazques" dan "baskes").
+    """
+    for patron, reemplazo in REGLAS_FONETICAS:
+        palabra = patron.sub(reemplazo, palabra)
+    return palabra
+
+
+def distancia_edicion(a, b, maximo):
+    """
+    Distancia de Damerau-Levenshtein (inserciones, borrados, cambios y
+    transposiciones de letras vecinas) con cota: deja de calcular en cuanto
+    se sabe que supera `maximo`.
+
+    Returns:
+        int: La distancia, o maximo + 1 si es mayor que maximo
+    """
+    if abs(len(a) - len(b)) > maximo:
+        return maximo + 1
+    anterior2 = None
+    anterior = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        actual = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            costo = a[i - 1] != b[j - 1]
+            actual[j] = min(anterior[j] + 1, actual[j - 1] + 1, anterior[j - 1] + costo)
+            if (anterior2 is not None and j > 1 and a[i - 1] == b[j - 2]
+                    and a[i - 2] == b[j - 1]):
+                actual[j] = min(actual[j], anterior2[j - 2] + 1)
+        if min(actual) > maximo:
+            return maximo + 1
+        anterior2, anterior = anterior, actual
+    return anterior[-1] if anterior[-1] <= maximo else maximo + 1
+
+
+def borrados(palabra):
+    """
+    La palabra y todas las variantes con una letra menos. Dos palabras a
+    distancia 1 (o 2 si ambas pierden una letra) comparten alguna variante.
+    """
+    return {palabra} | {palabra[:i] + palabra[i + 1:] for i in range(len(palabra))}
+
+
+class IndiceDifuso:
+    """
+    Índice para búsqueda aproximada de nombres con resultados ordenados
+    por parecido.
+
+    Los nombres se separan en palabras (tokens) sin tildes. La comparación
+    aproximada se hace contra el vocabulario (las palabras distintas, unos
+    miles aunque haya un millón de registros), nunca contra cada registro:
+        - clave fonética -> palabras que suenan igual ("Gonzales"/"González")
+        - variante con una letra borrada -> palabras (errores de tipeo)
+        - vocabulario ordenado, para prefijos ("gonz")
+    y las palabras parecidas llevan a los registros por su lista de IDs.
+    """
+
+    # Puntuación de una palabra parecida a la buscada (la exacta vale 1)
+    SIMILITUD_FONETICA = 0.9
+    SIMILITUD_PREFIJO = 0.6  # Más la fracción de la palabra que cubre el prefijo (hasta 0.3)
+
+    def __init__(self):
+        """
+        Constructor del índice (vacío).
+        """
+        self._postings = {}  # Palabra -> conjunto de IDs
+        self._foneticas = defaultdict(set)  # Clave fonética -> palabras
+        self._borrados = defaultdict(set)  # Variante con una letra menos -> palabras
+        self._vocabulario = []  # Palabras ordenadas (búsqueda por prefijo)
+
+    @staticmethod
+    def _distancia_maxima(palabra):
+        """
+        Errores tolerados según el largo: ninguno en palabras de hasta 3
+        letras, uno hasta 5 y dos desde 6.
+        """
+        return 0 if len(palabra) <= 3 else 1 if len(palabra) <= 5 else 2
+
+    def agregar(self, id, texto):
+        """
+        Indexa las palabras de un nombre.
+        """
+        for palabra in tokenizar(texto):
+            ids = self._postings.get(palabra)
+            if ids is None:
+                # Palabra nueva en el vocabulario
+                ids = self._postings[palabra] = set()
+                self._foneticas[clave_fonetica(palabra)].add(palabra)
+                for variante in borrados(palabra):
+                    self._borrados[variante].add(palabra)
+                bisect.insort(self._vocabulario, palabra)
+            ids.add(id)
+
+    def quitar(self, id, texto):
+        """
+        Quita un ID de las palabras de su nombre (el que tenía al indexarse).
+        """
+        for palabra in tokenizar(texto):
+            ids = self._postings.get(palabra)
+            if ids is None:
+                continue
+            ids.discard(id)
+            if ids:
+                continue
+            # Ningún registro usa ya la palabra: sale del vocabulario
+            del self._postings[palabra]
+            clave = clave_fonetica(palabra)
+            self._foneticas[clave].discard(palabra)
+            if not self._foneticas[clave]:
+                del self._foneticas[clave]
+            for variante in borrados(palabra):
+                self._borrados[variante].discard(palabra)
+                if not self._borrados[variante]:
+                    del self._borrados[variante]
+            posicion = bisect.bisect_left(self._vocabulario, palabra)
+            del self._vocabulario[posicion]
+
+    def _parecidas(self, palabra):
+        """
+        Palabras del vocabulario parecidas a una palabra buscada.
+
+        Returns:
+            dict: Palabra -> similitud entre 0 y 1
+        """
+        parecidas = {}
+        if palabra in self._postings:
+            parecidas[palabra] = 1.0
+        for otra in list(self._foneticas.get(clave_fonetica(palabra), ())):
+            parecidas.setdefault(otra, self.SIMILITUD_FONETICA)
+
+        maximo = self._distancia_maxima(palabra)
+        if maximo:
+            candidatas = set()
+            for variante in borrados(palabra):
+                candidatas.update(list(self._borrados.get(variante, ())))
+            for otra in candidatas:
+                distancia = distancia_edicion(palabra, otra, maximo)
+                if distancia <= maximo:
+                    similitud = 1 - distancia / max(len(palabra), len(otra))
+                    if similitud > parecidas.get(otra, 0):
+                        parecidas[otra] = similitud
+
+        if len(palabra) >= 3:
+            vocabulario = self._vocabulario
+            i = bisect.bisect_left(vocabulario, palabra)
+            # Copia acotada: otro hilo puede estar agregando palabras
+            for otra in vocabulario[i:i + 200]:
+                if not otra.startswith(palabra):
+                    break
+                similitud = self.SIMILITUD_PREFIJO + 0.3 * len(palabra) / len(otra)
+                if similitud > parecidas.get(otra, 0):
+                    parecidas[otra] = similitud
+        return parecidas
+
+    def buscar(self, consulta, limite=10, minimo=0.6):
+        """
+        Busca los registros más parecidos a una consulta. La puntuación de
+        un registro es el promedio, entre las palabras de la consulta, de
+        la mejor similitud con alguna palabra de su nombre (las palabras
+        que el nombre tiene de más no restan). Solo se guardan los
+        `limite` mejores en un heap acotado.
+
+        Args:
+            consulta (str): Nombre buscado, con o sin errores
+            limite (int): Máximo de resultados
+            minimo (float): Puntuación mínima (0 a 1) para aparecer
+
+        Returns:
+            list: Pares (ID, puntuación) de mayor a menor puntuación
+        """
+        palabras = tokenizar(consulta)
+        if not palabras:
+            return []
+        mejores = []
+        for palabra in palabras:
+            # Mejor similitud de cada registro con esta palabra: se vuelcan
+            # las listas de menor a mayor similitud y la mayor sobrescribe
+            mejor = {}
+            for otra, similitud in sorted(self._parecidas(palabra).items(), key=lambda x: x[1]):
+                mejor.update(dict.fromkeys(self._postings.get(otra, ()), similitud))
+            mejores.append(mejor)
+        mejores.sort(key=len)
+
+        umbral = minimo * len(palabras)
+        if len(mejores) == 1:
+            puntos = mejores[0]
+        elif umbral > len(palabras) - 1:
+            # Cada palabra aporta como mucho 1: para llegar al mínimo el
+            # registro debe parecerse a todas, así que basta con puntuar
+            # la intersección (calculada en C) y no cada candidato
+            comunes = set(mejores[0]).intersection(*mejores[1:])
+            puntos = {id: sum(mejor[id] for mejor in mejores) for id in comunes}
+        else:
+            puntos = dict(mejores[-1])
+            for mejor in mejores[:-1]:
+                for id, similitud in mejor.items():
+                    puntos[id] = puntos.get(id, 0.0) + similitud
+        mejores = heapq.nlargest(limite, ((p, -id) for id, p in puntos.items() if p >= umbral))
+        return [(-id, p / len(palabras)) for p, id in mejores]
+
+
+# CACHÉ LRU DE CONSULTAS
+class CacheLRU:
+    """
+    Caché de tamaño fijo sobre un OrderedDict: al llenarse descarta la
+    entrada usada hace más tiempo. Cada entrada puede llevar una versión;
+    si al leerla no coincide con la actual se descarta y cuenta como
+    fallo. Lleva la cuenta de aciertos y fallos y es segura entre hilos.
+    """
+
+    def __init__(self, capacidad=1024):
+        """
+        Args:
+            capacidad (int): Máximo de entradas (0 = no guarda nada)
+        """
+        self.capacidad = capacidad
+        self._datos = OrderedDict()  # Clave -> (versión, valor), la más reciente al final
+        self._cerrojo = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+
+    def obtener(self, clave, version=None):
+        """
+        Busca una entrada y la marca como usada recientemente.
+
+        Args:
+            clave: Clave de la entrada
+            version: Versión que debe tener para seguir siendo válida
+
+        Returns:
+            tuple: (True, valor) si está y es válida, (False, None) si no
+        """
+        with self._cerrojo:
+            entrada = self._datos.get(clave)
+            if entrada is None or entrada[0] != version:
+                if entrada is not None:
+                    del self._datos[clave]  # Versión vieja: ya no sirve
+                self.fallos += 1
+                return False, None
+            self._datos.move_to_end(clave)
+            self.aciertos += 1
+            return True, entrada[1]
+
+    def guardar(self, clave, valor, version=None, vigente=None):
+        """
+        Guarda una entrada, descartando la menos usada si no hay lugar.
+
+        Args:
+            vigente (callable/None): Si se indica, la entrada solo se guarda
+                si devuelve True. Se llama con el cerrojo de la caché
+                tomado, así que un quitar_si posterior la verá
+        """
+        if not self.capacidad:
+            return
+        with self._cerrojo:
+            if vigente is not None and not vigente():
+                return  # El valor se calculó antes de un cambio
+            self._datos[clave] = (version, valor)
+            self._datos.move_to_end(clave)
+            if len(self._datos) > self.capacidad:
+                self._datos.popitem(last=False)
+
+    def quitar(self, clave):
+        """
+        Descarta una entrada (si está).
+        """
+        if self._datos:
+            with self._cerrojo:
+                self._datos.pop(clave, None)
+
+    def quitar_si(self, condicion):
+        """
+        Descarta las entradas cuya clave cumple una condición.
+        """
+        if self._datos:
+            with self._cerrojo:
+                for clave in [clave for clave in self._datos if condicion(clave)]:
+                    del self._datos[clave]
+
+    def vaciar(self):
+        """
+        Descarta todas las entradas (las estadísticas se conservan).
+        """
+        with self._cerrojo:
+            self._datos.clear()
+
+    def estadisticas(self):
+        """
+        Returns:
+            dict: Aciertos, fallos, tasa de aciertos, entradas y capacidad
+        """
+        consultas = self.aciertos + self.fallos
+        return {'aciertos': self.aciertos, 'fallos': self.fallos,
+                'tasa_aciertos': self.aciertos / consultas if consultas else 0.0,
+                'entradas': len(self._datos), 'capacidad': self.capacidad}
+
+
+# ÍNDICE DE CORREOS ÚNICOS
+class IndiceCorreos:
+    """
+    Índice hash correo normalizado -> ID para comprobar en O(1) que un
+    correo no esté ya registrado. Los datos guardados antes de exigir
+    correos únicos pueden traer repetidos: se conservan aparte para
+    informarlos y para que, si se elimina uno, el índice siga apuntando
+    a otro registro con ese correo.
+    """
+
+    def __init__(self):
+        """
+        Constructor del índice (vacío).
+        """
+        self._ids = {}  # Correo normalizado -> ID
+        self._repetidos = {}  # Correo normalizado -> IDs adicionales con ese correo
+
+    def agregar(self, id, correo):
+        """
+        Indexa el correo de un registro. Si ya estaba indexado con otro
+        ID se anota como repetido.
+        """
+        clave = normalizar_correo(correo)
+        if self._ids.setdefault(clave, id) != id:
+            self._repetidos.setdefault(clave, []).append(id)
+
+    def quitar(self, id, correo):
+        """
+        Quita del índice el correo de un registro.
+        """
+        clave = normalizar_correo(correo)
+        repetidos = self._repetidos.get(clave)
+        if self._ids.get(clave) == id:
+            if repetidos:
+                self._ids[clave] = repetidos.pop(0)  # Otro registro pasa a ser el dueño
+            else:
+                del self._ids[clave]
+        elif repetidos and id in repetidos:
+            repetidos.remove(id)
+        if repetidos is not None and not repetidos:
+            del self._repetidos[clave]
+
+    def buscar(self, correo):
+        """
+        Devuelve el ID registrado con un correo, o None si no hay ninguno.
+        """
+        return self._ids.get(normalizar_correo(correo))
+
+    def ids(self, correo):
+        """
+        Devuelve todos los IDs con un correo (más de uno solo si hay repetidos).
+        """
+        clave = normalizar_correo(correo)
+        id = self._ids.get(clave)
+        if id is None:
+            return []
+        return [id, *self._repetidos.get(clave, ())]
+
+    def duplicados(self):
+        """
+        Devuelve los correos que tienen más de un registro.
+
+        Returns:
+            dict: Correo normalizado -> lista ordenada de IDs
+        """
+        return {clave: sorted([self._ids[clave], *repetidos])
+                for clave, repetidos in list(self._repetidos.items())}
+
+    def combinar(self, otro):
+        """
+        Agrega al índice todo el contenido de otro índice con IDs distintos
+        y posteriores (p. ej. el de un fragmento del CSV). Los correos que
+        ya estaban quedan como repetidos.
+
+        Args:
+            otro (IndiceCorreos): Índice a incorporar (no debe usarse después)
+        """
+        for clave in self._ids.keys() & otro._ids.keys():
+            self._repetidos.setdefault(clave, []).extend(
+                [otro._ids.pop(clave), *otro._repetidos.pop(clave, ())])
+        self._ids.update(otro._ids)
+        self._repetidos.update(otro._repetidos)
+
+
+# ÍNDICES SECUNDARIOS POR VALOR DE CAMPO
+class IndiceCampos:
+    """
+    Índices invertidos valor -> conjunto de IDs para campos de valor exacto
+    (tipo, carrera, año, departamento, título). Responden a filtros
+    combinados intersectando conjuntos y a conteos por valor sin recorrer
+    los registros: el tamaño de cada conjunto es el conteo del grupo.
+    """
+
+    CAMPOS = ('tipo', 'carrera', 'anio', 'departamento', 'titulo')
+
+    def __init__(self):
+        """
+        Constructor de los índices (vacíos).
+        """
+        self._postings = {campo: defaultdict(set) for campo in self.CAMPOS}
+
+    @staticmethod
+    def _valores(registro):
+        """
+        Genera (campo, valor) para los campos indexados que tiene el registro.
+        """
+        yield 'tipo', 'estudiante' if isinstance(registro, Estudiante) else 'docente'
+        for campo in ('carrera', 'anio', 'departamento', 'titulo'):
+            valor = getattr(registro, campo, None)
+            if valor is not None:
+                yield campo, valor
+
+    def agregar(self, registro):
+        """
+        Indexa los campos de un registro.
+        """
+        for campo, valor in self._valores(registro):
+            self._postings[campo][valor].add(registro.id)
+
+    def quitar(self, registro):
+        """
+        Quita un registro de los índices (con los valores que tenía).
+        """
+        for campo, valor in self._valores(registro):
+            postings = self._postings[campo]
+            ids = postings.get(valor)
+            if ids is not None:
+                ids.discard(registro.id)
+                if not ids:  # Libera valores que ya no tienen registros
+                    del postings[valor]
+
+    def buscar(self, criterios):
+        """
+        Busca los IDs que cumplen todos los criterios. Como IndiceNgramas,
+        puede llamarse mientras otro hilo agrega o quita registros.
+
+        Args:
+            criterios (dict): Campos de CAMPOS y sus valores
+
+        Returns:
+            set: IDs encontrados
+        """
+        listas = []
+        for campo, valor in criterios.items():
+            ids = self._postings[campo].get(valor)
+            if not ids:
+                return set()  # Algún valor no aparece: no hay coincidencias
+            listas.append(ids)
+        # Intersección empezando por el conjunto más pequeño
+        listas.sort(key=len)
+        return listas[0].intersection(*listas[1:])
+
+    def contar(self, campo, candidatos=None):
+        """
+        Cuenta los registros por cada valor de un campo.
+
+        Args:
+            campo (str): Campo de CAMPOS
+            candidatos (set/None): Contar solo estos IDs (None = todos)
+
+        Returns:
+            dict: Valor -> número de registros, ordenado por valor
+        """
+        grupos = list(self._postings[campo].items())
+        if candidatos is None:
+            conteos = {valor: len(ids) for valor, ids in grupos}
+        else:
+            conteos = {valor: len(ids & candidatos) for valor, ids in grupos}
+            conteos = {valor: n for valor, n in conteos.items() if n}
+        return dict(sorted(conteos.items()))
+
+    def combinar(self, otro):
+        """
+        Agrega al índice todo el contenido de otro índice con IDs distintos.
+
+        Args:
+            otro (IndiceCampos): Índice a incorporar (no debe usarse después)
+        """
+        for campo, postings in otro._postings.items():
+            actuales = self._postings[campo]
+            for valor, ids in postings.items():
+                if valor in actuales:
+                    actuales[valor] |= ids
+                else:
+                    actuales[valor] = ids
 
 
 # CLASE BASE ABSTRACTA PARA PERSONAS
@@ -16,8 +713,11 @@ class Persona(ABC):
     """
     Clase abstracta que representa a una persona en el sistema.
     No se puede instanciar directamente - sirve como modelo para las clases hijas.
+    Usa __slots__ para que cada instancia no lleve su propio __dict__.
     """
 
+    __slots__ = ('id', 'nombre', 'correo')
+
     def __init__(self, id, nombre, correo):
         """
         Constructor de la clase Persona.
@@ -47,6 +747,8 @@ class Estudiante(Persona):
     Hereda atributos y métodos de la clase Persona.
     """
 
+    __slots__ = ('carrera', 'anio')
+
     def __init__(self, id, nombre, correo, carrera, anio):
         """
         Constructor de la clase Estudiante.
@@ -82,6 +784,8 @@ class Docente(Persona):
     Hereda atributos y métodos de la clase Persona.
     """
 
+    __slots__ = ('departamento', 'titulo')
+
     def __init__(self, id, nombre, correo, departamento, titulo):
         """
         Constructor de la clase Docente.
@@ -110,32 +814,1722 @@ class Docente(Persona):
                 f"Título: {self.titulo}")
 
 
-# CLASE PRINCIPAL DEL SISTEMA
-class RegistroAcademico:
+# CONVERSIÓN ENTRE REGISTROS Y FILAS CSV
+def fila_de_registro(registro):
     """
-    Clase principal que gestiona todas las operaciones del sistema.
-    Contiene métodos para agregar, buscar, modificar y eliminar registros,
-    así como para guardar y cargar datos desde archivos.
+    Convierte un registro en la fila que se escribe en registros.csv.
+
+    Args:
+        registro (Persona): Estudiante o docente
+
+    Returns:
+        list: [tipo, id, nombre, correo, carrera/departamento, año/título]
+    """
+    if isinstance(registro, Estudiante):
+        return ['estudiante', registro.id, registro.nombre, registro.correo,
+                registro.carrera, registro.anio]
+    if isinstance(registro, Docente):
+        return ['docente', registro.id, registro.nombre, registro.correo,
+                registro.departamento, registro.titulo]
+    raise TypeError(f"Tipo de registro no soportado: {type(registro).__name__}")
+
+
+def diccionario_de_registro(registro):
+    """
+    Convierte un registro en un diccionario apto para JSON.
+
+    Args:
+        registro (Persona): Estudiante o docente
+
+    Returns:
+        dict: tipo, id, nombre, correo y los campos propios del tipo
+    """
+    tipo, id, nombre, correo, grupo, extra = fila_de_registro(registro)
+    if tipo == 'estudiante':
+        propios = {'carrera': grupo, 'anio': extra}
+    else:
+        propios = {'departamento': grupo, 'titulo': extra}
+    return {'tipo': tipo, 'id': id, 'nombre': nombre, 'correo': correo, **propios}
+
+
+def clave_orden(orden):
+    """
+    Devuelve la función de ordenación de registros por un campo.
+
+    Args:
+        orden (str): 'id', 'nombre' (sin distinguir mayúsculas ni tildes),
+            'anio' o 'carrera'. Los docentes no tienen año ni carrera y
+            quedan después de los estudiantes
+
+    Returns:
+        callable: Clave para sorted/heapq; los empates se ordenan por ID
+    """
+    if orden == 'id':
+        return lambda registro: registro.id
+    if orden == 'nombre':
+        return lambda registro: (normalizar_texto(registro.nombre), registro.id)
+
+    def clave(registro):
+        valor = getattr(registro, orden, None)
+        return (valor is None, '' if valor is None else valor, registro.id)
+    return clave
+
+
+def registro_de_fila(row):
+    """
+    Convierte una fila de registros.csv en un registro.
+
+    Args:
+        row (list): Fila leída del CSV
+
+    Returns:
+        Persona/None: El registro, o None si el tipo de fila no es de persona
+
+    Raises:
+        IndexError, ValueError: Si la fila está incompleta o corrupta
+    """
+    if row[0] == 'estudiante':
+        return Estudiante(
+            int(row[1]),  # ID
+            row[2],  # Nombre
+            row[3],  # Correo
+            row[4],  # Carrera
+            int(row[5]))  # Año
+    if row[0] == 'docente':
+        return Docente(
+            int(row[1]),  # ID
+            row[2],  # Nombre
+            row[3],  # Correo
+            row[4],  # Departamento
+            row[5])  # Título
+    return None
+
+
+def con_velocidad(resumen, segundos):
+    """
+    Agrega a un resumen de exportación o restauración la duración y la
+    velocidad en MB/s sobre los datos sin comprimir.
+    """
+    resumen['segundos'] = segundos
+    resumen['mb_por_segundo'] = resumen['bytes_datos'] / 1e6 / segundos if segundos else 0.0
+    return resumen
+
+
+# ALMACENAMIENTO COLUMNAR DE REGISTROS
+class AlmacenColumnar(MutableMapping):
+    """
+    Diccionario ID -> registro que guarda cada campo en una columna aparte
+    en lugar de un objeto por registro. Los enteros van en arreglos compactos
+    y las cadenas repetidas (carrera, departamento, título) se internan, de
+    modo que se comparten entre todos los registros. Los objetos Estudiante
+    y Docente solo se crean cuando se accede a ellos.
+
+    Como los objetos devueltos son copias, los cambios deben volver a
+    asignarse con almacen[id] = registro para que queden guardados.
+    """
+
+    _ESTUDIANTE = 0
+    _DOCENTE = 1
+    _BORRADO = 2  # Fila eliminada pendiente de compactar
+
+    def __init__(self):
+        """
+        Crea un almacén vacío.
+        """
+        self._ids = array('q')  # ID de cada fila
+        self._tipos = bytearray()  # Tipo de cada fila
+        self._nombres = []
+        self._correos = []
+        self._grupos = []  # Carrera (estudiante) o departamento (docente), internados
+        self._titulos = []  # Título internado (docente) o None (estudiante)
+        self._anios = array('q')  # Año de ingreso (0 para docentes)
+        self._posiciones = {}  # ID -> número de fila
+        self._borrados = 0  # Filas marcadas como borradas
+
+    def _escribir_fila(self, pos, registro):
+        """
+        Escribe los campos de un registro en la fila indicada.
+        """
+        self._nombres[pos] = registro.nombre
+        self._correos[pos] = registro.correo
+        if isinstance(registro, Estudiante):
+            self._tipos[pos] = self._ESTUDIANTE
+            self._grupos[pos] = sys.intern(registro.carrera)
+            self._titulos[pos] = None
+            self._anios[pos] = registro.anio
+        elif isinstance(registro, Docente):
+            self._tipos[pos] = self._DOCENTE
+            self._grupos[pos] = sys.intern(registro.departamento)
+            self._titulos[pos] = sys.intern(registro.titulo)
+            self._anios[pos] = 0
+
+    def __getitem__(self, id):
+        pos = self._posiciones[id]
+        if self._tipos[pos] == self._ESTUDIANTE:
+            return Estudiante(id, self._nombres[pos], self._correos[pos],
+                              self._grupos[pos], self._anios[pos])
+        return Docente(id, self._nombres[pos], self._correos[pos],
+                       self._grupos[pos], self._titulos[pos])
+
+    def __setitem__(self, id, registro):
+        if not isinstance(registro, (Estudiante, Docente)):
+            raise TypeError(f"Tipo de registro no soportado: {type(registro).__name__}")
+        pos = self._posiciones.get(id)
+        if pos is None:
+            # Fila nueva al final: conserva el orden de inserción
+            pos = len(self._ids)
+            self._ids.append(id)
+            self._tipos.append(self._BORRADO)
+            self._nombres.append(None)
+            self._correos.append(None)
+            self._grupos.append(None)
+            self._titulos.append(None)
+            self._anios.append(0)
+            self._posiciones[id] = pos
+        self._escribir_fila(pos, registro)
+
+    def __delitem__(self, id):
+        pos = self._posiciones.pop(id)
+        # Marca la fila como borrada y suelta sus cadenas
+        self._tipos[pos] = self._BORRADO
+        self._nombres[pos] = self._correos[pos] = None
+        self._grupos[pos] = self._titulos[pos] = None
+        self._borrados += 1
+        if self._borrados > 1024 and self._borrados * 2 > len(self._ids):
+            self._compactar()
+
+    def __iter__(self):
+        borrado = self._BORRADO
+        ids = self._ids
+        for pos, tipo in enumerate(self._tipos):
+            if tipo != borrado:
+                yield ids[pos]
+
+    def __len__(self):
+        return len(self._posiciones)
+
+    def __contains__(self, id):
+        return id in self._posiciones
+
+    def _compactar(self):
+        """
+        Elimina físicamente las filas borradas y recalcula las posiciones.
+        """
+        vivas = [pos for pos, tipo in enumerate(self._tipos) if tipo != self._BORRADO]
+        self._ids = array('q', (self._ids[pos] for pos in vivas))
+        self._tipos = bytearray(self._tipos[pos] for pos in vivas)
+        self._nombres = [self._nombres[pos] for pos in vivas]
+        self._correos = [self._correos[pos] for pos in vivas]
+        self._grupos = [self._grupos[pos] for pos in vivas]
+        self._titulos = [self._titulos[pos] for pos in vivas]
+        self._anios = array('q', (self._anios[pos] for pos in vivas))
+        self._posiciones = {id: pos for pos, id in enumerate(self._ids)}
+        self._borrados = 0
+
+
+# ALMACENAMIENTO PEREZOSO SOBRE EL ARCHIVO CSV
+class AlmacenPerezoso(MutableMapping):
     """
+    Diccionario ID -> registro que no carga el CSV en memoria. Al abrirlo
+    solo recorre el archivo una vez para anotar en qué byte empieza cada
+    fila; los registros se leen del disco cuando se accede a ellos.
+
+    Los registros nuevos o modificados se guardan en memoria en la misma
+    entrada que ocupaba su posición en el archivo, así que el orden de
+    inserción se conserva. Como los objetos leídos del disco son copias,
+    los cambios deben volver a asignarse con almacen[id] = registro.
+    """
+
+    def __init__(self, ruta=None):
+        """
+        Abre el archivo e indexa las posiciones de sus filas.
+
+        Args:
+            ruta (str/None): Archivo CSV de registros (None para empezar vacío)
+        """
+        self._entradas = {}  # ID -> posición en bytes (int) o registro en memoria
+        self.ultimo_id = 0  # Mayor ID visto en el archivo
+        self._archivo = None
+        self.ruta = ruta
+        if ruta is not None and os.path.exists(ruta):
+            self._archivo = open(ruta, 'rb')
+            self._indexar_posiciones()
+
+    @staticmethod
+    def _lineas(file):
+        """
+        Genera (posición, bytes) de cada fila del CSV, uniendo las líneas de
+        un campo entre comillas que contenga saltos de línea.
+        """
+        posicion = file.tell()
+        pendiente = b''
+        inicio = posicion
+        for linea in file:
+            if not pendiente:
+                inicio = posicion
+            posicion += len(linea)
+            pendiente += linea
+            if pendiente.count(b'"') % 2 == 0:  # Comillas balanceadas: fila completa
+                yield inicio, pendiente
+                pendiente = b''
+        if pendiente:
+            yield inicio, pendiente
+
+    def _indexar_posiciones(self):
+        """
+        Recorre el archivo una vez leyendo solo el tipo y el ID de cada fila.
+        """
+        self._archivo.seek(0)
+        for posicion, linea in self._lineas(self._archivo):
+            # El tipo y el ID nunca llevan ';' ni comillas: basta con dividir
+            partes = linea.split(b';', 2)
+            try:
+                id = int(partes[1])
+                if partes[0] in (b'estudiante', b'docente'):
+                    self._validar(linea)
+                    self._entradas[id] = posicion
+            except (IndexError, ValueError):
+                continue  # Salta filas corruptas, igual que leer_filas_csv
+            if id > self.ultimo_id:
+                self.ultimo_id = id
+
+    @classmethod
+    def _validar(cls, linea):
+        """
+        Comprueba que una fila de estudiante o docente se pueda decodificar
+        (UTF-8 válido, campos suficientes y año numérico) para no indexar
+        filas que luego fallarían al leerlas. Las filas sin comillas se
+        revisan dividiendo el texto; las demás pasan por el lector CSV.
+
+        Raises:
+            IndexError, ValueError: Si la fila está incompleta o corrupta
+                (UnicodeDecodeError es un ValueError)
+        """
+        if b'"' in linea:
+            cls._decodificar(linea)
+            return
+        campos = linea.decode('utf-8').rstrip('\r\n').split(';')
+        if campos[0] == 'estudiante':
+            int(campos[5])
+        elif len(campos) < 6:
+            raise IndexError("Faltan campos")
+
+    @staticmethod
+    def _decodificar(linea):
+        """
+        Convierte los bytes de una fila en un registro.
+        """
+        texto = linea.decode('utf-8')
+        row = next(csv.reader(io.StringIO(texto, newline=''), delimiter=';'))
+        return registro_de_fila(row)
+
+    def _leer(self, posicion):
+        """
+        Lee del disco el registro que empieza en la posición indicada.
+        """
+        self._archivo.seek(posicion)
+        _, linea = next(self._lineas(self._archivo))
+        return self._decodificar(linea)
+
+    def __getitem__(self, id):
+        entrada = self._entradas[id]
+        if isinstance(entrada, int):
+            return self._leer(entrada)
+        return entrada
+
+    def __setitem__(self, id, registro):
+        self._entradas[id] = registro
+
+    def __delitem__(self, id):
+        del self._entradas[id]
+
+    def __iter__(self):
+        return iter(self._entradas)
+
+    def __len__(self):
+        return len(self._entradas)
+
+    def __contains__(self, id):
+        return id in self._entradas
+
+    def values(self):
+        """
+        Vista de los registros que, al recorrerla, lee el archivo en orden
+        de principio a fin en lugar de saltar de fila en fila.
+        """
+        return _ValoresPerezosos(self)
+
+    def iterar_registros(self):
+        """
+        Genera los registros en orden leyendo el archivo secuencialmente
+        con un descriptor propio (no interfiere con las lecturas por ID).
+        """
+        if self._archivo is None:
+            yield from (e for e in self._entradas.values() if not isinstance(e, int))
+            return
+        with open(self.ruta, 'rb') as file:
+            filas = self._lineas(file)
+            actual = None  # Última fila leída: (posición, bytes)
+            for entrada in list(self._entradas.values()):
+                if not isinstance(entrada, int):
+                    yield entrada  # Registro nuevo o modificado en memoria
+                    continue
+                # Avanza por el archivo hasta la fila pedida (normalmente la siguiente)
+                while actual is None or actual[0] < entrada:
+                    actual = next(filas, None)
+                    if actual is None:
+                        break
+                if actual is not None and actual[0] == entrada:
+                    yield self._decodificar(actual[1])
+                else:
+                    file.seek(entrada)  # Fila fuera de orden: lectura directa
+                    filas = self._lineas(file)
+                    actual = next(filas)
+                    yield self._decodificar(actual[1])
+
+    def cerrar(self):
+        """
+        Cierra el archivo subyacente.
+        """
+        if self._archivo is not None:
+            self._archivo.close()
+            self._archivo = None
+
+
+class _ValoresPerezosos(ValuesView):
+    """
+    Vista de valores de AlmacenPerezoso que recorre el archivo en streaming.
+    """
+
+    def __iter__(self):
+        return self._mapping.iterar_registros()
+
+
+# LECTURA DEL CSV (SECUENCIAL Y POR FRAGMENTOS EN PARALELO)
+# Una fila siempre empieza con el tipo y el ID, que nunca van entre comillas
+INICIO_FILA = re.compile(rb'(?:estudiante|docente|ultimo_id);\d+(?:;|\r?\n|$)')
+TAMANO_MINIMO_PARALELO = 16 * 2**20  # Por debajo de 16 MiB no compensa lanzar procesos
+
+
+@contextmanager
+def sin_recolector():
+    """
+    Desactiva el recolector de ciclos mientras se crean millones de objetos
+    que no forman ciclos (una carga completa). Si no, el recolector revisa
+    una y otra vez todos los objetos ya creados y la carga tarda más.
+    """
+    activo = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if activo:
+            gc.enable()
+
+
+def leer_filas_csv(file):
+    """
+    Genera (ID, registro) por cada fila válida de un registros.csv abierto.
+    La fila 'ultimo_id' se genera con registro None: no es un registro
+    pero aporta su ID. Las filas vacías o corruptas se saltan.
+    """
+    for row in csv.reader(file, delimiter=';'):
+        if not row:  # Salta filas vacías
+            continue
+        try:
+            registro = registro_de_fila(row)
+            id = registro.id if registro else int(row[1])
+        except (IndexError, ValueError):
+            continue  # Salta filas corruptas
+        yield id, registro
+
+
+def dividir_csv(ruta, partes):
+    """
+    Divide un CSV en rangos de bytes de tamaño parecido que empiezan y
+    terminan en un límite de fila.
+
+    Un corte se mueve hasta la siguiente línea que empiece como una fila
+    (tipo;ID), así que nunca cae dentro de un campo entre comillas que
+    tenga saltos de línea.
+
+    Args:
+        ruta (str): Archivo CSV
+        partes (int): Número de fragmentos deseado
+
+    Returns:
+        list: Pares (inicio, fin) en bytes, en orden y sin huecos
+    """
+    tamano = os.path.getsize(ruta)
+    cortes = [0]
+    with open(ruta, 'rb') as file:
+        for k in range(1, partes):
+            posicion = max(tamano * k // partes, cortes[-1])
+            file.seek(posicion)
+            file.readline()  # Termina la línea en curso
+            posicion = file.tell()
+            linea = file.readline()
+            while linea and not INICIO_FILA.match(linea):
+                posicion += len(linea)
+                linea = file.readline()
+            cortes.append(min(posicion, tamano))
+    cortes.append(tamano)
+    return [(inicio, fin) for inicio, fin in zip(cortes, cortes[1:]) if inicio < fin]
+
+
+def leer_fragmento_csv(ruta, inicio, fin, indice_nombres=True, indices_campos=True):
+    """
+    Lee un fragmento de registros.csv y arma sus índices. Se ejecuta en los
+    procesos del grupo: los registros vuelven como columnas (mucho más
+    baratas de transferir entre procesos que los objetos) y los índices ya
+    construidos, para que el proceso principal solo tenga que combinarlos.
+
+    Args:
+        ruta (str): Archivo CSV
+        inicio, fin (int): Rango de bytes del fragmento (ver dividir_csv)
+        indice_nombres (bool): Construir el índice de trigramas
+        indices_campos (bool): Construir los índices por campo
+
+    Returns:
+        tuple: (columnas de las filas, último ID visto,
+        (IndiceNgramas/None, IndiceCampos/None, IndiceCorreos))
+    """
+    with open(ruta, 'rb') as file:
+        file.seek(inicio)
+        texto = file.read(fin - inicio).decode('utf-8')
+
+    with sin_recolector():
+        registros = []
+        ultimo_id = 0
+        for id, registro in leer_filas_csv(io.StringIO(texto, newline='')):
+            if id > ultimo_id:
+                ultimo_id = id
+            if registro is not None:
+                registros.append(registro)
+
+        nombres = IndiceNgramas() if indice_nombres else None
+        campos = IndiceCampos() if indices_campos else None
+        correos = IndiceCorreos()
+        for registro in registros:
+            if nombres is not None:
+                nombres.agregar(registro.id, registro.nombre)
+            if campos is not None:
+                campos.agregar(registro)
+            correos.agregar(registro.id, registro.correo)
+        columnas = list(zip(*map(fila_de_registro, registros)))
+    return columnas, ultimo_id, (nombres, campos, correos)
+
+
+# BACKENDS DE ALMACENAMIENTO
+class BackendAlmacenamiento(ABC):
+    """
+    Interfaz de persistencia de RegistroAcademico.
+
+    Un backend decide dónde viven los registros: puede entregarlos para
+    cargarlos en memoria (leer_registros) o dar un almacén propio que los
+    lea bajo demanda (abrir_almacen). Las consultas buscar_nombre, filtrar,
+    contar_por, buscar_correo y correos_duplicados son opcionales: si
+    devuelven None, RegistroAcademico las resuelve en Python con sus
+    propios índices.
+    """
+
+    MODOS_DURABILIDAD = ('siempre', 'lotes', 'ninguno')
+
+    ultimo_id = 0  # Mayor ID conocido por el backend tras cargar
+    # Bytes leídos y escritos en total (para las métricas). Los backends de
+    # archivo cuentan las lecturas completas, las instantáneas y el journal;
+    # las lecturas bajo demanda de los almacenes no se cuentan
+    bytes_leidos = 0
+    bytes_escritos = 0
+    # Función (leídos, escritos) de las métricas activas, que anota los
+    # bytes en la operación en curso del hilo que los leyó o escribió
+    al_contar_bytes = None
+
+    def _contar_bytes(self, leidos=0, escritos=0):
+        """
+        Suma bytes a los totales del backend y los informa a las métricas.
+        """
+        self.bytes_leidos += leidos
+        self.bytes_escritos += escritos
+        if self.al_contar_bytes is not None:
+            self.al_contar_bytes(leidos, escritos)
+
+    def abrir_almacen(self):
+        """
+        Abre un almacén ID -> registro que lee del backend bajo demanda.
+
+        Returns:
+            MutableMapping/None: El almacén, o None si los registros deben
+            cargarse en memoria con leer_registros
+        """
+        return None
+
+    def leer_registros(self):
+        """
+        Genera los registros guardados para cargarlos en memoria.
+        """
+        return iter(())
+
+    def leer_fragmentos(self, indice_nombres, indices_campos):
+        """
+        Lee los registros por fragmentos en paralelo, con los índices de
+        cada fragmento ya construidos (ver leer_fragmento_csv).
+
+        Returns:
+            iterable/None: Pares (registros, (IndiceNgramas/None,
+            IndiceCampos/None, IndiceCorreos)) en orden, o None si hay
+            que usar leer_registros
+        """
+        return None
+
+    def cambios_pendientes(self):
+        """
+        Genera los cambios guardados después de la última instantánea como
+        tuplas ('alta', registro) o ('baja', id).
+        """
+        return iter(())
+
+    def anotar(self, operacion, registro):
+        """
+        Recibe cada alta, cambio o baja en el momento en que ocurre.
+
+        Args:
+            operacion (str): 'alta', 'cambio' o 'baja'
+            registro (Persona): Registro afectado
+        """
+
+    def anotar_lote(self, operacion, registros):
+        """
+        Recibe la misma operación para muchos registros a la vez
+        (importaciones masivas). Por defecto los anota uno por uno.
+        """
+        for registro in registros:
+            self.anotar(operacion, registro)
+
+    def debe_escribir_instantanea(self):
+        """
+        Indica si guardar_datos debe escribir una instantánea completa.
+        """
+        return True
+
+    @abstractmethod
+    def escribir_instantanea(self, registros, ultimo_id):
+        """
+        Guarda el estado completo del registro.
+
+        Args:
+            registros (iterable): Todos los registros en orden
+            ultimo_id (int): Último ID asignado
+
+        Returns:
+            MutableMapping/None: Almacén reabierto que reemplaza al anterior,
+            o None si el almacén actual sigue siendo válido
+        """
+
+    def buscar_nombre(self, consulta):
+        """
+        Búsqueda por nombre resuelta por el backend.
+
+        Returns:
+            list/None: Registros encontrados, o None si no la soporta
+        """
+        return None
+
+    def filtrar(self, criterios):
+        """
+        Búsqueda por campos resuelta por el backend.
+
+        Returns:
+            list/None: Registros encontrados, o None si no la soporta
+        """
+        return None
+
+    def contar_por(self, campo, criterios):
+        """
+        Conteo por valor de un campo resuelto por el backend.
+
+        Returns:
+            dict/None: Valor -> número de registros, o None si no lo soporta
+        """
+        return None
+
+    def buscar_correo(self, correo):
+        """
+        Búsqueda por correo normalizado resuelta por el backend.
+
+        Returns:
+            list/None: IDs con ese correo, o None si no la soporta
+        """
+        return None
+
+    def correos_duplicados(self):
+        """
+        Correos repetidos en los datos del backend.
+
+        Returns:
+            dict/None: Correo normalizado -> IDs, o None si no lo soporta
+        """
+        return None
+
+    def cerrar(self):
+        """
+        Libera los archivos o conexiones del backend.
+        """
+
+
+class BackendArchivo(BackendAlmacenamiento):
+    """
+    Base de los backends que guardan una instantánea en un archivo.
+    Se encarga del journal de cambios, de la escritura atómica de la
+    instantánea y de la política de fsync.
+    """
+
+    modo_escritura = 'w'  # Modo de apertura del archivo temporal
+
+    def __init__(self, archivo_registros, archivo_id='ultimo_id.txt', usar_journal=False,
+                 umbral_compactacion=1000, modo_durabilidad='siempre', lote_fsync=10):
+        """
+        Args:
+            archivo_registros (str): Archivo con la instantánea de registros
+            archivo_id (str): Archivo con el último ID usado por versiones
+                anteriores (solo se lee; ahora el ID va en la instantánea)
+            usar_journal (bool): Si es True, cada alta, cambio o baja se anota
+                al momento en un journal de solo anexado, de modo que guardar
+                no reescribe todo y un cierre inesperado no pierde cambios
+            umbral_compactacion (int): Entradas del journal a partir de las
+                cuales guardar_datos lo integra en una instantánea nueva
+            modo_durabilidad (str): Cuándo forzar los datos al disco con fsync:
+                'siempre' en cada guardado o anotación del journal, 'lotes'
+                una vez cada lote_fsync escrituras, 'ninguno' lo deja al
+                sistema operativo (más rápido, menos seguro ante cortes de luz)
+            lote_fsync (int): Escrituras entre fsync en el modo 'lotes'
+        """
+        if modo_durabilidad not in self.MODOS_DURABILIDAD:
+            raise ValueError(f"Modo de durabilidad no válido: {modo_durabilidad}")
+        self.archivo_registros = archivo_registros
+        self.archivo_id = archivo_id
+        # Junto al nombre completo: registros.csv y registros.bin no comparten journal
+        self.archivo_journal = archivo_registros + '.journal'
+        self.usar_journal = usar_journal
+        self.umbral_compactacion = umbral_compactacion
+        self.modo_durabilidad = modo_durabilidad
+        self.lote_fsync = lote_fsync
+        self.ultimo_id = 0
+        self.entradas_journal = 0  # Operaciones anotadas desde la última instantánea
+        self._journal = None  # Archivo del journal abierto en modo anexado
+        self._escrituras_sin_fsync = 0  # Escrituras pendientes de fsync (modo 'lotes')
+        self._almacen = None  # Almacén abierto sobre el archivo (si lo hay)
+
+    @abstractmethod
+    def _escribir(self, file, registros, ultimo_id):
+        """
+        Escribe la instantánea en el archivo temporal ya abierto.
+        """
+
+    def _leer_id_anterior(self):
+        """
+        Carga el último ID de versiones anteriores, que lo guardaban en un
+        archivo aparte (hoy va dentro de la instantánea).
+        """
+        if os.path.exists(self.archivo_id):
+            with open(self.archivo_id, 'r', encoding='utf-8') as file:
+                try:
+                    self.ultimo_id = max(self.ultimo_id, int(file.read()))
+                except ValueError:
+                    pass  # Si el archivo está corrupto, mantiene el valor actual
+
+    def _adoptar_journal_anterior(self):
+        """
+        Renombra el journal de versiones anteriores, que se llamaba como
+        la instantánea sin extensión (registros.journal), para no perder
+        los cambios anotados en él.
+        """
+        anterior = os.path.splitext(self.archivo_registros)[0] + '.journal'
+        if (anterior != self.archivo_journal and os.path.exists(anterior)
+                and not os.path.exists(self.archivo_journal)):
+            os.replace(anterior, self.archivo_journal)
+
+    def _toca_fsync(self):
+        """
+        Indica si la escritura actual debe forzarse al disco según el modo
+        de durabilidad.
+
+        Returns:
+            bool: True si hay que llamar a fsync
+        """
+        if self.modo_durabilidad == 'siempre':
+            return True
+        if self.modo_durabilidad == 'ninguno':
+            return False
+        # Modo 'lotes': un fsync cada lote_fsync escrituras
+        self._escrituras_sin_fsync += 1
+        if self._escrituras_sin_fsync >= self.lote_fsync:
+            self._escrituras_sin_fsync = 0
+            return True
+        return False
+
+    def anotar(self, operacion, registro):
+        """
+        Anota una operación en el journal (si está activo) y la escribe
+        al disco de inmediato.
+        """
+        self.anotar_lote(operacion, (registro,))
+
+    def anotar_lote(self, operacion, registros):
+        """
+        Anota varias operaciones con una sola escritura y un solo fsync.
+        """
+        if not self.usar_journal:
+            return
+        if self._journal is None:
+            self._journal = open(self.archivo_journal, 'a', newline='', encoding='utf-8')
+        inicio = self._journal.tell()
+        writer = csv.writer(self._journal, delimiter=';')
+        for registro in registros:
+            if operacion == 'baja':
+                writer.writerow([operacion, registro.id])
+            else:
+                writer.writerow([operacion] + fila_de_registro(registro))
+            self.entradas_journal += 1
+        self._journal.flush()
+        self._contar_bytes(escritos=self._journal.tell() - inicio)
+        if self._toca_fsync():
+            os.fsync(self._journal.fileno())
+
+    def cambios_pendientes(self):
+        """
+        Lee las operaciones del journal. Son idempotentes, así que reproducir
+        dos veces la misma entrada (por ejemplo tras un corte durante la
+        compactación) deja el mismo resultado.
+        """
+        if not self.usar_journal:
+            return
+        self._adoptar_journal_anterior()
+        if not os.path.exists(self.archivo_journal):
+            return
+        with open(self.archivo_journal, 'r', newline='', encoding='utf-8') as file:
+            self._contar_bytes(leidos=os.fstat(file.fileno()).st_size)
+            for row in csv.reader(file, delimiter=';'):
+                if not row:
+                    continue
+                try:
+                    if row[0] == 'baja':
+                        cambio = ('baja', int(row[1]))
+                    elif row[0] in ('alta', 'cambio'):
+                        registro = registro_de_fila(row[1:])
+                        if registro is None:
+                            continue
+                        cambio = ('alta', registro)
+                    else:
+                        continue
+                except (IndexError, ValueError):
+                    continue  # Salta entradas incompletas (p. ej. una escritura cortada)
+                self.entradas_journal += 1
+                yield cambio
+
+    def debe_escribir_instantanea(self):
+        """
+        Con el journal activo los cambios ya están en disco, así que solo se
+        reescribe la instantánea cuando el journal supera el umbral.
+        """
+        return not self.usar_journal or self.entradas_journal >= self.umbral_compactacion
+
+    def escribir_instantanea(self, registros, ultimo_id):
+        """
+        Escribe una instantánea completa y vacía el journal.
+
+        La instantánea se escribe primero en un archivo temporal que luego
+        reemplaza al original con os.replace (operación atómica): ante un
+        corte queda la versión anterior completa o la nueva completa, nunca
+        un archivo a medias. El último ID va dentro del mismo archivo, así
+        que siempre es coherente con los registros.
+        """
+        temporal = self.archivo_registros + '.tmp'
+        try:
+            if self.modo_escritura == 'w':
+                file = open(temporal, 'w', newline='', encoding='utf-8')
+            else:
+                file = open(temporal, self.modo_escritura)
+            with file:
+                self._escribir(file, registros, ultimo_id)
+                file.flush()
+                self._contar_bytes(escritos=file.tell())
+                sincronizar = self._toca_fsync()
+                if sincronizar:
+                    os.fsync(file.fileno())
+
+            # Reemplaza la instantánea anterior de forma atómica. Si los
+            # registros se leen del archivo hay que soltar el viejo (Windows
+            # no permite reemplazar un archivo abierto) y abrir el nuevo.
+            if self._almacen is not None:
+                self._almacen.cerrar()
+            try:
+                os.replace(temporal, self.archivo_registros)
+            finally:
+                if self._almacen is not None:
+                    self.abrir_almacen()
+            if sincronizar:
+                self._fsync_directorio()
+        except Exception:
+            if os.path.exists(temporal):
+                os.remove(temporal)  # No deja temporales a medias
+            raise
+
+        # La instantánea ya incluye todo lo anotado: se vacía el journal
+        if self.usar_journal:
+            self._cerrar_journal()
+            open(self.archivo_journal, 'w', encoding='utf-8').close()
+            self.entradas_journal = 0
+        return self._almacen
+
+    def _fsync_directorio(self):
+        """
+        Fuerza al disco la entrada de directorio del archivo renombrado.
+        En Windows no se puede abrir un directorio, así que se omite.
+        """
+        if os.name == 'nt':
+            return
+        directorio = os.path.dirname(os.path.abspath(self.archivo_registros))
+        fd = os.open(directorio, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def _cerrar_journal(self):
+        """
+        Cierra el journal si está abierto, forzando al disco lo pendiente.
+        """
+        if self._journal is not None:
+            if self.modo_durabilidad != 'ninguno':
+                self._journal.flush()
+                os.fsync(self._journal.fileno())
+            self._journal.close()
+            self._journal = None
+
+    def cerrar(self):
+        """
+        Cierra el journal y el almacén abierto sobre el archivo.
+        """
+        if self._almacen is not None:
+            self._almacen.cerrar()
+        self._cerrar_journal()
+
+
+class BackendCSV(BackendArchivo):
+    """
+    Backend por defecto: registros.csv separado por ';'.
+    """
+
+    def __init__(self, archivo_registros='registros.csv', perezoso=False, procesos=1,
+                 **opciones):
+        """
+        Args:
+            archivo_registros (str): Archivo CSV de registros
+            perezoso (bool): Si es True, solo indexa la posición de cada fila
+                y lee los registros del disco al accederlos
+            procesos (int/None): Procesos para leer el CSV por fragmentos
+                (None = núcleos disponibles; 1 = leerlo en este proceso).
+                Los archivos de menos de TAMANO_MINIMO_PARALELO se leen
+                siempre en este proceso
+            **opciones: Resto de opciones de BackendArchivo
+        """
+        super().__init__(archivo_registros, **opciones)
+        self.perezoso = perezoso
+        self.procesos = procesos
+
+    def abrir_almacen(self):
+        """
+        En modo perezoso abre un AlmacenPerezoso sobre el CSV.
+        """
+        if not self.perezoso:
+            return None
+        self._almacen = AlmacenPerezoso(self.archivo_registros)
+        if os.path.exists(self.archivo_registros):
+            # Para indexar las posiciones se lee el archivo completo
+            self._contar_bytes(leidos=os.path.getsize(self.archivo_registros))
+        self.ultimo_id = max(self.ultimo_id, self._almacen.ultimo_id)
+        self._leer_id_anterior()
+        return self._almacen
+
+    def leer_registros(self):
+        """
+        Lee el CSV completo y genera sus registros.
+        """
+        if os.path.exists(self.archivo_registros):
+            # Abre el archivo CSV en modo lectura
+            with open(self.archivo_registros, 'r', newline='', encoding='utf-8') as file:
+                self._contar_bytes(leidos=os.fstat(file.fileno()).st_size)
+                for id, registro in leer_filas_csv(file):
+                    # Actualiza el último ID usado
+                    if id > self.ultimo_id:
+                        self.ultimo_id = id
+                    if registro is not None:
+                        yield registro
+        self._leer_id_anterior()
+
+    def leer_fragmentos(self, indice_nombres, indices_campos):
+        """
+        Con procesos != 1 y un CSV grande, lo lee por fragmentos en un
+        grupo de procesos.
+        """
+        procesos = self.procesos or os.cpu_count() or 1
+        if (procesos == 1 or self.perezoso or not os.path.exists(self.archivo_registros)
+                or os.path.getsize(self.archivo_registros) < TAMANO_MINIMO_PARALELO):
+            return None
+        return self._leer_fragmentos(procesos, indice_nombres, indices_campos)
+
+    def _leer_fragmentos(self, procesos, indice_nombres, indices_campos):
+        """
+        Genera los fragmentos en el orden del archivo. Hay el doble de
+        fragmentos que de procesos, así el proceso principal ya combina los
+        primeros mientras los demás se siguen leyendo.
+        """
+        rangos = dividir_csv(self.archivo_registros, procesos * 2)
+        self._contar_bytes(leidos=os.path.getsize(self.archivo_registros))
+        with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+            resultados = ejecutor.map(
+                leer_fragmento_csv, repeat(self.archivo_registros),
+                [inicio for inicio, _ in rangos], [fin for _, fin in rangos],
+                repeat(indice_nombres), repeat(indices_campos))
+            for columnas, ultimo_id, indices in resultados:
+                # El último ID es el mayor de todos los fragmentos
+                self.ultimo_id = max(self.ultimo_id, ultimo_id)
+                yield [registro_de_fila(fila) for fila in zip(*columnas)], indices
+        self._leer_id_anterior()
+
+    def _escribir(self, file, registros, ultimo_id):
+        """
+        Escribe la fila ultimo_id seguida de un registro por fila.
+        """
+        writer = csv.writer(file, delimiter=';')  # Crea un escritor CSV
+        writer.writerow(['ultimo_id', ultimo_id])
+
+        # Escribe cada registro en el archivo
+        for registro in registros:
+            writer.writerow(fila_de_registro(registro))
+
+
+class BackendBinario(BackendArchivo):
+    """
+    Backend sobre el formato binario de formato_binario.py, abierto con mmap.
+    """
+
+    modo_escritura = 'wb'
+
+    def __init__(self, archivo_registros='registros.bin', **opciones):
+        super().__init__(archivo_registros, **opciones)
+
+    def abrir_almacen(self):
+        """
+        Abre el archivo con mmap; los registros se decodifican al accederlos.
+        """
+        self._almacen = AlmacenBinario(self.archivo_registros, registro_de_fila)
+        self.ultimo_id = max(self.ultimo_id, self._almacen.ultimo_id)
+        self._leer_id_anterior()
+        return self._almacen
+
+    def _escribir(self, file, registros, ultimo_id):
+        escribir_binario(file, (fila_de_registro(r) for r in registros), ultimo_id)
+
+
+class BackendSQLite(BackendAlmacenamiento):
+    """
+    Backend sobre una base de datos SQLite local (ver almacen_sqlite.py).
+    Los registros no se cargan en memoria y las búsquedas por nombre y por
+    campos se resuelven con SQL sobre índices.
+    """
+
+    def __init__(self, ruta='registros.db', modo_durabilidad='siempre'):
+        """
+        Args:
+            ruta (str): Archivo de la base de datos
+            modo_durabilidad (str): 'siempre' (synchronous=FULL), 'lotes'
+                (NORMAL) o 'ninguno' (OFF)
+        """
+        if modo_durabilidad not in self.MODOS_DURABILIDAD:
+            raise ValueError(f"Modo de durabilidad no válido: {modo_durabilidad}")
+        self.ruta = ruta
+        self.modo_durabilidad = modo_durabilidad
+        self._almacen = None
+
+    def abrir_almacen(self):
+        self._almacen = AlmacenSQLite(self.ruta, registro_de_fila, fila_de_registro,
+                                      normalizar_texto, self.modo_durabilidad)
+        self.ultimo_id = self._almacen.ultimo_id
+        return self._almacen
+
+    def escribir_instantanea(self, registros, ultimo_id):
+        """
+        Los registros ya están en la base: basta con confirmar la transacción.
+        """
+        self._almacen.confirmar(ultimo_id)
+        return None
+
+    def buscar_nombre(self, consulta):
+        return self._almacen.buscar_nombre(consulta)
+
+    def filtrar(self, criterios):
+        return self._almacen.filtrar(criterios)
+
+    def contar_por(self, campo, criterios):
+        return self._almacen.contar_por(campo, criterios)
+
+    def buscar_correo(self, correo):
+        return self._almacen.buscar_correo(correo)
+
+    def correos_duplicados(self):
+        return self._almacen.correos_duplicados()
+
+    def cerrar(self):
+        if self._almacen is not None:
+            self._almacen.cerrar()
+
+
+# GUARDADO AUTOMÁTICO EN SEGUNDO PLANO
+class Autoguardado:
+    """
+    Hilo que guarda el registro en segundo plano. Tras el primer cambio
+    espera `intervalo` segundos (o a que se acumulen `cambios` registros
+    modificados) y hace un solo guardado con todo lo ocurrido mientras
+    tanto: una ráfaga de cambios se escribe una vez, no una por cambio.
+    Sin cambios el hilo duerme y no escribe nada.
+    """
+
+    def __init__(self, guardar, intervalo=30.0, cambios=None):
+        """
+        Args:
+            guardar (callable): Función que guarda los datos
+            intervalo (float/None): Segundos máximos que un cambio espera a
+                guardarse (None = solo por número de cambios)
+            cambios (int/None): Registros modificados que adelantan el
+                guardado (None = solo por intervalo)
+        """
+        if intervalo is None and cambios is None:
+            raise ValueError("Indique un intervalo o un número de cambios para autoguardar")
+        if (intervalo is not None and intervalo <= 0) or (cambios is not None and cambios < 1):
+            raise ValueError("El intervalo y los cambios de autoguardado deben ser positivos")
+        self._guardar = guardar
+        self.intervalo = intervalo
+        self.cambios = cambios
+        self.guardados = 0  # Guardados hechos por el hilo
+        self.ultimo_error = None  # Último fallo al guardar (se reintenta)
+        self._pendiente = threading.Event()  # Hay cambios sin guardar
+        self._urgente = threading.Event()  # Guardar ya: umbral alcanzado o detención
+        self._detenido = False
+        self._hilo = threading.Thread(target=self._ejecutar, name='autoguardado', daemon=True)
+        self._hilo.start()
+
+    def avisar(self, sin_guardar):
+        """
+        Informa de un cambio (se llama con el cerrojo del registro tomado,
+        así que solo marca eventos).
+
+        Args:
+            sin_guardar (int): Registros modificados desde el último guardado
+        """
+        self._pendiente.set()
+        if self.cambios is not None and sin_guardar >= self.cambios:
+            self._urgente.set()
+
+    def _ejecutar(self):
+        """
+        Bucle del hilo: espera cambios, deja pasar el intervalo para juntar
+        la ráfaga y guarda.
+        """
+        while True:
+            self._pendiente.wait()
+            self._urgente.wait(self.intervalo)
+            if self._detenido:
+                return  # cerrar() guarda lo pendiente en su propio hilo
+            # Se limpian antes de guardar: un cambio que llegue durante el
+            # guardado vuelve a marcarlos y se guarda en la vuelta siguiente
+            self._pendiente.clear()
+            self._urgente.clear()
+            try:
+                self._guardar()
+                self.guardados += 1
+                self.ultimo_error = None
+            except Exception as e:  # ErrorRegistro: disco lleno, permisos...
+                self.ultimo_error = e
+                self._pendiente.set()  # Se reintenta tras otro intervalo
+
+    def detener(self):
+        """
+        Detiene el hilo y espera a que termine el guardado en curso (si lo hay).
+        """
+        self._detenido = True
+        self._pendiente.set()
+        self._urgente.set()
+        self._hilo.join()
+
+
+# EXCEPCIONES DEL SISTEMA
+class ErrorRegistro(Exception):
+    """
+    Error base de las operaciones de RegistroAcademico.
+    """
+
+
+class DatosInvalidos(ErrorRegistro, ValueError):
+    """
+    Los datos recibidos no son válidos (campo vacío, año no numérico...).
+    """
+
+
+class RegistroNoEncontrado(ErrorRegistro, LookupError):
+    """
+    No existe un registro con el ID (o el correo) indicado.
+    """
+
+    def __init__(self, id=None, correo=None):
+        if correo is None:
+            super().__init__(f"No se encontró ningún registro con el ID {id}")
+        else:
+            super().__init__(f"No se encontró ningún registro con el correo {correo}")
+        self.id = id
+        self.correo = correo
+
+
+class CorreoDuplicado(DatosInvalidos):
+    """
+    El correo ya pertenece a otro registro.
+    """
+
+    def __init__(self, correo, id):
+        super().__init__(f"El correo {correo} ya está registrado (ID {id})")
+        self.correo = correo
+        self.id = id  # Registro que ya tiene el correo
+
+
+# CLASE PRINCIPAL DEL SISTEMA
+class RegistroAcademico:
+    """
+    Clase principal que gestiona todas las operaciones del sistema.
+    Contiene métodos para agregar, buscar, modificar y eliminar registros,
+    así como para guardar y cargar datos a través de un backend de
+    almacenamiento (CSV por defecto).
+
+    Los métodos no imprimen ni piden datos por consola: devuelven los
+    registros y, si algo falla, lanzan DatosInvalidos, RegistroNoEncontrado
+    o ErrorRegistro. La interfaz de consola está en main().
+    """
+
+    MODOS_ALMACEN = ('objetos', 'columnar', 'perezoso', 'binario')
+    MODOS_DURABILIDAD = BackendAlmacenamiento.MODOS_DURABILIDAD
+    FILTRABLES = ('tipo', 'carrera', 'anio', 'departamento', 'titulo', 'correo')
+    ORDENES = ('id', 'nombre', 'anio', 'carrera')
+
+    def __init__(self, indice_nombres=True, indices_campos=True, modo_almacen='objetos',
+                 archivo_registros='registros.csv', archivo_id='ultimo_id.txt',
+                 usar_journal=False, umbral_compactacion=1000,
+                 modo_durabilidad='siempre', lote_fsync=10, procesos_carga=1, backend=None,
+                 metricas=False, autoguardado=None, cambios_autoguardado=None,
+                 indice_difuso=True, tamano_cache=1024):
+        """
+        Inicializa el sistema con un índice vacío de registros
+        y carga los datos existentes al iniciar (ver cargar_datos, que
+        lanza ErrorRegistro si no se pueden leer).
+
+        Los registros se guardan en un diccionario ID -> registro. Como los
+        diccionarios conservan el orden de inserción, el mismo índice sirve
+        para listar los registros en orden y para acceder por ID en O(1).
+
+        Args:
+            indice_nombres (bool): Si es True, buscar_por_nombre usa un índice
+                de trigramas, que se construye en la primera búsqueda (no
+                ocupa memoria si nunca se busca) y luego se mantiene al día
+            indices_campos (bool): Si es True, mantiene índices por tipo,
+                carrera, año, departamento y título para filtrar y
+                contar_por sin recorrer todos los registros
+            modo_almacen (str): 'objetos' guarda un objeto por registro;
+                'columnar' guarda los campos en columnas compactas y crea
+                los objetos solo al acceder a ellos (menos memoria);
+                'perezoso' solo indexa la posición de cada fila del CSV y lee
+                los registros del disco cuando se necesitan (arranque casi
+                inmediato); 'binario' abre archivo_registros en el formato
+                de formato_binario.py con mmap y decodifica cada registro al
+                accederlo. En los modos 'perezoso' y 'binario' los índices
+                secundarios se construyen la primera vez que se usan
+            archivo_registros, archivo_id, usar_journal, umbral_compactacion,
+            modo_durabilidad, lote_fsync: Opciones del backend de archivo
+                que se crea cuando no se indica backend (ver BackendArchivo)
+            procesos_carga (int/None): Procesos para leer un CSV grande por
+                fragmentos en paralelo (ver BackendCSV; 1 = sin paralelismo)
+            backend (BackendAlmacenamiento/None): Backend de persistencia;
+                por ejemplo BackendSQLite('registros.db'). Si el backend
+                entrega su propio almacén, modo_almacen no se usa
+            metricas (bool): Si es True, activa las métricas desde la carga
+                inicial (ver activar_metricas)
+            autoguardado, cambios_autoguardado (float/int/None): Si se
+                indica alguno, guarda en segundo plano los cambios cada
+                `autoguardado` segundos o al acumular `cambios_autoguardado`
+                registros modificados (ver iniciar_autoguardado)
+            indice_difuso (bool): Si es True, buscar_aproximado construye
+                un IndiceDifuso la primera vez que se usa y lo mantiene al
+                día; si es False, cada búsqueda aproximada recorre todos
+                los registros (ahorra la memoria del índice)
+            tamano_cache (int): Entradas de cada caché LRU: la de resultados
+                de búsquedas y la de textos de mostrar_info (0 = sin caché)
+
+        Concurrencia: las escrituras (altas, cambios, bajas, guardado) se
+        hacen de a una bajo un cerrojo. Los cambios no modifican el objeto
+        del registro: se reemplaza por una copia ya modificada, así que
+        quien lo lee nunca ve un registro a medio cambiar. En el modo
+        'objetos' las lecturas no esperan a los escritores; en los demás
+        modos el almacén comparte archivos o conexiones y las lecturas
+        también toman el cerrojo.
+        """
+        if modo_almacen not in self.MODOS_ALMACEN:
+            raise ValueError(f"Modo de almacenamiento no válido: {modo_almacen}")
+        if tamano_cache < 0:
+            raise ValueError("El tamaño de la caché no puede ser negativo")
+        if backend is None:
+            opciones = dict(archivo_id=archivo_id, usar_journal=usar_journal,
+                            umbral_compactacion=umbral_compactacion,
+                            modo_durabilidad=modo_durabilidad, lote_fsync=lote_fsync)
+            if modo_almacen == 'binario':
+                backend = BackendBinario(archivo_registros, **opciones)
+            else:
+                backend = BackendCSV(archivo_registros, perezoso=modo_almacen == 'perezoso',
+                                     procesos=procesos_carga, **opciones)
+        self._backend = backend
+        self._cerrojo = threading.RLock()  # Un solo escritor a la vez
+
+        # Índice primario: ID -> registro (en orden de inserción)
+        self.modo_almacen = modo_almacen
+        self._por_id = AlmacenColumnar() if modo_almacen == 'columnar' else {}
+        self._usar_indice_nombres = indice_nombres
+        self._indice_nombres = None  # Se construye en la primera búsqueda por nombre
+        self._indice_campos = IndiceCampos() if indices_campos else None
+        self._indice_correos = IndiceCorreos()  # Siempre: garantiza correos únicos
+        self._usar_indice_difuso = indice_difuso
+        self._indice_difuso = None  # Se construye en la primera búsqueda aproximada
+        # Cachés LRU de resultados de búsquedas y de textos de mostrar_info.
+        # Una alta, baja o cambio de nombre descarta solo las búsquedas por
+        # nombre que el nombre afectado cumple; las aproximadas guardan la
+        # generación en que se hicieron, que esos cambios avanzan
+        self._cache_consultas = CacheLRU(tamano_cache)
+        self._cache_info = CacheLRU(tamano_cache)
+        self._generacion = 0
+        self._versiones = {}  # ID -> cambios del registro (para _cache_info)
+        # Con almacenes del backend los índices secundarios se construyen al primer uso
+        self._indices_listos = True
+        self.ultimo_id = 0  # Contador para IDs autoincrementales
+
+        self.metricas = None  # Instrumentación opcional (ver activar_metricas)
+        if metricas:
+            self.activar_metricas()
+
+        # IDs con altas, cambios o bajas desde el último guardado
+        self._modificados = set()
+        self._ultimo_id_guardado = 0
+        self._autoguardado = None
+
+        self.cargar_datos()  # Carga los datos existentes al iniciar
+        if autoguardado is not None or cambios_autoguardado is not None:
+            self.iniciar_autoguardado(autoguardado, cambios_autoguardado)
+
+    @property
+    def registros(self):
+        """
+        Vista de solo lectura de todos los registros en orden de inserción.
+
+        Returns:
+            ValuesView: Registros almacenados en el índice primario
+        """
+        return self._por_id.values()
+
+    def _lectura(self):
+        """
+        Cerrojo para las lecturas. Con el diccionario en memoria no hace
+        falta: cada operación sobre él es atómica y los escritores nunca
+        modifican un registro ya publicado. Los demás almacenes leen de
+        archivos o conexiones compartidas y se leen bajo el cerrojo.
+        """
+        return nullcontext() if type(self._por_id) is dict else self._cerrojo
+
+    def _recorrer(self):
+        """
+        Genera todos los registros en orden sin chocar con los escritores.
+        Con el diccionario en memoria recorre una copia de las referencias
+        (tomada de forma atómica); con los demás almacenes mantiene el
+        cerrojo mientras dura el recorrido.
+        """
+        if type(self._por_id) is dict:
+            yield from list(self._por_id.values())
+        else:
+            with self._cerrojo:
+                yield from self._por_id.values()
+
+    def activar_metricas(self):
+        """
+        Instrumenta los métodos públicos de esta instancia: cuenta llamadas
+        y errores, mide latencias y anota las filas recorridas y los bytes
+        leídos o escritos por el backend. Sin activarlas los métodos se
+        llaman sin envoltura alguna.
+
+        Returns:
+            Metricas: Las métricas (también en self.metricas); ver
+            Metricas.instantanea y Metricas.perfilar
+        """
+        with self._cerrojo:
+            if self.metricas is None:
+                metricas = Metricas()
+                metricas.instrumentar(self, excluir=('activar_metricas', 'desactivar_metricas'))
+                self._recorrer = metricas.envolver_recorrido(self._recorrer)
+                self._backend.al_contar_bytes = metricas.anotar_bytes
+                self.metricas = metricas
+            return self.metricas
+
+    def desactivar_metricas(self):
+        """
+        Quita la instrumentación y descarta las métricas acumuladas.
+        """
+        with self._cerrojo:
+            if self.metricas is not None:
+                self.metricas.desinstrumentar()
+                del self._recorrer  # Vuelve a ser el método de la clase
+                self._backend.al_contar_bytes = None
+                self.metricas = None
+
+    def _asegurar_indices(self):
+        """
+        Construye los índices secundarios si aún no existen (almacenes del
+        backend). Recorre todos los registros una sola vez.
+
+        La comprobación rápida se hace sin cerrojo, así que la marca se
+        pone al final: quien la ve ya encuentra los índices completos.
+        """
+        if self._indices_listos:
+            return
+        with self._cerrojo:
+            if self._indices_listos:
+                return  # Otro hilo los construyó mientras se esperaba
+            self._publicar_indices()
+            self._indices_listos = True
+
+    def _publicar_indices(self):
+        """
+        Construye índices secundarios nuevos con una pasada sobre los
+        registros y solo entonces reemplaza los actuales, para que ninguna
+        lectura sin cerrojo encuentre un índice a medio llenar. Debe
+        llamarse con el cerrojo tomado.
+        """
+        campos = None if self._indice_campos is None else IndiceCampos()
+        correos = IndiceCorreos()
+        for registro in self.registros:
+            if campos is not None:
+                campos.agregar(registro)
+            correos.agregar(registro.id, registro.correo)
+        self._indice_campos = campos
+        self._indice_correos = correos
+
+    def _indexar(self, registro):
+        """
+        Agrega un registro a los índices secundarios.
+        """
+        # Los índices de nombres se construyen aparte de los demás (en la
+        # primera búsqueda), así que una vez creados se mantienen siempre
+        if self._indice_nombres is not None:
+            self._indice_nombres.agregar(registro.id, registro.nombre)
+        if self._indice_difuso is not None:
+            self._indice_difuso.agregar(registro.id, registro.nombre)
+        if not self._indices_listos:
+            return  # Se indexará todo junto en _asegurar_indices
+        if self._indice_campos is not None:
+            self._indice_campos.agregar(registro)
+        self._indice_correos.agregar(registro.id, registro.correo)
+
+    def _desindexar(self, registro):
+        """
+        Quita un registro de los índices secundarios.
+        """
+        if self._indice_nombres is not None:
+            self._indice_nombres.quitar(registro.id)
+        if self._indice_difuso is not None:
+            self._indice_difuso.quitar(registro.id, registro.nombre)
+        if not self._indices_listos:
+            return
+        if self._indice_campos is not None:
+            self._indice_campos.quitar(registro)
+        self._indice_correos.quitar(registro.id, registro.correo)
+
+    def _insertar(self, registro):
+        """
+        Inserta un registro en el índice primario y en los secundarios.
+        Si ya existía un registro con el mismo ID, lo reemplaza.
+        """
+        anterior = None
+        buscado = (self._indices_listos or self._indice_nombres is not None
+                   or self._indice_difuso is not None)
+        if buscado:
+            anterior = self._por_id.get(registro.id)
+            if anterior is not None:
+                self._desindexar(anterior)
+        self._por_id[registro.id] = registro
+        self._indexar(registro)
+        if not buscado:
+            # Sin el registro anterior a mano se supone que cambió el nombre
+            self._invalidar_cache(registro.id, None)
+        elif anterior is None:
+            self._invalidar_cache(registro.id, (registro.nombre,), nuevo=True)
+        elif anterior.nombre != registro.nombre:
+            self._invalidar_cache(registro.id, (anterior.nombre, registro.nombre))
+        else:
+            self._invalidar_cache(registro.id, ())
+
+    def _quitar(self, registro):
+        """
+        Quita un registro del índice primario y de los secundarios.
+        """
+        del self._por_id[registro.id]
+        self._desindexar(registro)
+        self._invalidar_cache(registro.id, (registro.nombre,))
+        self._versiones.pop(registro.id, None)  # Los IDs no se reutilizan
+
+    def _invalidar_cache(self, id, nombres, nuevo=False):
+        """
+        Descarta de las cachés lo que depende de un registro que cambió.
+        Debe llamarse con el cerrojo tomado.
+
+        Args:
+            id (int): ID del registro dado de alta, modificado o eliminado
+            nombres (tuple/None): Nombres que entran o salen de las
+                búsquedas (el de un alta o baja, el anterior y el nuevo en
+                un cambio de nombre; vacía si el nombre no cambió). Se
+                descartan las búsquedas por nombre que alguno de ellos
+                cumple y se avanza la generación de las aproximadas. None
+                si no se conoce el nombre anterior: se descartan todas
+            nuevo (bool): True si el ID no existía (no hay nada guardado de él)
+        """
+        if not nuevo:
+            self._versiones[id] = self._versiones.get(id, 0) + 1
+            self._cache_consultas.quitar(('id', id))
+            self._cache_info.quitar(id)
+        if nombres == ():
+            return
+        self._generacion += 1
+        if nombres is None:
+            self._cache_consultas.quitar_si(lambda clave: clave[0] == 'nombre')
+        else:
+            textos = [normalizar_texto(nombre) for nombre in nombres]
+            self._cache_consultas.quitar_si(
+                lambda clave: clave[0] == 'nombre' and any(clave[1] in t for t in textos))
+
+    def _anotar(self, operacion, registro):
+        """
+        Informa al backend de una alta, cambio o baja (p. ej. para el journal)
+        y marca el registro como modificado.
+        """
+        self._backend.anotar(operacion, registro)
+        self._marcar_modificados((registro.id,))
+
+    def _anotar_lote(self, operacion, registros):
+        """
+        Como _anotar, para muchos registros con una sola anotación.
+        """
+        self._backend.anotar_lote(operacion, registros)
+        self._marcar_modificados(registro.id for registro in registros)
+
+    def _marcar_modificados(self, ids):
+        """
+        Anota IDs modificados desde el último guardado y avisa al guardado
+        automático. Debe llamarse con el cerrojo tomado.
+        """
+        self._modificados.update(ids)
+        autoguardado = self._autoguardado
+        if autoguardado is not None:
+            autoguardado.avisar(len(self._modificados))
+
+    def _marcar_guardado(self):
+        """
+        Todo lo modificado ya está en disco. Debe llamarse con el cerrojo tomado.
+        """
+        self._modificados.clear()
+        self._ultimo_id_guardado = self.ultimo_id
+
+    @property
+    def cambios_sin_guardar(self):
+        """
+        Número de registros con altas, cambios o bajas desde el último guardado.
+        """
+        return len(self._modificados)
+
+    def ids_sin_guardar(self):
+        """
+        Returns:
+            list: IDs modificados (o eliminados) desde el último guardado
+        """
+        with self._cerrojo:
+            return sorted(self._modificados)
+
+    def _hay_cambios(self):
+        """
+        Indica si hay algo que guardar: registros modificados o IDs
+        reservados que aún no están en la instantánea.
+        """
+        return bool(self._modificados) or self.ultimo_id != self._ultimo_id_guardado
+
+    def iniciar_autoguardado(self, intervalo=30.0, cambios=None):
+        """
+        Guarda los cambios en segundo plano (ver Autoguardado). Un segundo
+        llamado reemplaza la configuración anterior.
+
+        Args:
+            intervalo (float/None): Segundos máximos entre un cambio y su
+                guardado; los cambios de ese lapso se guardan juntos
+            cambios (int/None): Registros modificados que adelantan el guardado
+
+        Raises:
+            ValueError: Si no se indica ninguno o no son positivos
+        """
+        self.detener_autoguardado()
+        # Se resuelve guardar_datos en cada llamada por si se activan las métricas
+        autoguardado = Autoguardado(lambda: self.guardar_datos(), intervalo, cambios)
+        with self._cerrojo:
+            self._autoguardado = autoguardado
+            if self._hay_cambios():
+                autoguardado.avisar(len(self._modificados))
+
+    def detener_autoguardado(self):
+        """
+        Detiene el guardado automático (sin guardar lo pendiente) y espera a
+        que termine el guardado en curso.
+        """
+        with self._cerrojo:
+            autoguardado, self._autoguardado = self._autoguardado, None
+        if autoguardado is not None:
+            # Fuera del cerrojo: el hilo puede estar esperándolo para guardar
+            autoguardado.detener()
+
+    @property
+    def guardados_automaticos(self):
+        """
+        Guardados hechos por el guardado automático activo (0 si no lo está).
+        """
+        autoguardado = self._autoguardado
+        return 0 if autoguardado is None else autoguardado.guardados
+
+    @property
+    def error_autoguardado(self):
+        """
+        Último error del guardado automático (None si el último guardado
+        funcionó o no está activo).
+        """
+        autoguardado = self._autoguardado
+        return None if autoguardado is None else autoguardado.ultimo_error
+
+    def cerrar(self, guardar=None):
+        """
+        Detiene el guardado automático y cierra los archivos o conexiones
+        del backend, forzando al disco lo pendiente del journal.
+
+        Args:
+            guardar (bool/None): Guardar antes los cambios pendientes. Por
+                defecto se guardan solo si el guardado automático está activo
+
+        Raises:
+            ErrorRegistro: Si no se pudieron guardar los cambios pendientes
+                (el backend se cierra igual)
+        """
+        autoguardado = self._autoguardado
+        self.detener_autoguardado()
+        try:
+            if guardar or (guardar is None and autoguardado is not None):
+                self.guardar_datos()
+        finally:
+            with self._cerrojo:
+                self._backend.cerrar()
+
+    def generar_id(self):
+        """
+        Genera un nuevo ID autoincremental para los registros.
+
+        Returns:
+            int: Nuevo ID generado
+        """
+        with self._cerrojo:
+            self.ultimo_id += 1  # Incrementa el contador de IDs
+            return self.ultimo_id  # Devuelve el nuevo ID
+
+    def reservar_ids(self, cantidad):
+        """
+        Reserva de una sola vez un bloque de IDs consecutivos.
+
+        Args:
+            cantidad (int): Número de IDs a reservar
+
+        Returns:
+            range: IDs reservados
+        """
+        with self._cerrojo:
+            inicio = self.ultimo_id + 1
+            self.ultimo_id += cantidad
+            return range(inicio, self.ultimo_id + 1)
+
+    def agregar_lote(self, registros):
+        """
+        Agrega en bloque registros ya validados y con ID asignado (ver
+        reservar_ids). No muestra mensajes por registro y el journal se
+        escribe con una sola operación.
 
-    def __init__(self):
+        Args:
+            registros (list): Estudiantes y docentes a agregar
+
+        Returns:
+            int: Número de registros agregados
+
+        Raises:
+            CorreoDuplicado: Si algún correo ya está registrado o se repite
+                dentro del lote (no se agrega ninguno)
         """
-        Inicializa el sistema con una lista vacía de registros
-        y carga los datos existentes al iniciar.
+        with self._cerrojo:
+            nuevos = {}
+            for registro in registros:
+                self._comprobar_correo(registro.correo)
+                clave = normalizar_correo(registro.correo)
+                if nuevos.setdefault(clave, registro.id) != registro.id:
+                    raise CorreoDuplicado(registro.correo, nuevos[clave])
+            for registro in registros:
+                self._insertar(registro)
+                if registro.id > self.ultimo_id:
+                    self.ultimo_id = registro.id
+            self._anotar_lote('alta', registros)
+        return len(registros)
+
+    def _nuevo_registro(self, clase, nombre, correo, grupo, extra):
         """
-        self.registros = []  # Lista para almacenar todos los registros
-        self.ultimo_id = 0  # Contador para IDs autoincrementales
-        self.cargar_datos()  # Carga los datos existentes al iniciar
+        Valida los datos de un alta y crea el registro con un ID nuevo.
+        Debe llamarse con el cerrojo tomado.
+        """
+        valores = [str(valor).strip() for valor in (nombre, correo, grupo, extra)]
+        if not all(valores):
+            raise DatosInvalidos("Todos los campos son obligatorios")
+        nombre, correo, grupo, extra = valores
+        if clase is Estudiante:
+            try:
+                extra = int(extra)
+            except ValueError:
+                raise DatosInvalidos("El año debe ser un número entero") from None
+        self._comprobar_correo(correo)
+        return clase(self.generar_id(), nombre, correo, grupo, extra)
 
-    def generar_id(self):
+    def _comprobar_correo(self, correo, id=None):
         """
-        Genera un nuevo ID autoincremental para los registros.
+        Comprueba que un correo no pertenezca a otro registro (O(1) con el
+        índice de correos). Debe llamarse con el cerrojo tomado.
 
-        Returns:
-            int: Nuevo ID generado
+        Args:
+            correo (str): Correo a comprobar
+            id (int/None): Registro que va a tener el correo (None = alta)
+
+        Raises:
+            CorreoDuplicado: Si el correo ya es de otro registro
         """
-        self.ultimo_id += 1  # Incrementa el contador de IDs
-        return self.ultimo_id  # Devuelve el nuevo ID
+        dueno = self.correo_registrado(correo)
+        if dueno is not None and dueno != id:
+            raise CorreoDuplicado(correo, dueno)
 
     def agregar_estudiante(self, nombre, correo, carrera, anio):
         """
@@ -148,19 +2542,17 @@ class RegistroAcademico:
             anio (str/int): Año de ingreso
 
         Returns:
-            bool: True si se agregó correctamente, False si hubo error
+            Estudiante: El estudiante agregado, con su ID asignado
+
+        Raises:
+            DatosInvalidos: Si falta algún campo o el año no es un entero
+            CorreoDuplicado: Si el correo ya está registrado
         """
-        try:
-            # Crea una nueva instancia de Estudiante
-            estudiante = Estudiante(
-                self.generar_id(), nombre, correo, carrera, int(anio)
-            )
-            self.registros.append(estudiante)  # Agrega a la lista de registros
-            print("\n✅ Estudiante agregado exitosamente!")
-            return True
-        except ValueError:
-            print("\n❌ Error: El año debe ser un número entero")
-            return False
+        with self._cerrojo:
+            estudiante = self._nuevo_registro(Estudiante, nombre, correo, carrera, anio)
+            self._insertar(estudiante)  # Agrega a los índices de registros
+            self._anotar('alta', estudiante)
+        return estudiante
 
     def agregar_docente(self, nombre, correo, departamento, titulo):
         """
@@ -173,252 +2565,783 @@ class RegistroAcademico:
             titulo (str): Título del docente
 
         Returns:
-            bool: True si se agregó correctamente
+            Docente: El docente agregado, con su ID asignado
+
+        Raises:
+            DatosInvalidos: Si falta algún campo
+            CorreoDuplicado: Si el correo ya está registrado
         """
-        # Crea una nueva instancia de Docente
-        docente = Docente(
-            self.generar_id(), nombre, correo, departamento, titulo
-        )
-        self.registros.append(docente)  # Agrega a la lista de registros
-        print("\n✅ Docente agregado exitosamente!")
-        return True
+        with self._cerrojo:
+            docente = self._nuevo_registro(Docente, nombre, correo, departamento, titulo)
+            self._insertar(docente)  # Agrega a los índices de registros
+            self._anotar('alta', docente)
+        return docente
 
-    def mostrar_todos(self):
+    def listar(self, orden='id', offset=0, limite=None):
         """
-        Muestra todos los registros almacenados en el sistema.
+        Devuelve una página de registros ordenados.
+
+        Args:
+            orden (str): Uno de ORDENES. 'id' es el orden de inserción (los
+                IDs son autoincrementales) y no necesita ordenar nada
+            offset (int): Registros a saltar desde el principio
+            limite (int/None): Tamaño máximo de la página (None = todos)
+
+        Returns:
+            list: Copia de los registros de la página (no cambia con altas o
+            bajas posteriores)
+
+        Raises:
+            DatosInvalidos: Si el orden no existe o offset/limite son negativos
         """
-        if not self.registros:  # Verifica si la lista está vacía
-            print("\nℹ️ No hay registros en el sistema.")
-            return
+        if orden not in self.ORDENES:
+            raise DatosInvalidos(f"Orden no válido: {orden} (use {', '.join(self.ORDENES)})")
+        if offset < 0 or (limite is not None and limite < 0):
+            raise DatosInvalidos("offset y limite no pueden ser negativos")
+        fin = None if limite is None else offset + limite
+        if orden == 'id':
+            return list(islice(self._recorrer(), offset, fin))
+        if fin is None:
+            return sorted(self._recorrer(), key=clave_orden(orden))[offset:]
+        # Para una página solo hace falta conocer los `fin` primeros: un
+        # heap de ese tamaño evita ordenar todo el registro
+        return heapq.nsmallest(fin, self._recorrer(), key=clave_orden(orden))[offset:]
+
+    @staticmethod
+    def _convertir_id(id):
+        """
+        Convierte un ID recibido como texto o número en entero.
 
-        print("\n=== LISTA DE REGISTROS ===")
-        for registro in self.registros:  # Recorre todos los registros
-            print(registro.mostrar_info())  # Muestra la información de cada uno
+        Raises:
+            DatosInvalidos: Si no es un número
+        """
+        try:
+            return int(id)
+        except (TypeError, ValueError):
+            raise DatosInvalidos("El ID debe ser un número") from None
 
     def buscar_por_id(self, id):
         """
         Busca un registro por su ID.
 
         Args:
-            id (str): ID a buscar (se convierte a int)
+            id (str/int): ID a buscar (se convierte a int)
 
         Returns:
-            Persona/None: El registro encontrado o None si no existe
-        """
-        try:
-            id_buscar = int(id)  # Intenta convertir el ID a entero
-        except ValueError:
-            print("\n❌ Error: El ID debe ser un número")
-            return None
-
-        # Busca el registro con el ID especificado
-        for registro in self.registros:
-            if registro.id == id_buscar:
-                print("\n🔍 Registro encontrado:")
-                print(registro.mostrar_info())
-                return registro  # Devuelve el registro encontrado
+            Persona: El registro encontrado
 
-        print("\nℹ️ No se encontró ningún registro con ese ID.")
-        return None  # Si no encontró nada
+        Raises:
+            DatosInvalidos: Si el ID no es un número
+            RegistroNoEncontrado: Si no existe un registro con ese ID
+        """
+        id_buscar = self._convertir_id(id)
+        if type(self._por_id) is dict:
+            # Busca el registro en el índice primario (O(1), sin caché)
+            registro = self._por_id.get(id_buscar)
+        else:
+            # Los demás almacenes leen y decodifican el registro: se guarda
+            # en la caché hasta que cambie
+            encontrado, registro = self._cache_consultas.obtener(('id', id_buscar))
+            if not encontrado:
+                with self._lectura():
+                    registro = self._por_id.get(id_buscar)
+                    if registro is not None:
+                        self._cache_consultas.guardar(('id', id_buscar), registro)
+        if registro is None:
+            raise RegistroNoEncontrado(id_buscar)
+        return registro
 
     def buscar_por_nombre(self, nombre):
         """
         Busca registros que coincidan con un nombre (búsqueda parcial).
+        No distingue mayúsculas ni tildes: "perez" encuentra "Pérez".
 
         Args:
             nombre (str): Nombre o parte del nombre a buscar
+
+        Returns:
+            list: Registros encontrados, en orden de ID (vacía si no hay)
+
+        Raises:
+            DatosInvalidos: Si el nombre está vacío
         """
         if not nombre.strip():  # Verifica si el nombre está vacío
-            print("\n❌ Error: Debe ingresar un nombre para buscar")
-            return
+            raise DatosInvalidos("Debe ingresar un nombre para buscar")
+
+        # La caché guarda los IDs encontrados, no los registros: así los
+        # cambios que no tocan el nombre no la invalidan y se leen al día
+        clave = ('nombre', normalizar_texto(nombre))
+        generacion = self._generacion
+        encontrado, ids = self._cache_consultas.obtener(clave)
+        if encontrado:
+            with self._lectura():
+                return [r for r in map(self._por_id.get, ids) if r is not None]
+
+        # Si el backend sabe buscar (p. ej. con SQL) resuelve él la consulta
+        with self._lectura():
+            encontrados = self._backend.buscar_nombre(nombre)
+        if encontrados is None and self._usar_indice_nombres:
+            # Usa el índice de trigramas: solo revisa los candidatos
+            indice = self._asegurar_indice_nombres()
+            with self._lectura():
+                ids = indice.buscar(nombre)
+                # Un registro eliminado después de consultar el índice se omite
+                encontrados = [r for r in map(self._por_id.get, ids) if r is not None]
+        elif encontrados is None:
+            # Sin índice: recorre todos los registros
+            consulta = normalizar_texto(nombre)
+            encontrados = [
+                r for r in self._recorrer()
+                if consulta in normalizar_texto(r.nombre)
+            ]
+        # Si algo cambió mientras se buscaba, el resultado puede estar viejo
+        self._cache_consultas.guardar(clave, tuple(r.id for r in encontrados),
+                                      vigente=lambda: self._generacion == generacion)
+        return encontrados
+
+    def _asegurar_indice_nombres(self):
+        """
+        Devuelve el índice de trigramas, construyéndolo con una pasada
+        sobre los registros la primera vez. Se publica ya completo.
+        """
+        indice = self._indice_nombres
+        if indice is not None:
+            return indice
+        with self._cerrojo:
+            if self._indice_nombres is None:
+                indice = IndiceNgramas()
+                for registro in self.registros:
+                    indice.agregar(registro.id, registro.nombre)
+                self._indice_nombres = indice
+            return self._indice_nombres
 
-        # Lista de registros cuyo nombre contiene el texto buscado (case insensitive)
-        encontrados = [
-            r for r in self.registros
-            if nombre.lower() in r.nombre.lower()
-        ]
+    def _asegurar_indice_difuso(self):
+        """
+        Devuelve el índice de búsqueda aproximada, construyéndolo con una
+        pasada sobre los registros la primera vez. Con indice_difuso=False
+        arma uno temporal en cada llamada.
+        """
+        indice = self._indice_difuso
+        if indice is not None:
+            return indice
+        if not self._usar_indice_difuso:
+            indice = IndiceDifuso()
+            for registro in self._recorrer():
+                indice.agregar(registro.id, registro.nombre)
+            return indice
+        with self._cerrojo:
+            if self._indice_difuso is None:
+                indice = IndiceDifuso()
+                for registro in self.registros:
+                    indice.agregar(registro.id, registro.nombre)
+                self._indice_difuso = indice
+            return self._indice_difuso
 
-        if not encontrados:  # Si no encontró coincidencias
-            print("\nℹ️ No se encontraron registros con ese nombre.")
-            return
+    def buscar_aproximado(self, nombre, limite=10, minimo=0.6):
+        """
+        Busca los registros con nombres parecidos, tolerando errores de
+        tipeo, tildes y grafías que suenan igual ("Gonzales" encuentra
+        "González", "Basques" encuentra "Vásquez"). Los resultados se
+        ordenan de más a menos parecido.
+
+        Args:
+            nombre (str): Nombre o parte del nombre a buscar
+            limite (int): Máximo de resultados
+            minimo (float): Parecido mínimo, de 0 a 1
 
-        # Muestra los registros encontrados
-        print(f"\n🔍 Se encontraron {len(encontrados)} registros:")
-        for registro in encontrados:
-            print(registro.mostrar_info())
+        Returns:
+            list: Pares (registro, puntuación de 0 a 1), el más parecido primero
 
-    def modificar_registro(self, id):
+        Raises:
+            DatosInvalidos: Si el nombre está vacío o el límite no es positivo
         """
-        Modifica los datos de un registro existente.
+        if not nombre.strip():
+            raise DatosInvalidos("Debe ingresar un nombre para buscar")
+        if limite < 1:
+            raise DatosInvalidos("El límite debe ser mayor que cero")
+        clave = ('aproximado', tuple(tokenizar(nombre)), limite, minimo)
+        generacion = self._generacion
+        encontrado, puntuados = self._cache_consultas.obtener(clave, generacion)
+        if not encontrado:
+            puntuados = self._asegurar_indice_difuso().buscar(nombre, limite, minimo)
+            self._cache_consultas.guardar(clave, puntuados, generacion)
+        with self._lectura():
+            # Un registro eliminado después de consultar el índice se omite
+            encontrados = [(self._por_id.get(id), puntuacion) for id, puntuacion in puntuados]
+        return [(registro, puntuacion) for registro, puntuacion in encontrados
+                if registro is not None]
+
+    def info_registro(self, registro):
+        """
+        Texto de mostrar_info de un registro, guardado en caché por ID y
+        número de versión del registro (que cada cambio avanza), así que
+        sirve con cualquier almacén aunque cree un objeto en cada lectura.
 
         Args:
-            id (str): ID del registro a modificar
+            registro (Persona): Registro a mostrar, recién leído
 
         Returns:
-            bool: True si se modificó correctamente, False si hubo error
+            str: El texto de registro.mostrar_info()
+        """
+        id = registro.id
+        version = self._versiones.get(id, 0)
+        encontrado, texto = self._cache_info.obtener(id, version)
+        if not encontrado:
+            texto = registro.mostrar_info()
+            self._cache_info.guardar(id, texto, version,
+                                     vigente=lambda: self._versiones.get(id, 0) == version)
+        return texto
+
+    def estadisticas_cache(self):
         """
-        registro = self.buscar_por_id(id)  # Busca el registro por ID
-        if not registro:
-            return False  # Si no encontró el registro
+        Aciertos y fallos de las cachés de búsquedas y de textos.
 
-        print("\n✏️ Ingrese los nuevos datos (deje en blanco para mantener el valor actual):")
+        Returns:
+            dict: {'consultas': {...}, 'info': {...}} (ver CacheLRU.estadisticas)
+        """
+        return {'consultas': self._cache_consultas.estadisticas(),
+                'info': self._cache_info.estadisticas()}
 
-        # Campos específicos para Estudiantes
-        if isinstance(registro, Estudiante):
-            carrera = input(f"Carrera [{registro.carrera}]: ") or registro.carrera
-            anio = input(f"Año [{registro.anio}]: ")
-            try:
-                registro.anio = int(anio) if anio else registro.anio
-            except ValueError:
-                print("❌ El año debe ser un número. Se mantendrá el valor actual.")
+    def correo_registrado(self, correo):
+        """
+        Devuelve el ID del registro que tiene un correo, sin distinguir
+        mayúsculas ni espacios alrededor.
 
-        # Campos específicos para Docentes
-        elif isinstance(registro, Docente):
-            departamento = input(f"Departamento [{registro.departamento}]: ") or registro.departamento
-            titulo = input(f"Título [{registro.titulo}]: ") or registro.titulo
-            registro.departamento = departamento
-            registro.titulo = titulo
+        Args:
+            correo (str): Correo a buscar
+
+        Returns:
+            int/None: ID del registro, o None si el correo está libre
+        """
+        with self._lectura():
+            ids = self._backend.buscar_correo(correo)
+        if ids is not None:
+            return ids[0] if ids else None
+        self._asegurar_indices()
+        return self._indice_correos.buscar(correo)
+
+    def buscar_por_correo(self, correo):
+        """
+        Busca un registro por su correo (O(1) con el índice de correos).
 
-        # Campos comunes a todos
-        nombre = input(f"Nombre [{registro.nombre}]: ") or registro.nombre
-        correo = input(f"Correo [{registro.correo}]: ") or registro.correo
+        Args:
+            correo (str): Correo a buscar (sin distinguir mayúsculas)
 
-        # Actualiza los valores
-        registro.nombre = nombre
-        registro.correo = correo
+        Returns:
+            Persona: El registro encontrado
 
-        print("\n✅ Registro modificado exitosamente!")
-        return True
+        Raises:
+            DatosInvalidos: Si el correo está vacío
+            RegistroNoEncontrado: Si ningún registro tiene ese correo
+        """
+        if not correo.strip():
+            raise DatosInvalidos("Debe ingresar un correo para buscar")
+        id = self.correo_registrado(correo)
+        with self._lectura():
+            registro = None if id is None else self._por_id.get(id)
+        if registro is None:
+            raise RegistroNoEncontrado(correo=correo.strip())
+        return registro
+
+    def correos_duplicados(self):
+        """
+        Informa los correos que se repiten en los datos cargados (guardados
+        antes de exigir correos únicos). En memoria se arma al cargar, en
+        la misma pasada que construye los índices.
+
+        Returns:
+            dict: Correo normalizado -> lista ordenada de IDs que lo comparten
+        """
+        with self._lectura():
+            duplicados = self._backend.correos_duplicados()
+        if duplicados is not None:
+            return duplicados
+        self._asegurar_indices()
+        return self._indice_correos.duplicados()
+
+    def _validar_cambios(self, id, campos, registro=None):
+        """
+        Comprueba que un cambio se puede aplicar y prepara el registro nuevo.
+        Debe llamarse con el cerrojo tomado.
+
+        Args:
+            id (str/int): ID del registro a modificar
+            campos (dict): Campo -> nuevo valor
+            registro (Persona/None): Registro sobre el que aplicar los
+                cambios (por defecto, el que está guardado con ese ID)
+
+        Returns:
+            Persona: Copia del registro actual con los cambios aplicados
+
+        Raises:
+            DatosInvalidos, RegistroNoEncontrado
+        """
+        id = self._convertir_id(id)
+        if registro is None:
+            # Se parte del registro actual por si otro hilo lo cambió mientras tanto
+            registro = self._por_id.get(id)
+            if registro is None:
+                raise RegistroNoEncontrado(id)
+        if not campos:
+            raise DatosInvalidos("Indique al menos un campo a modificar")
+        tipo = fila_de_registro(registro)[0]
+        validos = ('nombre', 'correo') + (
+            ('carrera', 'anio') if tipo == 'estudiante' else ('departamento', 'titulo'))
+
+        nuevo = copy.copy(registro)
+        for campo, valor in campos.items():
+            if campo not in validos:
+                raise DatosInvalidos(f"El campo '{campo}' no corresponde a un {tipo}")
+            valor = str(valor).strip()
+            if not valor:
+                raise DatosInvalidos(f"El campo '{campo}' no puede quedar vacío")
+            if campo == 'anio':
+                try:
+                    valor = int(valor)
+                except ValueError:
+                    raise DatosInvalidos("El año debe ser un número entero") from None
+            if campo == 'correo':
+                self._comprobar_correo(valor, id)
+            setattr(nuevo, campo, valor)
+        return nuevo
+
+    def modificar_registro(self, id, **campos):
+        """
+        Modifica los datos de un registro existente.
+
+        El cambio es atómico: se modifica una copia del registro y la copia
+        reemplaza al original en los índices, así que las lecturas
+        concurrentes ven el registro completo de antes o el de después.
+
+        Args:
+            id (str/int): ID del registro a modificar
+            **campos: Nuevos valores (nombre, correo, carrera, anio para
+                estudiantes; nombre, correo, departamento, titulo para docentes)
+
+        Returns:
+            Persona: El registro ya modificado
+
+        Raises:
+            DatosInvalidos: Si no hay campos, alguno no corresponde al tipo
+                de registro, está vacío o el año no es un entero
+            CorreoDuplicado: Si el nuevo correo ya es de otro registro
+            RegistroNoEncontrado: Si no existe un registro con ese ID
+        """
+        with self._cerrojo:
+            nuevo = self._validar_cambios(id, campos)
+            self._insertar(nuevo)  # Reemplaza al anterior y actualiza los índices
+            self._anotar('cambio', nuevo)
+        return nuevo
+
+    def modificar_lote(self, cambios):
+        """
+        Aplica muchos cambios de una vez. Se validan todos antes de aplicar
+        ninguno: si alguno falla, el registro queda como estaba.
+
+        Args:
+            cambios (iterable): Pares (id, {campo: valor})
+
+        Returns:
+            list: Registros ya modificados, en el mismo orden
+
+        Raises:
+            DatosInvalidos, RegistroNoEncontrado: Del primer cambio inválido
+                (CorreoDuplicado también si dos cambios dejan el mismo correo)
+        """
+        with self._cerrojo:
+            nuevos = {}
+            correos = {}
+            for id, campos in cambios:
+                id = self._convertir_id(id)
+                # Varios cambios al mismo ID se acumulan sobre el anterior
+                nuevos[id] = self._validar_cambios(id, campos, nuevos.get(id))
+                if 'correo' in campos:
+                    # Dos cambios del lote no pueden dejar el mismo correo
+                    clave = normalizar_correo(nuevos[id].correo)
+                    if correos.setdefault(clave, id) != id:
+                        raise CorreoDuplicado(nuevos[id].correo, correos[clave])
+            for nuevo in nuevos.values():
+                self._insertar(nuevo)
+            self._anotar_lote('cambio', list(nuevos.values()))
+        return list(nuevos.values())
 
     def eliminar_registro(self, id):
         """
-        Elimina un registro del sistema después de confirmación.
+        Elimina un registro del sistema.
 
         Args:
-            id (str): ID del registro a eliminar
+            id (str/int): ID del registro a eliminar
 
         Returns:
-            bool: True si se eliminó, False si se canceló
+            Persona: El registro eliminado
+
+        Raises:
+            DatosInvalidos: Si el ID no es un número
+            RegistroNoEncontrado: Si no existe un registro con ese ID
+        """
+        id = self._convertir_id(id)
+        with self._cerrojo:
+            registro = self._por_id.get(id)
+            if registro is None:
+                raise RegistroNoEncontrado(id)
+            # Quita el registro de los índices sin copiar el resto (O(1))
+            self._quitar(registro)
+            self._anotar('baja', registro)
+        return registro
+
+    def eliminar_lote(self, ids):
         """
-        registro = self.buscar_por_id(id)  # Busca el registro por ID
-        if not registro:
-            return False  # Si no encontró el registro
+        Elimina muchos registros de una vez. Si algún ID no existe no se
+        elimina ninguno.
 
-        # Pide confirmación antes de eliminar
-        confirmacion = input("\n¿Está seguro que desea eliminar este registro? (s/n): ").lower()
-        if confirmacion == 's':
-            # Filtra la lista para excluir el registro con el ID especificado
-            self.registros = [r for r in self.registros if r.id != registro.id]
-            print("\n✅ Registro eliminado exitosamente!")
-            return True
+        Args:
+            ids (iterable): IDs a eliminar
+
+        Returns:
+            list: Registros eliminados
+
+        Raises:
+            DatosInvalidos, RegistroNoEncontrado: Del primer ID inválido
+        """
+        with self._cerrojo:
+            registros = {}
+            for id in map(self._convertir_id, ids):
+                registro = self._por_id.get(id)
+                if registro is None:
+                    raise RegistroNoEncontrado(id)
+                registros[id] = registro  # Un ID repetido se elimina una vez
+            for registro in registros.values():
+                self._quitar(registro)
+            self._anotar_lote('baja', list(registros.values()))
+        return list(registros.values())
+
+    def filtrar(self, **criterios):
+        """
+        Busca registros cuyos campos tengan exactamente los valores dados.
+        Si el backend sabe resolver la consulta (p. ej. SQLite) se delega.
+
+        Args:
+            **criterios: Campos de FILTRABLES y sus valores,
+                p. ej. filtrar(carrera='Sistemas', anio=2023)
+
+        Returns:
+            list: Registros que cumplen todos los criterios
+
+        Raises:
+            DatosInvalidos: Si algún campo no es filtrable
+        """
+        for campo in criterios:
+            if campo not in self.FILTRABLES:
+                raise DatosInvalidos(f"Campo no filtrable: {campo}")
+        with self._lectura():
+            encontrados = self._backend.filtrar(criterios)
+        if encontrados is not None:
+            return encontrados
+        tipo = criterios.get('tipo')
+        campos = {c: v for c, v in criterios.items() if c != 'tipo'}
+
+        def cumple(r):
+            return ((tipo is None or fila_de_registro(r)[0] == tipo)
+                    and all(getattr(r, campo, None) == valor for campo, valor in campos.items()))
+
+        if 'correo' in criterios:
+            # El índice de correos deja uno o muy pocos candidatos
+            self._asegurar_indices()
+            with self._lectura():
+                ids = sorted(self._indice_correos.ids(criterios['correo']))
+                candidatos = [r for r in map(self._por_id.get, ids) if r is not None]
+            return [r for r in candidatos if cumple(r)]
+        if self._indice_campos is not None and criterios:
+            # Intersecta los conjuntos de IDs de cada criterio
+            self._asegurar_indices()
+            with self._lectura():
+                ids = sorted(self._indice_campos.buscar(criterios))
+                # Un registro eliminado después de consultar el índice se omite
+                return [r for r in map(self._por_id.get, ids) if r is not None]
+        # Sin índices: recorre todos los registros
+        return [r for r in self._recorrer() if cumple(r)]
+
+    def contar_por(self, campo, **criterios):
+        """
+        Cuenta los registros agrupados por los valores de un campo, p. ej.
+        docentes por departamento o estudiantes por año. Con los índices por
+        campo los conteos ya están calculados (son el tamaño de cada
+        conjunto del índice) y cada alta, cambio o baja los actualiza en O(1).
+
+        Args:
+            campo (str): 'tipo', 'carrera', 'anio', 'departamento' o 'titulo'
+            **criterios: Filtros opcionales como en filtrar,
+                p. ej. contar_por('anio', carrera='Sistemas')
+
+        Returns:
+            dict: Valor -> número de registros, ordenado por valor (sin
+            los registros que no tienen el campo)
+
+        Raises:
+            DatosInvalidos: Si el campo no se puede agrupar o algún
+                criterio no es filtrable
+        """
+        if campo not in IndiceCampos.CAMPOS:
+            raise DatosInvalidos(f"Campo no agrupable: {campo} "
+                                 f"(use {', '.join(IndiceCampos.CAMPOS)})")
+        for criterio in criterios:
+            if criterio not in self.FILTRABLES:
+                raise DatosInvalidos(f"Campo no filtrable: {criterio}")
+        with self._lectura():
+            conteos = self._backend.contar_por(campo, criterios)
+        if conteos is not None:
+            return conteos
+        if self._indice_campos is not None:
+            self._asegurar_indices()
+            if not criterios:
+                candidatos = None
+            elif all(c in IndiceCampos.CAMPOS for c in criterios):
+                candidatos = self._indice_campos.buscar(criterios)
+            else:
+                candidatos = {r.id for r in self.filtrar(**criterios)}
+            return self._indice_campos.contar(campo, candidatos)
+        # Sin índices: recorre los registros y cuenta
+        registros = self.filtrar(**criterios) if criterios else self._recorrer()
+        if campo == 'tipo':
+            conteos = Counter(fila_de_registro(r)[0] for r in registros)
         else:
-            print("\n❌ Eliminación cancelada")
-            return False
+            conteos = Counter(getattr(r, campo, None) for r in registros)
+            conteos.pop(None, None)  # Registros del otro tipo
+        return dict(sorted(conteos.items()))
 
     def guardar_datos(self):
         """
-        Guarda todos los registros en un archivo CSV.
+        Guarda todos los registros a través del backend.
+
+        Con el journal activo los cambios ya están en disco, así que solo se
+        reescribe la instantánea cuando el journal supera el umbral de
+        compactación.
+
+        Si no hubo cambios desde el último guardado no escribe nada.
 
         Returns:
-            bool: True si se guardó correctamente, False si hubo error
-        """
-        try:
-            # Abre el archivo en modo escritura (sobrescribe si existe)
-            with open('registros.csv', 'w', newline='', encoding='utf-8') as file:
-                writer = csv.writer(file, delimiter=';')  # Crea un escritor CSV
+            bool: True si se escribió una instantánea completa, False si
+            no hacía falta (sin cambios, o ya guardados en el journal)
 
-                # Escribe cada registro en el archivo
-                for registro in self.registros:
-                    if isinstance(registro, Estudiante):
-                        writer.writerow([
-                            'estudiante',  # Tipo de registro
-                            registro.id,
-                            registro.nombre,
-                            registro.correo,
-                            registro.carrera,
-                            registro.anio
-                        ])
-                    elif isinstance(registro, Docente):
-                        writer.writerow([
-                            'docente',  # Tipo de registro
-                            registro.id,
-                            registro.nombre,
-                            registro.correo,
-                            registro.departamento,
-                            registro.titulo
-                        ])
-
-            # Guarda el último ID usado en un archivo separado
-            with open('ultimo_id.txt', 'w', encoding='utf-8') as file:
-                file.write(str(self.ultimo_id))
-
-            print("\n💾 Datos guardados exitosamente!")
+        Raises:
+            ErrorRegistro: Si no se pudo escribir
+        """
+        with self._cerrojo:
+            if not self._backend.debe_escribir_instantanea():
+                self._marcar_guardado()  # El journal ya los tiene en disco
+                return False
+            if not self._hay_cambios() and not self.cambios_en_journal:
+                return False
+            self.compactar()
             return True
+
+    @property
+    def cambios_en_journal(self):
+        """
+        Número de cambios anotados en el journal desde la última instantánea.
+        """
+        return getattr(self._backend, 'entradas_journal', 0)
+
+    def compactar(self):
+        """
+        Escribe una instantánea completa de los registros (y vacía el journal).
+
+        Raises:
+            ErrorRegistro: Si no se pudo escribir
+        """
+        try:
+            with self._cerrojo:
+                almacen = self._backend.escribir_instantanea(self.registros, self.ultimo_id)
+                if almacen is not None:
+                    self._por_id = almacen  # El backend reabrió su almacén
+                self._marcar_guardado()
         except Exception as e:
-            print(f"\n❌ Error al guardar datos: {str(e)}")
-            return False
+            raise ErrorRegistro(f"No se pudieron guardar los datos: {e}") from e
 
-    def cargar_datos(self):
+    def exportar_respaldo(self, ruta, formato='csv', compresion='gzip', nivel=None,
+                          filas_por_bloque=FILAS_POR_BLOQUE):
         """
-        Carga los registros desde el archivo CSV al iniciar el sistema.
+        Escribe un respaldo comprimido con todos los registros tal como están
+        en este momento (ver formato_respaldo.py). Los registros se convierten
+        y comprimen de a un bloque, sin armar la salida completa en memoria,
+        en un archivo temporal que al terminar reemplaza a `ruta`.
+
+        Args:
+            ruta (str): Archivo de destino (p. ej. respaldo.csv.gz)
+            formato (str): 'csv' (el de registros.csv) o 'jsonl'
+            compresion (str): 'gzip' o 'zstd' (requiere zstandard)
+            nivel (int/None): Nivel de compresión (None = el por defecto)
+            filas_por_bloque (int): Registros por bloque comprimido
 
         Returns:
-            bool: True si se cargó correctamente, False si hubo error
+            dict: registros, bloques, bytes_datos (sin comprimir),
+            bytes_comprimidos, segundos y mb_por_segundo (sin comprimir)
+
+        Raises:
+            DatosInvalidos: Si el formato o la compresión no son válidos
+            ErrorRegistro: Si no se pudo escribir el archivo
+        """
+        inicio = time.perf_counter()
+        temporal = ruta + '.tmp'
+        try:
+            # Los almacenes en archivo se recorren bajo el cerrojo; con el
+            # diccionario basta una copia de las referencias (los registros
+            # publicados no cambian), así los escritores no esperan
+            with self._lectura():
+                with self._cerrojo:
+                    ultimo_id = self.ultimo_id
+                    registros = self._por_id.values()
+                    if type(self._por_id) is dict:
+                        registros = list(registros)
+                with open(temporal, 'wb') as file:
+                    resumen = escribir_respaldo(file, map(fila_de_registro, registros),
+                                                ultimo_id, formato, compresion, nivel,
+                                                filas_por_bloque)
+            os.replace(temporal, ruta)
+        except ValueError as e:
+            raise DatosInvalidos(str(e)) from e
+        except OSError as e:
+            raise ErrorRegistro(f"No se pudo escribir el respaldo {ruta}: {e}") from e
+        finally:
+            if os.path.exists(temporal):
+                os.remove(temporal)  # No deja temporales a medias
+        return con_velocidad(resumen, time.perf_counter() - inicio)
+
+    def _restaurar(self, ruta):
+        """
+        Reemplaza todos los registros por los de un respaldo y escribe una
+        instantánea con ellos (ver cargar_datos).
         """
+        inicio = time.perf_counter()
+        # Se lee y verifica el respaldo completo (incluido su cierre) antes de
+        # tocar nada: uno dañado o truncado no reemplaza ningún registro
+        registros = []
+        ultimo_id = 0
         try:
-            if not os.path.exists('registros.csv'):
-                return True  # No hay archivo para cargar
+            with open(ruta, 'rb') as file, sin_recolector():
+                lector = LectorRespaldo(file)
+                for fila in lector.leer_filas():
+                    if fila[0] == 'ultimo_id':
+                        ultimo_id = int(fila[1])
+                        continue
+                    registro = registro_de_fila(fila)
+                    if registro is not None:
+                        registros.append(registro)
+                        ultimo_id = max(ultimo_id, registro.id)
+        except (OSError, ValueError, IndexError, csv.Error) as e:
+            raise ErrorRegistro(f"No se pudo leer el respaldo {ruta}: {e}") from e
+
+        with self._cerrojo, sin_recolector():
+            if isinstance(self._por_id, AlmacenSQLite):
+                # La base de datos es el almacén: se vacía y se llena en ella
+                for id in list(self._por_id):
+                    del self._por_id[id]
+            else:
+                # Los almacenes sobre archivos se vuelven a abrir al compactar
+                self._por_id = AlmacenColumnar() if self.modo_almacen == 'columnar' else {}
+            self._por_id.update((registro.id, registro) for registro in registros)
+            self._reconstruir_indices()
+            self._indices_listos = True  # Después de llenarlos (ver _asegurar_indices)
+            self._generacion += 1  # Las búsquedas guardadas ya no valen
+            # No se reutilizan IDs entregados después del respaldo
+            self.ultimo_id = max(self.ultimo_id, ultimo_id)
+            self.compactar()
+        return con_velocidad(dict(lector.resumen(), registros=len(registros),
+                                  ultimo_id=self.ultimo_id),
+                             time.perf_counter() - inicio)
+
+    def _cargar_fragmentos(self, fragmentos):
+        """
+        Agrega los registros leídos en paralelo y combina los índices que
+        cada proceso ya construyó para su fragmento, en lugar de indexar
+        registro por registro.
 
-            # Abre el archivo CSV en modo lectura
-            with open('registros.csv', 'r', encoding='utf-8') as file:
-                reader = csv.reader(file, delimiter=';')  # Crea un lector CSV
+        Args:
+            fragmentos (iterable): Pares (registros, índices) en el orden
+                del archivo (ver BackendAlmacenamiento.leer_fragmentos)
+        """
+        leidos = 0
+        for registros, (nombres, campos, correos) in fragmentos:
+            self._por_id.update((registro.id, registro) for registro in registros)
+            leidos += len(registros)
+            if self._indice_nombres is not None:
+                self._indice_nombres.combinar(nombres)
+            if self._indice_campos is not None:
+                self._indice_campos.combinar(campos)
+            self._indice_correos.combinar(correos)
+        if len(self._por_id) != leidos:
+            # Algún ID aparece en varias filas: queda la última, pero los
+            # índices de los fragmentos también tienen las reemplazadas
+            self._reconstruir_indices()
+
+    def _reconstruir_indices(self):
+        """
+        Vuelve a construir los índices secundarios con una pasada sobre
+        los registros.
+        """
+        self._indice_nombres = None  # Se volverán a construir al usarlos
+        self._indice_difuso = None
+        self._publicar_indices()
+        self._cache_consultas.vaciar()
+        self._cache_info.vaciar()
 
-                for row in reader:
-                    if not row:  # Salta filas vacías
-                        continue
+    def cargar_datos(self, respaldo=None):
+        """
+        Carga los registros desde el backend al iniciar el sistema y
+        reproduce encima los cambios posteriores a la última instantánea.
 
-                    # Procesa registros de estudiantes
-                    if row[0] == 'estudiante':
-                        try:
-                            estudiante = Estudiante(
-                                int(row[1]),  # ID
-                                row[2],  # Nombre
-                                row[3],  # Correo
-                                row[4],  # Carrera
-                                int(row[5]))  # Año
-                            self.registros.append(estudiante)
-                        except (IndexError, ValueError):
-                            continue  # Salta filas corruptas
-                    # Procesa registros de docentes
-                    elif row[0] == 'docente':
-                        try:
-                            docente = Docente(
-                                int(row[1]),  # ID
-                                row[2],  # Nombre
-                                row[3],  # Correo
-                                row[4],  # Departamento
-                                row[5])  # Título
-                            self.registros.append(docente)
-                        except (IndexError, ValueError):
-                            continue  # Salta filas corruptas
+        Con `respaldo`, en cambio, restaura un respaldo de exportar_respaldo:
+        todos los registros se reemplazan por los del respaldo y se escribe
+        enseguida una instantánea (que también vacía el journal). El último
+        ID no retrocede, para no volver a entregar IDs ya usados.
 
-                    # Actualiza el último ID usado
-                    if int(row[1]) > self.ultimo_id:
-                        self.ultimo_id = int(row[1])
-
-            # Carga el último ID guardado (si existe)
-            if os.path.exists('ultimo_id.txt'):
-                with open('ultimo_id.txt', 'r', encoding='utf-8') as file:
-                    try:
-                        self.ultimo_id = max(self.ultimo_id, int(file.read()))
-                    except ValueError:
-                        pass  # Si el archivo está corrupto, mantiene el valor actual
-
-            print("\n📂 Datos cargados exitosamente!")
-            return True
+        Args:
+            respaldo (str/None): Archivo de respaldo a restaurar
+
+        Returns:
+            dict/None: Al restaurar, el resumen de la lectura: formato,
+            compresion, bloques, bytes_datos, bytes_comprimidos, registros,
+            ultimo_id, segundos y mb_por_segundo (sin comprimir)
+
+        Raises:
+            ErrorRegistro: Si los archivos no se pudieron leer (o el
+                respaldo está dañado) o no se pudo escribir la instantánea
+        """
+        if respaldo is not None:
+            return self._restaurar(respaldo)
+        try:
+            with self._cerrojo, sin_recolector():
+                almacen = self._backend.abrir_almacen()
+                if almacen is not None:
+                    # Los registros se leerán del backend al accederlos
+                    self._por_id = almacen
+                    self._indices_listos = False
+                else:
+                    # Los fragmentos leídos en paralelo solo se combinan
+                    # sobre un registro vacío
+                    fragmentos = None
+                    if not self._por_id:
+                        fragmentos = self._backend.leer_fragmentos(
+                            self._indice_nombres is not None, self._indice_campos is not None)
+                    if fragmentos is not None:
+                        self._cargar_fragmentos(fragmentos)
+                    else:
+                        for registro in self._backend.leer_registros():
+                            self._insertar(registro)
+                self.ultimo_id = max(self.ultimo_id, self._backend.ultimo_id)
+
+                # Reproduce los cambios posteriores a la última instantánea
+                for operacion, dato in self._backend.cambios_pendientes():
+                    if operacion == 'baja':
+                        registro = self._por_id.get(dato)
+                        if registro is not None:
+                            self._quitar(registro)
+                    else:
+                        self._insertar(dato)
+                        self.ultimo_id = max(self.ultimo_id, dato.id)
+                self._marcar_guardado()  # Lo cargado ya está en disco
         except Exception as e:
-            print(f"\n❌ Error al cargar datos: {str(e)}")
-            return False
+            raise ErrorRegistro(f"No se pudieron cargar los datos: {e}") from e
 
 
 # FUNCIONES PARA LA INTERFAZ DE USUARIO
@@ -436,20 +3359,353 @@ def mostrar_menu():
     print("\n1. Agregar estudiante")
     print("2. Agregar docente")
     print("3. Mostrar todos los registros")
-    print("4. Buscar por ID")
+    print("4. Buscar por ID o correo")
     print("5. Buscar por nombre")
     print("6. Modificar registro")
     print("7. Eliminar registro")
     print("8. Guardar datos")
-    print("9. Salir")
-    return input("\nSeleccione una opción (1-9): ").strip()
+    print("9. Métricas de rendimiento")
+    print("0. Salir")
+    return input("\nSeleccione una opción (0-9): ").strip()
 
 
 def limpiar_pantalla():
     """
     Limpia la pantalla de la consola según el sistema operativo.
+    En terminales ANSI usa la secuencia de escape en lugar de lanzar
+    un proceso 'clear' en cada vuelta del menú.
+    """
+    if os.name == 'nt':
+        os.system('cls')
+    else:
+        print('\033[H\033[2J', end='', flush=True)
+
+
+def mostrar_titulo(titulo):
+    """
+    Muestra el encabezado de una opción del menú.
+    """
+    print("\n" + "=" * 40)
+    print(titulo.center(40))
+    print("=" * 40)
+
+
+TAMANO_PAGINA = 50  # Registros por página en el listado por pantalla
+AUTOGUARDADO_SEGUNDOS = 30  # El menú guarda solo los cambios a los 30 s...
+AUTOGUARDADO_CAMBIOS = 100  # ... o al acumular 100 registros modificados
+
+
+def escribir_listado(registros, salida=None, bloque=1000):
+    """
+    Escribe la información de muchos registros juntando las líneas en
+    bloques: una escritura por bloque en lugar de un print por registro.
+
+    Args:
+        registros (iterable): Registros a escribir
+        salida (file/None): Archivo de texto de destino (por defecto stdout)
+        bloque (int): Registros por escritura
+
+    Returns:
+        int: Número de registros escritos
+    """
+    salida = salida if salida is not None else sys.stdout
+    registros = iter(registros)
+    total = 0
+    while True:
+        lineas = [registro.mostrar_info() for registro in islice(registros, bloque)]
+        if not lineas:
+            return total
+        lineas.append('')  # Para terminar la última línea con salto
+        salida.write('\n'.join(lineas))
+        total += len(lineas) - 1
+
+
+def guardar_listado(registros, ruta):
+    """
+    Escribe el listado en un archivo de texto con un búfer grande.
+
+    Returns:
+        int: Número de registros escritos
     """
-    os.system('cls' if os.name == 'nt' else 'clear')
+    with open(ruta, 'w', encoding='utf-8', buffering=1 << 20) as file:
+        return escribir_listado(registros, file)
+
+
+def mostrar_todos(sistema):
+    """
+    Muestra todos los registros, ordenados y por páginas, o los guarda en
+    un archivo de texto.
+    """
+    orden = input(f"Ordenar por ({', '.join(sistema.ORDENES)}) [id]: ").strip().lower() or 'id'
+    registros = sistema.listar(orden)  # Ordena una sola vez para todas las páginas
+    if not registros:  # Verifica si no hay registros
+        print("\nℹ️ No hay registros en el sistema.")
+        return
+
+    ruta = input("Archivo de salida (Enter para mostrar en pantalla): ").strip()
+    if ruta:
+        try:
+            total = guardar_listado(registros, ruta)
+        except OSError as e:
+            raise ErrorRegistro(f"No se pudo escribir {ruta}: {e}") from e
+        print(f"\n💾 {total} registros escritos en {ruta}")
+        return
+
+    paginas = (len(registros) + TAMANO_PAGINA - 1) // TAMANO_PAGINA
+    for pagina in range(paginas):
+        inicio = pagina * TAMANO_PAGINA
+        print(f"\n=== LISTA DE REGISTROS (página {pagina + 1} de {paginas}) ===")
+        escribir_listado(registros[inicio:inicio + TAMANO_PAGINA])
+        if pagina + 1 < paginas:
+            if input("\nEnter: página siguiente, q: volver al menú ").strip().lower() == 'q':
+                break
+
+
+def mostrar_encontrados(registros, sistema=None, nombre=None):
+    """
+    Muestra el resultado de una búsqueda por nombre. Si no hay
+    coincidencias exactas, sugiere los nombres más parecidos.
+    """
+    if not registros:  # Si no encontró coincidencias
+        print("\nℹ️ No se encontraron registros con ese nombre.")
+        similares = sistema.buscar_aproximado(nombre) if sistema is not None else []
+        if similares:
+            print("\n🔎 ¿Quiso decir alguno de estos?")
+            for registro, puntuacion in similares:
+                print(f"{puntuacion:>5.0%}  {sistema.info_registro(registro)}")
+        return
+    print(f"\n🔍 Se encontraron {len(registros)} registros:")
+    for registro in registros:
+        print(sistema.info_registro(registro) if sistema is not None else registro.mostrar_info())
+
+
+def pedir_cambios(registro):
+    """
+    Pide por consola los nuevos datos de un registro.
+
+    Args:
+        registro (Persona): Registro a modificar
+
+    Returns:
+        dict: Campos con valor nuevo (los que se dejaron en blanco no cambian)
+    """
+    print("\n✏️ Ingrese los nuevos datos (deje en blanco para mantener el valor actual):")
+    campos = {}
+    # Campos específicos para Estudiantes
+    if isinstance(registro, Estudiante):
+        campos['carrera'] = input(f"Carrera [{registro.carrera}]: ")
+        anio = input(f"Año [{registro.anio}]: ")
+        try:
+            campos['anio'] = str(int(anio)) if anio.strip() else ''
+        except ValueError:
+            print("❌ El año debe ser un número. Se mantendrá el valor actual.")
+    # Campos específicos para Docentes
+    elif isinstance(registro, Docente):
+        campos['departamento'] = input(f"Departamento [{registro.departamento}]: ")
+        campos['titulo'] = input(f"Título [{registro.titulo}]: ")
+    # Campos comunes a todos
+    campos['nombre'] = input(f"Nombre [{registro.nombre}]: ")
+    campos['correo'] = input(f"Correo [{registro.correo}]: ")
+    return {campo: valor for campo, valor in campos.items() if valor.strip()}
+
+
+def guardar(sistema):
+    """
+    Guarda los datos e informa el resultado.
+    """
+    if sistema.guardar_datos():
+        print("\n💾 Datos guardados exitosamente!")
+    elif sistema.cambios_en_journal:
+        print(f"\n💾 {sistema.cambios_en_journal} cambios ya registrados en el journal.")
+    else:
+        print("\nℹ️ No hay cambios sin guardar.")
+
+
+def mostrar_metricas(sistema):
+    """
+    Muestra las métricas de rendimiento (y los perfiles capturados) y
+    permite activarlas, reiniciarlas, perfilar una operación con cProfile,
+    guardarlas en JSON o desactivarlas.
+    """
+    mostrar_titulo("MÉTRICAS DE RENDIMIENTO")
+    metricas = sistema.metricas
+    if metricas is None:
+        print("\nℹ️ Las métricas están desactivadas.")
+        if input("¿Activarlas ahora? (s/n): ").strip().lower() == 's':
+            sistema.activar_metricas()
+            print("\n✅ Métricas activadas: se registran las operaciones desde ahora.")
+        return
+
+    print("\n" + formatear_instantanea(metricas.instantanea()))
+    for nombre, cache in sistema.estadisticas_cache().items():
+        print(f"🗃️ Caché de {nombre}: {cache['aciertos']} aciertos, {cache['fallos']} fallos "
+              f"({cache['tasa_aciertos']:.0%}), {cache['entradas']}/{cache['capacidad']} entradas")
+    for operacion in metricas.perfiles():
+        print(f"\n=== PERFIL DE {operacion} ===")
+        print(metricas.informe_perfil(operacion, limite=15))
+    if metricas.perfiladas():
+        print(f"🔬 Perfilando: {', '.join(metricas.perfiladas())}")
+
+    print("\nr: reiniciar  p: perfilar una operación  g: guardar en JSON  d: desactivar")
+    accion = input("Acción (Enter para volver): ").strip().lower()
+    if accion == 'r':
+        metricas.reiniciar()
+        print("\n✅ Métricas reiniciadas.")
+    elif accion == 'p':
+        operacion = input("Operación (p. ej. guardar_datos): ").strip()
+        if operacion in metricas.perfiladas() or operacion in metricas.perfiles():
+            metricas.descartar_perfil(operacion)
+            print(f"\nℹ️ Se dejó de perfilar {operacion}.")
+        elif operacion.startswith('_') or not callable(getattr(type(sistema), operacion, None)):
+            raise DatosInvalidos(f"Operación desconocida: {operacion}")
+        else:
+            metricas.perfilar(operacion)
+            print(f"\n🔬 Las próximas llamadas a {operacion} se perfilarán con cProfile.")
+    elif accion == 'g':
+        ruta = input("Archivo de salida [metricas.json]: ").strip() or 'metricas.json'
+        try:
+            with open(ruta, 'w', encoding='utf-8') as file:
+                json.dump(metricas.instantanea(), file, ensure_ascii=False, indent=2)
+        except OSError as e:
+            raise ErrorRegistro(f"No se pudo escribir {ruta}: {e}") from e
+        print(f"\n💾 Métricas guardadas en {ruta}")
+    elif accion == 'd':
+        sistema.desactivar_metricas()
+        print("\nℹ️ Métricas desactivadas.")
+
+
+def atender_opcion(sistema, opcion):
+    """
+    Ejecuta una opción del menú (1-9) pidiendo los datos necesarios.
+
+    Raises:
+        ErrorRegistro: Si el sistema rechaza la operación
+    """
+    # Opción 1: Agregar estudiante
+    if opcion == '1':
+        mostrar_titulo("AGREGAR ESTUDIANTE")
+        nombre = input("\nNombre: ").strip()
+        correo = input("Correo: ").strip()
+        carrera = input("Carrera: ").strip()
+        anio = input("Año: ").strip()
+        sistema.agregar_estudiante(nombre, correo, carrera, anio)
+        print("\n✅ Estudiante agregado exitosamente!")
+
+    # Opción 2: Agregar docente
+    elif opcion == '2':
+        mostrar_titulo("AGREGAR DOCENTE")
+        nombre = input("\nNombre: ").strip()
+        correo = input("Correo: ").strip()
+        departamento = input("Departamento: ").strip()
+        titulo = input("Título: ").strip()
+        sistema.agregar_docente(nombre, correo, departamento, titulo)
+        print("\n✅ Docente agregado exitosamente!")
+
+    # Opción 3: Mostrar todos los registros
+    elif opcion == '3':
+        mostrar_todos(sistema)
+
+    # Opción 4: Buscar por ID o correo
+    elif opcion == '4':
+        mostrar_titulo("BUSCAR POR ID O CORREO")
+        dato = input("\nIngrese el ID o el correo a buscar: ").strip()
+        if '@' in dato:
+            registro = sistema.buscar_por_correo(dato)
+        else:
+            registro = sistema.buscar_por_id(dato)
+        print("\n🔍 Registro encontrado:")
+        print(sistema.info_registro(registro))
+
+    # Opción 5: Buscar por nombre
+    elif opcion == '5':
+        mostrar_titulo("BUSCAR POR NOMBRE")
+        nombre = input("\nIngrese el nombre a buscar: ").strip()
+        mostrar_encontrados(sistema.buscar_por_nombre(nombre), sistema, nombre)
+
+    # Opción 6: Modificar registro
+    elif opcion == '6':
+        mostrar_titulo("MODIFICAR REGISTRO")
+        registro = sistema.buscar_por_id(
+            input("\nIngrese el ID del registro a modificar: ").strip())
+        print("\n🔍 Registro encontrado:")
+        print(sistema.info_registro(registro))
+        campos = pedir_cambios(registro)
+        if campos:
+            sistema.modificar_registro(registro.id, **campos)
+            print("\n✅ Registro modificado exitosamente!")
+        else:
+            print("\nℹ️ No se modificó ningún campo.")
+
+    # Opción 7: Eliminar registro
+    elif opcion == '7':
+        mostrar_titulo("ELIMINAR REGISTRO")
+        registro = sistema.buscar_por_id(
+            input("\nIngrese el ID del registro a eliminar: ").strip())
+        print("\n🔍 Registro encontrado:")
+        print(sistema.info_registro(registro))
+        # Pide confirmación antes de eliminar
+        confirmacion = input("\n¿Está seguro que desea eliminar este registro? (s/n): ").lower()
+        if confirmacion == 's':
+            sistema.eliminar_registro(registro.id)
+            print("\n✅ Registro eliminado exitosamente!")
+        else:
+            print("\n❌ Eliminación cancelada")
+
+    # Opción 8: Guardar datos
+    elif opcion == '8':
+        guardar(sistema)
+
+    # Opción 9: Métricas de rendimiento
+    elif opcion == '9':
+        mostrar_metricas(sistema)
+
+    # Opción no válida
+    else:
+        print("\n❌ Opción no válida. Intente nuevamente.")
+
+
+def salir(sistema):
+    """
+    Pregunta cómo salir del sistema.
+
+    Returns:
+        bool: True si hay que terminar el programa
+    """
+    mostrar_titulo("SALIR DEL SISTEMA")
+    pendientes = sistema.cambios_sin_guardar
+    print("\nOpciones de salida:")
+    print("1. Guardar y salir")
+    if sistema._autoguardado is not None:
+        # Lo anterior ya lo escribió el guardado automático: solo se descarta lo último
+        print(f"2. Salir sin guardar (se pierden los {pendientes} cambios posteriores "
+              "al último guardado automático)")
+    else:
+        print(f"2. Salir sin guardar (se pierden los {pendientes} cambios desde el último guardado)")
+    print("3. Cancelar y volver al menú")
+
+    confirmacion = input("\nSeleccione una opción (1-3): ").strip()
+
+    if confirmacion == '1':
+        try:
+            guardar(sistema)
+        except ErrorRegistro as e:
+            print(f"\n❌ Error: {e}")
+            input("\nPresione Enter para continuar...")
+            return False  # No se pierden los cambios: se vuelve al menú
+        sistema.cerrar()
+        print("\n✅ ¡Datos guardados correctamente! Saliendo del sistema...")
+        return True
+    elif confirmacion == '2':
+        pendientes = sistema.cambios_sin_guardar  # Pudo guardarse algo mientras se elegía
+        sistema.cerrar(guardar=False)
+        print(f"\nℹ️ Saliendo sin guardar {pendientes} cambios pendientes...")
+        return True
+    elif confirmacion == '3':
+        return False
+    else:
+        print("\n❌ Opción no válida. Volviendo al menú principal...")
+        input("\nPresione Enter para continuar...")
+        return False
 
 
 # FUNCIÓN PRINCIPAL
@@ -457,118 +3713,47 @@ def main():
     """
     Función principal que maneja el flujo del programa.
     """
-    sistema = RegistroAcademico()  # Crea una instancia del sistema
+    try:
+        # Crea una instancia del sistema que guarda sola los cambios en segundo plano
+        sistema = RegistroAcademico(autoguardado=AUTOGUARDADO_SEGUNDOS,
+                                    cambios_autoguardado=AUTOGUARDADO_CAMBIOS)
+    except ErrorRegistro as e:
+        print(f"\n❌ Error: {e}")
+        return
+    print("\n📂 Datos cargados exitosamente!")
+
+    # Correos repetidos en datos guardados antes de exigir correos únicos
+    duplicados = sistema.correos_duplicados()
+    if duplicados:
+        print(f"\n⚠️ {len(duplicados)} correos están repetidos en los registros:")
+        for correo, ids in list(duplicados.items())[:10]:
+            print(f"   {correo}: IDs {', '.join(map(str, ids))}")
+        if len(duplicados) > 10:
+            print(f"   ... y {len(duplicados) - 10} más")
+        input("\nPresione Enter para continuar...")
 
     while True:  # Bucle principal
         limpiar_pantalla()
+        if sistema.error_autoguardado is not None:
+            print(f"⚠️ Falló el guardado automático: {sistema.error_autoguardado}")
+        else:
+            print(f"💾 Guardado automático activo: cada {AUTOGUARDADO_SEGUNDOS} s o "
+                  f"{AUTOGUARDADO_CAMBIOS} cambios ({sistema.cambios_sin_guardar} pendientes)")
         opcion = mostrar_menu()  # Muestra el menú y obtiene la opción
+        limpiar_pantalla()
 
-        # Opción 1: Agregar estudiante
-        if opcion == '1':
-            limpiar_pantalla()
-            print("\n" + "=" * 40)
-            print("AGREGAR ESTUDIANTE".center(40))
-            print("=" * 40)
-            nombre = input("\nNombre: ").strip()
-            correo = input("Correo: ").strip()
-            carrera = input("Carrera: ").strip()
-            anio = input("Año: ").strip()
-
-            if not all([nombre, correo, carrera, anio]):
-                print("\n❌ Error: Todos los campos son obligatorios")
-            else:
-                sistema.agregar_estudiante(nombre, correo, carrera, anio)
-
-        # Opción 2: Agregar docente
-        elif opcion == '2':
-            limpiar_pantalla()
-            print("\n" + "=" * 40)
-            print("AGREGAR DOCENTE".center(40))
-            print("=" * 40)
-            nombre = input("\nNombre: ").strip()
-            correo = input("Correo: ").strip()
-            departamento = input("Departamento: ").strip()
-            titulo = input("Título: ").strip()
-
-            if not all([nombre, correo, departamento, titulo]):
-                print("\n❌ Error: Todos los campos son obligatorios")
-            else:
-                sistema.agregar_docente(nombre, correo, departamento, titulo)
-
-        # Opción 3: Mostrar todos los registros
-        elif opcion == '3':
-            limpiar_pantalla()
-            sistema.mostrar_todos()
-
-        # Opción 4: Buscar por ID
-        elif opcion == '4':
-            limpiar_pantalla()
-            print("\n" + "=" * 40)
-            print("BUSCAR POR ID".center(40))
-            print("=" * 40)
-            id = input("\nIngrese el ID a buscar: ").strip()
-            sistema.buscar_por_id(id)
-
-        # Opción 5: Buscar por nombre
-        elif opcion == '5':
-            limpiar_pantalla()
-            print("\n" + "=" * 40)
-            print("BUSCAR POR NOMBRE".center(40))
-            print("=" * 40)
-            nombre = input("\nIngrese el nombre a buscar: ").strip()
-            sistema.buscar_por_nombre(nombre)
-
-        # Opción 6: Modificar registro
-        elif opcion == '6':
-            limpiar_pantalla()
-            print("\n" + "=" * 40)
-            print("MODIFICAR REGISTRO".center(40))
-            print("=" * 40)
-            id = input("\nIngrese el ID del registro a modificar: ").strip()
-            sistema.modificar_registro(id)
-
-        # Opción 7: Eliminar registro
-        elif opcion == '7':
-            limpiar_pantalla()
-            print("\n" + "=" * 40)
-            print("ELIMINAR REGISTRO".center(40))
-            print("=" * 40)
-            id = input("\nIngrese el ID del registro a eliminar: ").strip()
-            sistema.eliminar_registro(id)
-
-        # Opción 8: Guardar datos
-        elif opcion == '8':
-            limpiar_pantalla()
-            sistema.guardar_datos()
-
-        # Opción 9: Salir del sistema
-        elif opcion == '9':
-            limpiar_pantalla()
-            print("\n" + "=" * 40)
-            print("SALIR DEL SISTEMA".center(40))
-            print("=" * 40)
-            print("\nOpciones de salida:")
-            print("1. Guardar y salir")
-            print("2. Salir sin guardar")
-            print("3. Cancelar y volver al menú")
-
-            confirmacion = input("\nSeleccione una opción (1-3): ").strip()
-
-            if confirmacion == '1':
-                sistema.guardar_datos()
-                print("\n✅ ¡Datos guardados correctamente! Saliendo del sistema...")
-                break
-            elif confirmacion == '2':
-                print("\nℹ️ Saliendo sin guardar cambios...")
+        # Opción 0: Salir del sistema
+        if opcion == '0':
+            if salir(sistema):
                 break
-            elif confirmacion == '3':
-                continue
-            else:
-                print("\n❌ Opción no válida. Volviendo al menú principal...")
+            continue
 
-        # Opción no válida
-        else:
-            print("\n❌ Opción no válida. Intente nuevamente.")
+        try:
+            atender_opcion(sistema, opcion)
+        except RegistroNoEncontrado as e:
+            print(f"\nℹ️ {e}.")
+        except ErrorRegistro as e:
+            print(f"\n❌ Error: {e}")
 
         input("\nPresione Enter para continuar...")
 
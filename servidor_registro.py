@@ -0,0 +1,457 @@
+"""
+Servidor HTTP/JSON del registro académico
+=========================================
+Expone las operaciones de RegistroAcademico como una API JSON local,
+implementada sobre asyncio (solo biblioteca estándar). Un único bucle de
+eventos atiende muchas conexiones a la vez con keep-alive de HTTP/1.1.
+Todas las operaciones sobre el registro se ejecutan en el grupo de hilos
+del bucle, nunca en el bucle mismo: ni un guardado con fsync ni una
+lectura que espera el cerrojo de RegistroAcademico (modos distintos de
+'objetos') ni un listado grande ordenado detienen las demás conexiones.
+Las escrituras van además de a una, en orden de llegada, bajo un
+asyncio.Lock.
+
+Rutas:
+    GET    /registros?offset=0&limite=50   Lista paginada (orden de ID)
+    GET    /registros?orden=nombre          Lista ordenada por nombre, anio o carrera
+    GET    /registros?nombre=perez          Búsqueda por nombre (paginada)
+    GET    /registros?carrera=Sistemas&anio=2023   Filtro por campos
+    GET    /registros/<id>                  Un registro
+    GET    /similares?nombre=gonzales&limite=10   Búsqueda aproximada, del más
+                                            parecido al menos parecido
+    GET    /conteos/<campo>?carrera=Sistemas   Registros por valor de tipo, carrera,
+                                            anio, departamento o titulo
+    POST   /registros                       Alta: {"tipo": "estudiante", "nombre": ...}
+    PATCH  /registros/<id>                  Modifica los campos enviados
+    DELETE /registros/<id>                  Baja sin confirmación
+    POST   /guardar                         Guarda los datos (guardar_datos)
+    GET    /metricas                        Métricas de rendimiento (con --metricas)
+    POST   /metricas/reiniciar              Vacía las métricas acumuladas
+    GET    /cache                           Aciertos y fallos de las cachés de
+                                            búsquedas y de textos
+
+Los datos inválidos responden 400, un ID inexistente 404 y un correo que
+ya pertenece a otro registro 409.
+
+Uso:
+    python servidor_registro.py --puerto 8080
+    python servidor_registro.py --metricas --perfilar guardar_datos
+    python servidor_registro.py --autoguardado 30 --cambios-autoguardado 500
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import re
+import signal
+from urllib.parse import parse_qsl, urlsplit
+
+from importacion import texto_de_campo
+from registro_academico import (BackendSQLite, CorreoDuplicado, DatosInvalidos,
+                                ErrorRegistro, RegistroAcademico, RegistroNoEncontrado,
+                                clave_orden, diccionario_de_registro)
+
+LIMITE_POR_DEFECTO = 50
+LIMITE_MAXIMO = 1000
+MAXIMO_CUERPO = 1 << 20  # 1 MiB por petición
+ESPERA_KEEP_ALIVE = 15  # Segundos que se mantiene abierta una conexión inactiva
+RUTA_REGISTRO = re.compile(r'^/registros/(\d+)$')
+RUTA_CONTEOS = re.compile(r'^/conteos/(\w+)$')
+CAMPOS_ALTA = {
+    'estudiante': ('nombre', 'correo', 'carrera', 'anio'),
+    'docente': ('nombre', 'correo', 'departamento', 'titulo'),
+}
+RAZONES = {200: 'OK', 201: 'Created', 400: 'Bad Request', 404: 'Not Found',
+           405: 'Method Not Allowed', 409: 'Conflict', 413: 'Payload Too Large',
+           500: 'Internal Server Error'}
+
+
+class ErrorHTTP(Exception):
+    """
+    Error que se responde al cliente con un código de estado y un mensaje.
+    """
+
+    def __init__(self, estado, mensaje):
+        super().__init__(mensaje)
+        self.estado = estado
+
+
+def leer_paginacion(consulta):
+    """
+    Lee y valida offset, limite y orden de los parámetros de la URL.
+
+    Returns:
+        tuple: (offset, limite, orden)
+    """
+    try:
+        offset = int(consulta.get('offset', 0))
+        limite = int(consulta.get('limite', LIMITE_POR_DEFECTO))
+    except ValueError:
+        raise ErrorHTTP(400, "offset y limite deben ser números enteros")
+    if offset < 0 or not 0 < limite <= LIMITE_MAXIMO:
+        raise ErrorHTTP(400, f"offset debe ser >= 0 y limite entre 1 y {LIMITE_MAXIMO}")
+    orden = consulta.get('orden', 'id')
+    if orden not in RegistroAcademico.ORDENES:
+        raise ErrorHTTP(400, f"orden debe ser uno de: {', '.join(RegistroAcademico.ORDENES)}")
+    return offset, limite, orden
+
+
+def leer_criterios(consulta):
+    """
+    Extrae de los parámetros de la URL los campos de FILTRABLES (con el
+    año convertido a entero).
+
+    Returns:
+        dict: Campo -> valor
+    """
+    criterios = {campo: valor for campo, valor in consulta.items()
+                 if campo in RegistroAcademico.FILTRABLES}
+    if 'anio' in criterios:
+        try:
+            criterios['anio'] = int(criterios['anio'])
+        except ValueError:
+            raise ErrorHTTP(400, "anio debe ser un número entero")
+    return criterios
+
+
+class ServidorRegistro:
+    """
+    Atiende peticiones HTTP sobre un RegistroAcademico ya cargado.
+    """
+
+    def __init__(self, sistema):
+        """
+        Args:
+            sistema (RegistroAcademico): Registro sobre el que se opera
+        """
+        self.sistema = sistema
+        self._escritura = asyncio.Lock()  # Serializa altas, cambios, bajas y guardados
+
+    # PROTOCOLO HTTP
+    async def atender(self, reader, writer):
+        """
+        Atiende una conexión: lee peticiones mientras el cliente la mantenga
+        abierta (keep-alive) y responde cada una en orden.
+        """
+        try:
+            while True:
+                try:
+                    linea = await asyncio.wait_for(reader.readline(), ESPERA_KEEP_ALIVE)
+                except asyncio.TimeoutError:
+                    break  # Conexión inactiva
+                if not linea.strip():
+                    break  # El cliente cerró la conexión
+                metodo, destino, version = linea.decode('latin-1').split()
+                cabeceras = {}
+                while True:
+                    linea = await reader.readline()
+                    if linea in (b'\r\n', b'\n', b''):
+                        break
+                    clave, _, valor = linea.decode('latin-1').partition(':')
+                    cabeceras[clave.strip().lower()] = valor.strip()
+
+                conexion = cabeceras.get('connection', '').lower()
+                mantener = conexion == 'keep-alive' if version == 'HTTP/1.0' else conexion != 'close'
+                largo = int(cabeceras.get('content-length') or 0)
+                if largo > MAXIMO_CUERPO:
+                    estado, datos = 413, {'error': "Cuerpo demasiado grande"}
+                    mantener = False  # No se lee el cuerpo: la conexión queda inservible
+                else:
+                    cuerpo = await reader.readexactly(largo) if largo else b''
+                    estado, datos = await self.despachar(metodo, destino, cuerpo)
+
+                contenido = json.dumps(datos, ensure_ascii=False).encode('utf-8')
+                writer.write(
+                    f"HTTP/1.1 {estado} {RAZONES[estado]}\r\n"
+                    f"Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(contenido)}\r\n"
+                    f"Connection: {'keep-alive' if mantener else 'close'}\r\n\r\n"
+                    .encode('latin-1') + contenido)
+                await writer.drain()
+                if not mantener:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass  # Cliente desconectado o petición mal formada: se cierra la conexión
+        finally:
+            writer.close()
+
+    async def despachar(self, metodo, destino, cuerpo):
+        """
+        Dirige una petición a su manejador.
+
+        Returns:
+            tuple: (código de estado, datos de la respuesta)
+        """
+        url = urlsplit(destino)
+        consulta = dict(parse_qsl(url.query))
+        try:
+            if url.path == '/registros':
+                if metodo == 'GET':
+                    return 200, await self._leer(self.listar, consulta)
+                if metodo == 'POST':
+                    return 201, await self._escribir(self.agregar, self._leer_json(cuerpo))
+                raise ErrorHTTP(405, "Método no permitido")
+
+            coincidencia = RUTA_REGISTRO.match(url.path)
+            if coincidencia:
+                id = int(coincidencia.group(1))
+                if metodo == 'GET':
+                    return 200, await self._leer(self.obtener, id)
+                if metodo == 'PATCH':
+                    return 200, await self._escribir(self.modificar, id, self._leer_json(cuerpo))
+                if metodo == 'DELETE':
+                    return 200, await self._escribir(self.eliminar, id)
+                raise ErrorHTTP(405, "Método no permitido")
+
+            if url.path == '/similares':
+                if metodo != 'GET':
+                    raise ErrorHTTP(405, "Método no permitido")
+                return 200, await self._leer(self.similares, consulta)
+
+            coincidencia = RUTA_CONTEOS.match(url.path)
+            if coincidencia:
+                if metodo != 'GET':
+                    raise ErrorHTTP(405, "Método no permitido")
+                return 200, await self._leer(self.contar, coincidencia.group(1), consulta)
+
+            if url.path == '/guardar':
+                if metodo != 'POST':
+                    raise ErrorHTTP(405, "Método no permitido")
+                return 200, await self._escribir(self.guardar)
+
+            if url.path == '/cache':
+                if metodo != 'GET':
+                    raise ErrorHTTP(405, "Método no permitido")
+                return 200, self.sistema.estadisticas_cache()
+
+            if url.path in ('/metricas', '/metricas/reiniciar'):
+                if self.sistema.metricas is None:
+                    raise ErrorHTTP(404, "Métricas desactivadas (inicie el servidor con --metricas)")
+                if url.path == '/metricas':
+                    if metodo != 'GET':
+                        raise ErrorHTTP(405, "Método no permitido")
+                    return 200, self.sistema.metricas.instantanea()
+                if metodo != 'POST':
+                    raise ErrorHTTP(405, "Método no permitido")
+                self.sistema.metricas.reiniciar()
+                return 200, {'reiniciadas': True}
+
+            raise ErrorHTTP(404, "Ruta no encontrada")
+        except ErrorHTTP as e:
+            return e.estado, {'error': str(e)}
+        except RegistroNoEncontrado as e:
+            return 404, {'error': str(e)}
+        except CorreoDuplicado as e:
+            return 409, {'error': str(e), 'id': e.id}
+        except DatosInvalidos as e:
+            return 400, {'error': str(e)}
+        except Exception as e:  # Incluye ErrorRegistro al guardar
+            return 500, {'error': str(e)}
+
+    async def _leer(self, operacion, *args):
+        """
+        Ejecuta una lectura en el grupo de hilos del bucle, para que la
+        espera del cerrojo del registro o un ordenamiento largo no
+        bloqueen las demás conexiones.
+
+        Returns:
+            El resultado de la operación
+        """
+        return await asyncio.get_running_loop().run_in_executor(None, operacion, *args)
+
+    async def _escribir(self, operacion, *args):
+        """
+        Ejecuta una escritura en el grupo de hilos del bucle. El cerrojo
+        se mantiene hasta que termina, así las escrituras van de a una y en
+        el orden en que llegaron mientras el bucle sigue atendiendo.
+
+        Returns:
+            El resultado de la operación
+        """
+        async with self._escritura:
+            return await asyncio.get_running_loop().run_in_executor(None, operacion, *args)
+
+    @staticmethod
+    def _leer_json(cuerpo):
+        """
+        Decodifica el cuerpo JSON de una petición (debe ser un objeto).
+        """
+        try:
+            datos = json.loads(cuerpo or b'{}')
+        except ValueError:
+            raise ErrorHTTP(400, "El cuerpo no es JSON válido")
+        if not isinstance(datos, dict):
+            raise ErrorHTTP(400, "El cuerpo debe ser un objeto JSON")
+        return datos
+
+    # OPERACIONES
+    def listar(self, consulta):
+        """
+        Lista paginada de registros; con ?nombre= busca por nombre y con
+        campos de FILTRABLES filtra por ellos.
+        """
+        offset, limite, orden = leer_paginacion(consulta)
+        criterios = leer_criterios(consulta)
+        if 'nombre' in consulta or criterios:
+            if 'nombre' in consulta:
+                registros = self.sistema.buscar_por_nombre(consulta['nombre'])
+            else:
+                registros = self.sistema.filtrar(**criterios)
+            total = len(registros)
+            if orden != 'id':  # Los resultados ya vienen en orden de ID
+                registros.sort(key=clave_orden(orden))
+            pagina = registros[offset:offset + limite]
+        else:
+            total = len(self.sistema.registros)
+            pagina = self.sistema.listar(orden, offset, limite)
+        return {'total': total, 'offset': offset, 'limite': limite, 'orden': orden,
+                'registros': [diccionario_de_registro(r) for r in pagina]}
+
+    def similares(self, consulta):
+        """
+        Registros con nombres parecidos a ?nombre=, con su puntuación.
+        """
+        _, limite, _ = leer_paginacion(consulta)
+        if 'limite' not in consulta:
+            limite = 10
+        similares = self.sistema.buscar_aproximado(consulta.get('nombre', ''), limite)
+        return {'total': len(similares),
+                'registros': [dict(diccionario_de_registro(r), puntuacion=round(p, 3))
+                              for r, p in similares]}
+
+    def contar(self, campo, consulta):
+        """
+        Número de registros por cada valor de un campo; los parámetros de
+        FILTRABLES restringen los registros contados.
+        """
+        conteos = self.sistema.contar_por(campo, **leer_criterios(consulta))
+        return {'campo': campo, 'total': sum(conteos.values()),
+                'conteos': [{'valor': valor, 'registros': n} for valor, n in conteos.items()]}
+
+    def obtener(self, id):
+        """
+        Devuelve un registro por ID.
+        """
+        return diccionario_de_registro(self.sistema.buscar_por_id(id))
+
+    def agregar(self, datos):
+        """
+        Agrega un estudiante o docente con los campos del cuerpo.
+        """
+        tipo = datos.get('tipo')
+        if tipo not in CAMPOS_ALTA:
+            raise ErrorHTTP(400, "tipo debe ser 'estudiante' o 'docente'")
+        valores = [texto_de_campo(datos, campo) for campo in CAMPOS_ALTA[tipo]]
+        if tipo == 'estudiante':
+            registro = self.sistema.agregar_estudiante(*valores)
+        else:
+            registro = self.sistema.agregar_docente(*valores)
+        return diccionario_de_registro(registro)
+
+    def modificar(self, id, campos):
+        """
+        Modifica los campos enviados de un registro.
+        """
+        registro = self.sistema.modificar_registro(id, **campos)
+        return diccionario_de_registro(registro)
+
+    def eliminar(self, id):
+        """
+        Elimina un registro sin pedir confirmación.
+        """
+        self.sistema.eliminar_registro(id)
+        return {'id': id, 'eliminado': True}
+
+    def guardar(self):
+        """
+        Guarda los datos a través del backend.
+        """
+        escrito = self.sistema.guardar_datos()
+        return {'guardado': True, 'instantanea': escrito}
+
+
+async def servir(sistema, host, puerto):
+    """
+    Arranca el servidor y atiende peticiones hasta que se interrumpa.
+    """
+    servidor = ServidorRegistro(sistema)
+    red = await asyncio.start_server(servidor.atender, host, puerto)
+    direccion = red.sockets[0].getsockname()
+    print(f"🌐 Servidor escuchando en http://{direccion[0]}:{direccion[1]}", flush=True)
+
+    # Ctrl+C y SIGTERM detienen el servidor guardando lo pendiente
+    detener = asyncio.Event()
+    bucle = asyncio.get_running_loop()
+    for senal in (signal.SIGINT, signal.SIGTERM):
+        with contextlib.suppress(NotImplementedError):  # Windows no los admite
+            bucle.add_signal_handler(senal, detener.set)
+    try:
+        async with red:
+            await detener.wait()
+    finally:
+        if sistema.cambios_sin_guardar:
+            print(f"💾 Guardando {sistema.cambios_sin_guardar} cambios pendientes...")
+            try:
+                servidor.guardar()
+            except (ErrorRegistro, OSError) as e:
+                # No tapa la excepción que detuvo el servidor (si la hubo)
+                print(f"❌ No se pudieron guardar los cambios pendientes: {e}", flush=True)
+
+
+def main():
+    """
+    Carga el registro y lo sirve por HTTP.
+    """
+    parser = argparse.ArgumentParser(description="Servidor HTTP/JSON del registro académico")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--puerto', type=int, default=8080)
+    parser.add_argument('--archivo', default='registros.csv', help="Archivo de registros")
+    parser.add_argument('--modo', choices=RegistroAcademico.MODOS_ALMACEN, default='objetos',
+                        help="Modo de almacenamiento")
+    parser.add_argument('--sqlite', metavar='RUTA', help="Usar una base SQLite como backend")
+    parser.add_argument('--journal', action='store_true', help="Anotar los cambios en el journal")
+    parser.add_argument('--procesos-carga', type=int, default=1, metavar='N',
+                        help="Leer un registros.csv grande con N procesos (0 = todos los núcleos)")
+    parser.add_argument('--autoguardado', type=float, default=None, metavar='SEGUNDOS',
+                        help="Guardar los cambios en segundo plano cada SEGUNDOS")
+    parser.add_argument('--cambios-autoguardado', type=int, default=None, metavar='N',
+                        help="Guardar en segundo plano al acumular N registros modificados")
+    parser.add_argument('--metricas', action='store_true',
+                        help="Medir las operaciones y exponerlas en GET /metricas")
+    parser.add_argument('--perfilar', metavar='OPERACION', action='append', default=[],
+                        help="Perfilar con cProfile un método (p. ej. guardar_datos) e imprimir "
+                             "el informe al detener el servidor; implica --metricas")
+    args = parser.parse_args()
+    if ((args.autoguardado is not None and args.autoguardado <= 0)
+            or (args.cambios_autoguardado is not None and args.cambios_autoguardado < 1)):
+        parser.error("--autoguardado y --cambios-autoguardado deben ser positivos")
+
+    backend = BackendSQLite(args.sqlite) if args.sqlite else None
+    try:
+        sistema = RegistroAcademico(modo_almacen=args.modo, archivo_registros=args.archivo,
+                                    usar_journal=args.journal, backend=backend,
+                                    procesos_carga=args.procesos_carga or None,
+                                    metricas=args.metricas or bool(args.perfilar),
+                                    autoguardado=args.autoguardado,
+                                    cambios_autoguardado=args.cambios_autoguardado)
+    except ErrorRegistro as e:
+        print(f"❌ Error: {e}")
+        return
+    for operacion in args.perfilar:
+        sistema.metricas.perfilar(operacion)
+    try:
+        asyncio.run(servir(sistema, args.host, args.puerto))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sistema.cerrar()
+    print("\nℹ️ Servidor detenido.")
+    if sistema.metricas is not None:
+        for operacion in sistema.metricas.perfiles():
+            print(f"\n=== PERFIL DE {operacion} ===")
+            print(sistema.metricas.informe_perfil(operacion))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+Configuración común de las pruebas: los módulos del registro están en la
+raíz del repositorio y cada prueba trabaja en un directorio temporal
+propio (los archivos por defecto, como ultimo_id.txt, son relativos).
+"""
+
+import os
+import sys
+
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from registro_academico import RegistroAcademico  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def directorio(tmp_path, monkeypatch):
+    """
+    Ejecuta cada prueba dentro de su propio directorio temporal.
+    """
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def poblar(archivo, cantidad, modo_almacen='objetos'):
+    """
+    Crea y guarda un registro con `cantidad` estudiantes numerados.
+
+    Returns:
+        list: Los registros agregados, en orden de ID
+    """
+    sistema = RegistroAcademico(modo_almacen=modo_almacen, archivo_registros=archivo)
+    try:
+        agregados = [sistema.agregar_estudiante(f"Estudiante {i}", f"e{i}@uni.edu",
+                                                'Física' if i % 2 else 'Química', 2020 + i % 4)
+                     for i in range(cantidad)]
+        sistema.guardar_datos()
+    finally:
+        sistema.cerrar()
+    return agregados
@@ -0,0 +1,104 @@
+"""
+Pruebas de los almacenes que leen del disco: el CSV perezoso, el
+formato binario y SQLite.
+"""
+
+import sqlite3
+
+import pytest
+
+import almacen_sqlite
+import formato_binario
+from conftest import poblar
+from registro_academico import BackendSQLite, RegistroAcademico
+
+
+def test_perezoso_omite_filas_corruptas():
+    with open('registros.csv', 'wb') as archivo:
+        archivo.write(b'ultimo_id;3\n'
+                      b'estudiante;1;Ana;a@uni.edu;F\xc3\xadsica;2020\n'
+                      b'estudiante;2;B\xe9a;b@uni.edu;Qu\xedmica;2021\n'  # Latin-1, no UTF-8
+                      b'estudiante;4;Dora;d@uni.edu;F\xc3\xadsica;dos mil\n'
+                      b'docente;3;Ciro;c@uni.edu;Matem\xc3\xa1ticas;Doctor\n')
+    sistema = RegistroAcademico(modo_almacen='perezoso')
+    try:
+        assert [(r.id, r.nombre) for r in sistema.registros] == [(1, 'Ana'), (3, 'Ciro')]
+        assert sistema.buscar_por_id(1).carrera == 'Física'
+        assert sistema.ultimo_id == 3  # Las filas descartadas no lo adelantan
+    finally:
+        sistema.cerrar()
+
+
+def test_sqlite_filtra_correo_sin_distinguir_mayusculas():
+    sistema = RegistroAcademico(backend=BackendSQLite('registros.db'))
+    try:
+        ana = sistema.agregar_estudiante('Ana', 'Ana@Uni.edu', 'Física', 2020)
+        sistema.agregar_estudiante('Beto', 'beto@uni.edu', 'Física', 2021)
+        assert [r.id for r in sistema.filtrar(correo=' ana@UNI.EDU ')] == [ana.id]
+        assert sistema.contar_por('carrera', correo='ANA@uni.edu') == {'Física': 1}
+    finally:
+        sistema.cerrar()
+
+
+def test_sqlite_indexa_nombres_anteriores_al_fts():
+    # Una base creada sin el índice de texto completo (p. ej. con un SQLite sin FTS5)
+    con = sqlite3.connect('registros.db')
+    con.executescript(almacen_sqlite.ESQUEMA)
+    con.execute("INSERT INTO registros (id, tipo, nombre, nombre_norm, correo, carrera, anio) "
+                "VALUES (1, 'estudiante', 'Ana Pérez', 'ana perez', 'ana@uni.edu', 'Física', 2020)")
+    con.commit()
+    con.close()
+
+    sistema = RegistroAcademico(backend=BackendSQLite('registros.db'))
+    try:
+        assert [r.id for r in sistema.buscar_por_nombre('pérez')] == [1]
+    finally:
+        sistema.cerrar()
+
+
+def test_binario_ida_y_vuelta():
+    poblar('registros.csv', 30)
+    assert formato_binario.csv_a_binario('registros.csv', 'registros.bin') == 30
+    sistema = RegistroAcademico(modo_almacen='binario', archivo_registros='registros.bin')
+    try:
+        assert len(sistema.registros) == 30
+        assert sistema.buscar_por_id(7).correo == 'e6@uni.edu'
+        sistema.agregar_docente('Ciro', 'c@uni.edu', 'Matemáticas', 'Doctor')
+        sistema.eliminar_registro(1)
+        sistema.guardar_datos()
+    finally:
+        sistema.cerrar()
+
+    assert formato_binario.binario_a_csv('registros.bin', 'copia.csv') == 30
+    copia = RegistroAcademico(archivo_registros='copia.csv')
+    try:
+        assert copia.ultimo_id == 31
+        assert copia.buscar_por_id(31).departamento == 'Matemáticas'
+        assert [r.id for r in copia.registros] == list(range(2, 32))
+    finally:
+        copia.cerrar()
+
+
+def test_binario_id_repetido_conserva_la_ultima_fila():
+    with open('registros.csv', 'w', encoding='utf-8') as archivo:
+        archivo.write('ultimo_id;5\n'
+                      'estudiante;1;Ana;a@uni.edu;Física;2020\n'
+                      'estudiante;2;Beto;b@uni.edu;Física;2021\n'
+                      'estudiante;1;Ana María;a@uni.edu;Química;2022\n')
+    assert formato_binario.csv_a_binario('registros.csv', 'registros.bin') == 2
+    binario = RegistroAcademico(modo_almacen='binario', archivo_registros='registros.bin')
+    texto = RegistroAcademico(archivo_registros='registros.csv')
+    try:
+        assert binario.ultimo_id == 5
+        for sistema in (binario, texto):
+            assert [(r.id, r.nombre) for r in sistema.registros] == [(1, 'Ana María'), (2, 'Beto')]
+    finally:
+        binario.cerrar()
+        texto.cerrar()
+
+
+def test_binario_rechaza_anio_fuera_de_rango():
+    with open('registros.csv', 'w', encoding='utf-8') as archivo:
+        archivo.write('estudiante;1;Ana;a@uni.edu;Física;99999999999\n')
+    with pytest.raises(ValueError, match='Año fuera de rango'):
+        formato_binario.csv_a_binario('registros.csv', 'registros.bin')
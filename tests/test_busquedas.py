@@ -0,0 +1,63 @@
+"""
+Pruebas de las búsquedas por nombre y de sus índices y cachés.
+"""
+
+import formato_binario
+from conftest import poblar
+from registro_academico import RegistroAcademico
+
+
+def test_indice_de_nombres_se_construye_al_buscar():
+    poblar('registros.csv', 20)
+    sistema = RegistroAcademico()
+    try:
+        assert sistema._indice_nombres is None  # La carga no arma los trigramas
+        assert [r.id for r in sistema.buscar_por_nombre('estudiante 1')] == [2] + list(range(11, 21))
+        assert sistema._indice_nombres is not None
+
+        # Desde entonces se mantiene al día con las altas, cambios y bajas
+        nuevo = sistema.agregar_estudiante('Estudiante 100', 'e100@uni.edu', 'Física', 2024)
+        sistema.modificar_registro(2, nombre='Otra Persona')
+        sistema.eliminar_registro(11)
+        esperados = [r.id for r in sistema.registros if 'estudiante 1' in r.nombre.lower()]
+        assert [r.id for r in sistema.buscar_por_nombre('estudiante 1')] == esperados
+        assert nuevo.id in esperados and 2 not in esperados and 11 not in esperados
+    finally:
+        sistema.cerrar()
+
+
+def test_cache_de_busquedas_solo_descarta_lo_afectado():
+    poblar('registros.csv', 10)
+    sistema = RegistroAcademico()
+    try:
+        assert len(sistema.buscar_por_nombre('estudiante 1')) == 1
+        sistema.agregar_estudiante('Zoe Quispe', 'zoe@uni.edu', 'Física', 2024)  # No coincide
+        aciertos = sistema.estadisticas_cache()['consultas']['aciertos']
+        assert len(sistema.buscar_por_nombre('estudiante 1')) == 1
+        assert sistema.estadisticas_cache()['consultas']['aciertos'] == aciertos + 1
+
+        nuevo = sistema.agregar_estudiante('Estudiante 10', 'e10b@uni.edu', 'Física', 2024)
+        assert [r.id for r in sistema.buscar_por_nombre('estudiante 1')] == [2, nuevo.id]
+        sistema.modificar_registro(2, nombre='Otra Persona')
+        assert [r.id for r in sistema.buscar_por_nombre('estudiante 1')] == [nuevo.id]
+    finally:
+        sistema.cerrar()
+
+
+def test_cache_de_info_con_almacen_binario():
+    poblar('registros.csv', 5)
+    formato_binario.csv_a_binario('registros.csv', 'registros.bin')
+    sistema = RegistroAcademico(modo_almacen='binario', archivo_registros='registros.bin')
+    try:
+        def leer(id):
+            # Cada lectura del almacén binario decodifica un objeto nuevo
+            return next(r for r in sistema.registros if r.id == id)
+
+        texto = sistema.info_registro(leer(3))
+        assert sistema.info_registro(leer(3)) == texto
+        assert sistema.estadisticas_cache()['info']['aciertos'] == 1
+
+        sistema.modificar_registro(3, carrera='Biología')
+        assert 'Biología' in sistema.info_registro(leer(3))
+    finally:
+        sistema.cerrar()
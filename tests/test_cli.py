@@ -0,0 +1,78 @@
+"""
+Pruebas del protocolo de la línea de comandos: una línea JSON por comando.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+from conftest import RAIZ, poblar
+from registro_academico import RegistroAcademico
+
+
+def ejecutar(*argumentos, entrada=None):
+    """
+    Ejecuta cli_registro.py en el directorio actual.
+
+    Returns:
+        tuple: (código de salida, respuestas JSON)
+    """
+    proceso = subprocess.run([sys.executable, os.path.join(RAIZ, 'cli_registro.py'), *argumentos],
+                             input=entrada, capture_output=True, text=True, timeout=60)
+    return proceso.returncode, [json.loads(linea) for linea in proceso.stdout.splitlines()]
+
+
+def test_lote_responde_cada_linea_y_guarda_al_final():
+    poblar('registros.csv', 3)
+    comandos = ('add estudiante "Bea Díaz" bea@uni.edu Física 2022\n'
+                '# comentario\n'
+                '\n'
+                'get 4\n'
+                'add estudiante Otra e1@uni.edu Física 2022\n'
+                'get 99\n'
+                'search "bea díaz\n'
+                'update 1 --anio 2030\n'
+                'delete 2\n'
+                'count carrera\n')
+    codigo, respuestas = ejecutar('--batch', entrada=comandos)
+
+    assert codigo == 1  # Algún comando falló
+    assert [r['linea'] for r in respuestas] == [1, 4, 5, 6, 7, 8, 9, 10]
+    assert [r['ok'] for r in respuestas] == [True, True, False, False, False, True, True, True]
+    alta, consulta, duplicado, inexistente, comillas = respuestas[:5]
+    assert alta['comando'] == 'add' and alta['resultado']['id'] == 4
+    assert consulta['resultado']['nombre'] == 'Bea Díaz'
+    assert duplicado['tipo_error'] == 'CorreoDuplicado'
+    assert inexistente['tipo_error'] == 'RegistroNoEncontrado'
+    assert comillas['comando'] is None and comillas['tipo_error'] == 'ValueError'
+    assert {c['valor']: c['registros'] for c in respuestas[-1]['resultado']} == \
+        {'Física': 1, 'Química': 2}
+
+    sistema = RegistroAcademico()
+    try:
+        assert [(r.id, r.nombre) for r in sistema.registros] == \
+            [(1, 'Estudiante 0'), (3, 'Estudiante 2'), (4, 'Bea Díaz')]
+        assert sistema.buscar_por_id(1).anio == 2030
+    finally:
+        sistema.cerrar()
+
+
+def test_comando_suelto_y_errores_de_uso():
+    codigo, respuestas = ejecutar('add', 'estudiante', 'Ana', 'ana@uni.edu', 'Física', '2020')
+    assert codigo == 0
+    assert respuestas == [{'ok': True, 'comando': 'add',
+                           'resultado': respuestas[0]['resultado']}]
+    assert respuestas[0]['resultado']['id'] == 1
+    assert os.path.exists('registros.csv')
+
+    codigo, respuestas = ejecutar('add', 'estudiante', 'Beto', 'beto@uni.edu', 'Física', 'dos')
+    assert codigo == 1
+    assert respuestas[0]['ok'] is False and respuestas[0]['tipo_error'] == 'DatosInvalidos'
+
+    codigo, respuestas = ejecutar('add', 'profesor', 'Beto', 'beto@uni.edu')
+    assert codigo == 1
+    assert respuestas[0]['ok'] is False and respuestas[0]['tipo_error'] == 'ErrorComando'
+
+    codigo, respuestas = ejecutar('get', '1')
+    assert respuestas[0]['resultado']['correo'] == 'ana@uni.edu'
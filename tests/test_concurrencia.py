@@ -0,0 +1,155 @@
+"""
+Pruebas de estrés: varios hilos escriben y leen el mismo registro a la
+vez, incluida la construcción perezosa de los índices secundarios.
+"""
+
+import sys
+import threading
+from collections import Counter
+
+import pytest
+
+from conftest import poblar
+from registro_academico import CorreoDuplicado, RegistroAcademico, normalizar_correo
+
+HILOS = 8
+ALTAS_POR_HILO = 60
+
+
+def estresar(sistema):
+    """
+    Lanza escritores que compiten por los mismos correos (la mitad de las
+    altas choca con las de otro hilo) y lectores que consultan los índices
+    mientras tanto. Devuelve los errores inesperados de cualquier hilo.
+    """
+    inicio = threading.Barrier(2 * HILOS)
+    errores = []
+
+    def escritor(hilo):
+        inicio.wait()
+        for i in range(ALTAS_POR_HILO):
+            # Los hilos par e impar de cada pareja usan los mismos correos
+            correo = f"c{hilo // 2}-{i}@uni.edu" if i % 2 else f"h{hilo}-{i}@uni.edu"
+            try:
+                registro = sistema.agregar_estudiante(f"Nuevo {hilo} {i}", correo, 'Física', 2024)
+                if i % 5 == 0:
+                    sistema.modificar_registro(registro.id, nombre=f"Cambiado {hilo} {i}")
+            except CorreoDuplicado:
+                pass
+            except Exception as e:  # noqa: BLE001 - se informa en el hilo principal
+                errores.append(e)
+
+    def lector(hilo):
+        inicio.wait()
+        try:
+            for i in range(hilo, hilo + ALTAS_POR_HILO):
+                # Los registros iniciales nunca cambian de correo: un índice
+                # a medio construir los daría por inexistentes
+                id = sistema.correo_registrado(f"e{i}@uni.edu")
+                assert id == i + 1, f"e{i}@uni.edu -> {id}"
+                sistema.buscar_por_nombre("Estudiante 1")
+                sistema.contar_por('carrera')
+        except Exception as e:  # noqa: BLE001
+            errores.append(e)
+
+    intervalo = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # Más cambios de hilo, más intercalaciones
+    hilos = [threading.Thread(target=escritor, args=(h,)) for h in range(HILOS)]
+    hilos += [threading.Thread(target=lector, args=(h,)) for h in range(HILOS)]
+    for hilo in hilos:
+        hilo.start()
+    try:
+        for hilo in hilos:
+            hilo.join()
+    finally:
+        sys.setswitchinterval(intervalo)
+    return errores
+
+
+def comprobar_consistencia(sistema):
+    """
+    IDs y correos únicos, e índices secundarios iguales a los registros.
+    """
+    registros = list(sistema.registros)
+    ids = [r.id for r in registros]
+    assert len(ids) == len(set(ids))
+    correos = Counter(normalizar_correo(r.correo) for r in registros)
+    assert max(correos.values()) == 1
+    assert sistema.ultimo_id >= max(ids)
+
+    for registro in registros:
+        assert sistema.correo_registrado(registro.correo) == registro.id
+    assert len(sistema._indice_correos._ids) == len(registros)
+    assert not sistema._indice_correos.duplicados()
+
+    conteos = Counter(r.carrera for r in registros)
+    assert dict(sistema.contar_por('carrera')) == dict(conteos)
+    for nombre in ('Estudiante 1', 'Nuevo 3', 'Cambiado'):
+        esperados = [r.id for r in registros if nombre.lower() in r.nombre.lower()]
+        assert [r.id for r in sistema.buscar_por_nombre(nombre)] == esperados
+
+
+@pytest.mark.parametrize('modo_almacen', ['objetos', 'columnar', 'perezoso'])
+def test_escrituras_y_lecturas_concurrentes(modo_almacen):
+    poblar('registros.csv', 3000)
+    sistema = RegistroAcademico(modo_almacen=modo_almacen, archivo_registros='registros.csv')
+    try:
+        if modo_almacen == 'perezoso':
+            assert not sistema._indices_listos  # Los lectores los construirán en plena carrera
+        assert estresar(sistema) == []
+        comprobar_consistencia(sistema)
+        # Cada pareja de hilos compitió por los mismos correos: solo uno ganó
+        assert len(sistema.registros) == 3000 + HILOS * ALTAS_POR_HILO * 3 // 4
+    finally:
+        sistema.cerrar()
+
+
+def test_datos_guardados_tras_la_carrera():
+    poblar('registros.csv', 200)
+    sistema = RegistroAcademico(modo_almacen='perezoso', archivo_registros='registros.csv')
+    try:
+        assert estresar(sistema) == []
+        sistema.guardar_datos()
+        esperados = {r.id: (r.nombre, r.correo) for r in sistema.registros}
+    finally:
+        sistema.cerrar()
+
+    recargado = RegistroAcademico(archivo_registros='registros.csv')
+    try:
+        assert {r.id: (r.nombre, r.correo) for r in recargado.registros} == esperados
+        comprobar_consistencia(recargado)
+    finally:
+        recargado.cerrar()
+
+
+def test_indices_se_publican_completos(monkeypatch):
+    poblar('registros.csv', 100)
+    sistema = RegistroAcademico(modo_almacen='perezoso', archivo_registros='registros.csv')
+    a_mitad, seguir = threading.Event(), threading.Event()
+    originales = RegistroAcademico.registros
+
+    def registros_pausados(self):
+        # Detiene la construcción de los índices a mitad de la pasada
+        for n, registro in enumerate(originales.fget(self)):
+            if n == 50:
+                a_mitad.set()
+                seguir.wait(5)
+            yield registro
+
+    with monkeypatch.context() as parche:
+        parche.setattr(RegistroAcademico, 'registros', property(registros_pausados))
+        constructor = threading.Thread(target=sistema._asegurar_indices)
+        constructor.start()
+        try:
+            assert a_mitad.wait(5)
+            # Lo que ve un lector sin cerrojo: ni la marca ni un índice a medias
+            assert not sistema._indices_listos
+            assert sistema._indice_correos.buscar('e10@uni.edu') is None
+        finally:
+            seguir.set()
+            constructor.join()
+    try:
+        assert sistema._indices_listos
+        comprobar_consistencia(sistema)
+    finally:
+        sistema.cerrar()
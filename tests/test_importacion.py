@@ -0,0 +1,63 @@
+"""
+Pruebas de la importación masiva y de su informe de errores.
+"""
+
+import json
+
+import pytest
+
+import importacion
+from conftest import poblar
+from registro_academico import RegistroAcademico
+
+
+@pytest.fixture
+def sistema():
+    poblar('registros.csv', 3)
+    sistema = RegistroAcademico()
+    yield sistema
+    sistema.cerrar(guardar=False)
+
+
+def test_informa_cada_fila_rechazada_con_su_linea(sistema):
+    with open('nuevos.csv', 'w', encoding='utf-8') as archivo:
+        archivo.write('tipo;nombre;correo;carrera;anio;departamento;titulo\n'
+                      'estudiante;Ana;ana@uni.edu;Física;2020;;\n'           # 2
+                      'alumno;Beto;beto@uni.edu;Física;2020;;\n'             # 3
+                      'estudiante;Ciro;ciro@uni.edu;Física;dos mil;;\n'      # 4
+                      'docente;Dora;ANA@uni.edu;;;Ciencias;Doctor\n'         # 5
+                      'estudiante;Eva;e1@uni.edu;Química;2021;;\n'           # 6
+                      'docente;Fabio;fabio@uni;;;Ciencias;Doctor\n'          # 7
+                      'docente;Gala;gala@uni.edu;;;Ciencias;\n'              # 8
+                      'docente;Hugo;hugo@uni.edu;;;Ciencias;Magíster\n')     # 9
+    # Bloques de 3: el correo repetido de la línea 5 está en otro bloque
+    resultado = importacion.importar(sistema, 'nuevos.csv', tamano_bloque=3, procesos=1)
+
+    assert resultado['importados'] == 2
+    lineas = [numero for numero, _ in resultado['errores']]
+    assert lineas == [3, 4, 5, 6, 7, 8]
+    motivos = dict(resultado['errores'])
+    assert motivos[3].startswith('Tipo no válido')
+    assert motivos[4].startswith('El año debe ser un número entero')
+    assert 'ya está registrado (ID 4)' in motivos[5]
+    assert 'ya está registrado (ID 2)' in motivos[6]
+    assert motivos[7].startswith('Correo con formato inválido')
+    assert motivos[8] == "Falta el campo obligatorio 'titulo'"
+    assert [(r.id, r.nombre) for r in sistema.registros][-2:] == [(4, 'Ana'), (5, 'Hugo')]
+
+
+def test_correo_repetido_dentro_del_archivo(sistema):
+    with open('nuevos.jsonl', 'w', encoding='utf-8') as archivo:
+        for fila in ({'tipo': 'estudiante', 'nombre': 'Ana', 'correo': 'ana@uni.edu',
+                      'carrera': 'Física', 'anio': 2020},
+                     {'tipo': 'estudiante', 'nombre': 'Ana Bis', 'correo': ' Ana@Uni.edu ',
+                      'carrera': 'Física', 'anio': 2021}):
+            archivo.write(json.dumps(fila) + '\n')
+        archivo.write('{no es json\n')
+    resultado = importacion.importar(sistema, 'nuevos.jsonl', 'jsonl', procesos=1)
+
+    assert resultado['importados'] == 1
+    assert [numero for numero, _ in resultado['errores']] == [2, 3]
+    assert 'Correo repetido' in resultado['errores'][0][1]
+    assert '(línea 1)' in resultado['errores'][0][1]
+    assert resultado['errores'][1][1].startswith('JSON inválido')
@@ -0,0 +1,49 @@
+"""
+Pruebas de la instrumentación de métricas.
+"""
+
+import os
+import threading
+
+from conftest import poblar
+from registro_academico import RegistroAcademico
+
+
+def test_bytes_por_instancia_y_por_hilo():
+    poblar('a.csv', 50)
+    poblar('b.csv', 5)
+    a = RegistroAcademico(archivo_registros='a.csv', metricas=True)
+    b = RegistroAcademico(archivo_registros='b.csv', metricas=True)
+    try:
+        # La carga de cada uno cuenta solo su propio archivo
+        assert a.metricas.instantanea()['operaciones']['cargar_datos']['bytes_leidos'] == \
+            os.path.getsize('a.csv')
+        assert b.metricas.instantanea()['operaciones']['cargar_datos']['bytes_leidos'] == \
+            os.path.getsize('b.csv')
+
+        # Mientras un hilo guarda, las lecturas de otro no se llevan sus bytes
+        listo = threading.Event()
+
+        def guardar():
+            for i in range(20):
+                a.agregar_estudiante(f"Nuevo {i}", f"n{i}@uni.edu", 'Física', 2024)
+                a.guardar_datos()
+            listo.set()
+
+        hilo = threading.Thread(target=guardar)
+        hilo.start()
+        while not listo.is_set():
+            a.buscar_por_id(1)
+            b.guardar_datos()
+        hilo.join()
+
+        operaciones = a.metricas.instantanea()['operaciones']
+        assert operaciones['buscar_por_id']['bytes_escritos'] == 0
+        assert operaciones['guardar_datos']['bytes_escritos'] == \
+            operaciones['compactar']['bytes_escritos'] > 0
+        # b no tenía cambios: sus guardados no escriben nada
+        guardados_b = b.metricas.instantanea()['operaciones'].get('guardar_datos')
+        assert guardados_b is None or guardados_b['bytes_escritos'] == 0
+    finally:
+        a.cerrar()
+        b.cerrar()
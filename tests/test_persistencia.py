@@ -0,0 +1,221 @@
+"""
+Pruebas del guardado en disco: instantáneas, journal, compactación y
+respaldos.
+"""
+
+import os
+
+import pytest
+
+from conftest import poblar
+from registro_academico import BackendCSV, ErrorRegistro, RegistroAcademico
+
+
+def test_journal_propio_para_cada_instantanea():
+    poblar('registros.csv', 3)
+    poblar('registros.bin', 2, modo_almacen='binario')
+    texto = RegistroAcademico(archivo_registros='registros.csv', usar_journal=True)
+    binario = RegistroAcademico(modo_almacen='binario', archivo_registros='registros.bin',
+                                usar_journal=True)
+    try:
+        texto.agregar_estudiante('Ana', 'ana@uni.edu', 'Física', 2020)
+        binario.agregar_estudiante('Beto', 'beto@uni.edu', 'Física', 2021)
+    finally:
+        texto.cerrar(guardar=False)
+        binario.cerrar(guardar=False)
+    assert os.path.exists('registros.csv.journal')
+    assert os.path.exists('registros.bin.journal')
+
+    # Cada uno reproduce solo sus propios cambios
+    texto = RegistroAcademico(archivo_registros='registros.csv', usar_journal=True)
+    binario = RegistroAcademico(modo_almacen='binario', archivo_registros='registros.bin',
+                                usar_journal=True)
+    try:
+        assert [r.nombre for r in texto.registros][-1] == 'Ana'
+        assert len(texto.registros) == 4
+        assert [r.nombre for r in binario.registros][-1] == 'Beto'
+        assert len(binario.registros) == 3
+    finally:
+        texto.cerrar()
+        binario.cerrar()
+
+
+def test_adopta_el_journal_de_versiones_anteriores():
+    poblar('registros.csv', 2)
+    with open('registros.journal', 'w', encoding='utf-8') as archivo:
+        archivo.write('alta;estudiante;3;Ana;ana@uni.edu;Física;2020\n'
+                      'baja;1\n')
+    sistema = RegistroAcademico(usar_journal=True)
+    try:
+        assert [r.id for r in sistema.registros] == [2, 3]
+        assert sistema.ultimo_id == 3
+    finally:
+        sistema.cerrar()
+    assert not os.path.exists('registros.journal')
+    assert os.path.exists('registros.csv.journal')
+
+
+def test_journal_se_reproduce_sin_guardar():
+    poblar('registros.csv', 5)
+    sistema = RegistroAcademico(usar_journal=True)
+    try:
+        ana = sistema.agregar_estudiante('Ana', 'ana@uni.edu', 'Física', 2020)
+        sistema.modificar_registro(2, nombre='Beto Cambiado', anio=2024)
+        sistema.eliminar_registro(3)
+    finally:
+        sistema.cerrar(guardar=False)  # Solo el journal tiene los cambios
+
+    sistema = RegistroAcademico(usar_journal=True)
+    try:
+        assert [r.id for r in sistema.registros] == [1, 2, 4, 5, ana.id]
+        assert (sistema.buscar_por_id(2).nombre, sistema.buscar_por_id(2).anio) == \
+            ('Beto Cambiado', 2024)
+        assert sistema.correo_registrado('ana@uni.edu') == ana.id
+        assert sistema.ultimo_id == ana.id
+        assert sistema.cambios_en_journal == 3
+    finally:
+        sistema.cerrar(guardar=False)
+
+
+def test_compacta_al_superar_el_umbral():
+    poblar('registros.csv', 2)
+    sistema = RegistroAcademico(usar_journal=True, umbral_compactacion=3)
+    try:
+        sistema.agregar_estudiante('Ana', 'ana@uni.edu', 'Física', 2020)
+        sistema.agregar_estudiante('Beto', 'beto@uni.edu', 'Física', 2020)
+        assert sistema.guardar_datos() is False  # Bajo el umbral: basta el journal
+        assert sistema.cambios_en_journal == 2
+
+        sistema.eliminar_registro(1)
+        assert sistema.guardar_datos() is True
+        assert sistema.cambios_en_journal == 0
+        assert os.path.getsize('registros.csv.journal') == 0
+    finally:
+        sistema.cerrar()
+
+    with open('registros.csv', encoding='utf-8') as archivo:
+        assert archivo.readline() == 'ultimo_id;4\n'
+    sistema = RegistroAcademico(usar_journal=True)
+    try:
+        assert [r.nombre for r in sistema.registros] == ['Estudiante 1', 'Ana', 'Beto']
+    finally:
+        sistema.cerrar()
+
+
+def test_instantanea_fallida_conserva_la_anterior(monkeypatch):
+    poblar('registros.csv', 3)
+    with open('registros.csv', 'rb') as archivo:
+        anterior = archivo.read()
+
+    def escribir_a_medias(self, file, registros, ultimo_id):
+        file.write('ultimo_id;99\nestudiante;1;Ana')
+        raise OSError("disco lleno")
+
+    sistema = RegistroAcademico()
+    try:
+        sistema.agregar_estudiante('Ana', 'ana@uni.edu', 'Física', 2020)
+        with monkeypatch.context() as parche:
+            parche.setattr(BackendCSV, '_escribir', escribir_a_medias)
+            with pytest.raises(ErrorRegistro, match='disco lleno'):
+                sistema.guardar_datos()
+        with open('registros.csv', 'rb') as archivo:
+            assert archivo.read() == anterior
+        assert not os.path.exists('registros.csv.tmp')
+        assert sistema.cambios_sin_guardar  # Sigue pendiente para el próximo guardado
+        assert sistema.guardar_datos() is True
+    finally:
+        sistema.cerrar()
+
+
+def test_no_reutiliza_el_id_del_ultimo_eliminado():
+    poblar('registros.csv', 3)
+    sistema = RegistroAcademico()
+    try:
+        sistema.eliminar_registro(3)
+        sistema.guardar_datos()
+    finally:
+        sistema.cerrar()
+    with open('registros.csv', encoding='utf-8') as archivo:
+        assert archivo.readline() == 'ultimo_id;3\n'
+
+    sistema = RegistroAcademico()
+    try:
+        assert sistema.agregar_estudiante('Ana', 'ana@uni.edu', 'Física', 2020).id == 4
+    finally:
+        sistema.cerrar()
+
+
+@pytest.mark.parametrize('formato', ['csv', 'jsonl'])
+def test_restaura_un_respaldo(formato):
+    poblar('registros.csv', 10)
+    sistema = RegistroAcademico(usar_journal=True)
+    try:
+        ruta = f'respaldo.{formato}.gz'
+        resumen = sistema.exportar_respaldo(ruta, formato, filas_por_bloque=3)
+        assert resumen['registros'] == 10
+        esperados = [(r.id, r.nombre, r.correo) for r in sistema.registros]
+
+        sistema.eliminar_registro(1)
+        sistema.modificar_registro(2, nombre='Otro Nombre')
+        nuevo = sistema.agregar_estudiante('Ana', 'ana@uni.edu', 'Física', 2020)
+        restaurado = sistema.cargar_datos(respaldo=ruta)
+        assert restaurado['registros'] == 10
+        assert restaurado['ultimo_id'] == nuevo.id  # No retrocede
+        assert [(r.id, r.nombre, r.correo) for r in sistema.registros] == esperados
+        assert sistema.correo_registrado('ana@uni.edu') is None
+        assert [r.id for r in sistema.buscar_por_nombre('estudiante 1')] == [2]
+        assert sistema.cambios_en_journal == 0
+    finally:
+        sistema.cerrar()
+
+    recargado = RegistroAcademico(usar_journal=True)
+    try:
+        assert [(r.id, r.nombre, r.correo) for r in recargado.registros] == esperados
+        assert recargado.ultimo_id == nuevo.id
+    finally:
+        recargado.cerrar()
+
+
+def test_respaldo_truncado_no_reemplaza_nada():
+    poblar('registros.csv', 10)
+    sistema = RegistroAcademico()
+    try:
+        sistema.exportar_respaldo('respaldo.csv.gz', filas_por_bloque=3)
+        with open('respaldo.csv.gz', 'rb') as archivo:
+            contenido = archivo.read()
+        with open('truncado.csv.gz', 'wb') as archivo:
+            archivo.write(contenido[:len(contenido) * 2 // 3])
+
+        sistema.eliminar_registro(1)
+        with pytest.raises(ErrorRegistro, match='No se pudo leer el respaldo'):
+            sistema.cargar_datos(respaldo='truncado.csv.gz')
+        assert [r.id for r in sistema.registros] == list(range(2, 11))
+        assert sistema.buscar_por_id(2).nombre == 'Estudiante 1'
+    finally:
+        sistema.cerrar(guardar=False)
+
+
+def test_perezoso_modificar_guardar_y_recargar():
+    poblar('registros.csv', 20)
+    sistema = RegistroAcademico(modo_almacen='perezoso')
+    try:
+        sistema.modificar_registro(5, nombre='Cambiado', correo='cambiado@uni.edu')
+        sistema.eliminar_registro(6)
+        nuevo = sistema.agregar_docente('Ciro', 'ciro@uni.edu', 'Matemáticas', 'Doctor')
+        sistema.guardar_datos()
+        # Tras el guardado lee del archivo nuevo
+        assert sistema.buscar_por_id(5).correo == 'cambiado@uni.edu'
+        assert sistema.correo_registrado('e4@uni.edu') is None
+        esperados = [(r.id, r.nombre, r.correo) for r in sistema.registros]
+    finally:
+        sistema.cerrar()
+
+    for modo in ('perezoso', 'objetos'):
+        recargado = RegistroAcademico(modo_almacen=modo)
+        try:
+            assert [(r.id, r.nombre, r.correo) for r in recargado.registros] == esperados
+            assert 6 not in [r.id for r in recargado.registros]
+            assert recargado.buscar_por_id(nuevo.id).titulo == 'Doctor'
+            assert recargado.ultimo_id == nuevo.id
+        finally:
+            recargado.cerrar()
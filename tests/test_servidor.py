@@ -0,0 +1,105 @@
+"""
+Pruebas del protocolo HTTP del servidor, arrancado como en producción.
+"""
+
+import http.client
+import json
+import os
+import signal
+import subprocess
+import sys
+
+import pytest
+
+from conftest import RAIZ, poblar
+from registro_academico import RegistroAcademico
+
+
+@pytest.fixture
+def servidor():
+    """
+    Arranca servidor_registro.py, con tres estudiantes ya guardados, en un
+    puerto libre y devuelve el proceso y su dirección.
+    """
+    poblar('registros.csv', 3)
+    proceso = subprocess.Popen([sys.executable, os.path.join(RAIZ, 'servidor_registro.py'),
+                                '--puerto', '0'],
+                               stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    try:
+        for linea in proceso.stdout:
+            if 'Servidor escuchando en http://' in linea:
+                host, puerto = linea.rsplit('http://', 1)[1].strip().rsplit(':', 1)
+                break
+        else:
+            pytest.fail("El servidor terminó sin escuchar")
+        yield proceso, host, int(puerto)
+    finally:
+        if proceso.poll() is None:
+            proceso.kill()
+        proceso.wait(10)
+        proceso.stdout.close()
+
+
+def pedir(conexion, metodo, ruta, cuerpo=None):
+    """
+    Envía una petición por la conexión (keep-alive) y decodifica la respuesta.
+
+    Returns:
+        tuple: (código de estado, datos JSON)
+    """
+    datos = None if cuerpo is None else json.dumps(cuerpo).encode('utf-8')
+    conexion.request(metodo, ruta, body=datos, headers={'Content-Type': 'application/json'})
+    respuesta = conexion.getresponse()
+    return respuesta.status, json.loads(respuesta.read())
+
+
+def test_protocolo_y_guardado_al_interrumpir(servidor):
+    proceso, host, puerto = servidor
+    conexion = http.client.HTTPConnection(host, puerto, timeout=10)
+    try:
+        estado, datos = pedir(conexion, 'GET', '/registros?orden=nombre&limite=2')
+        assert (estado, datos['total']) == (200, 3)
+        assert [r['id'] for r in datos['registros']] == [1, 2]
+
+        estado, ana = pedir(conexion, 'POST', '/registros',
+                            {'tipo': 'estudiante', 'nombre': 'Ana', 'correo': 'ana@uni.edu',
+                             'carrera': 'Física', 'anio': 2020})
+        assert (estado, ana['id'], ana['nombre']) == (201, 4, 'Ana')
+        assert pedir(conexion, 'GET', f"/registros/{ana['id']}") == (200, ana)
+
+        estado, datos = pedir(conexion, 'POST', '/registros',
+                              {'tipo': 'estudiante', 'nombre': 'Otra', 'correo': 'ANA@uni.edu',
+                               'carrera': 'Física', 'anio': 2020})
+        assert (estado, datos['id']) == (409, ana['id'])
+        assert pedir(conexion, 'POST', '/registros', {'tipo': 'alumno'})[0] == 400
+        assert pedir(conexion, 'PATCH', f"/registros/{ana['id']}", {'anio': 'dos'})[0] == 400
+        assert pedir(conexion, 'GET', '/registros/99')[0] == 404
+        assert pedir(conexion, 'GET', '/nada')[0] == 404
+        assert pedir(conexion, 'PUT', '/registros')[0] == 405
+
+        estado, datos = pedir(conexion, 'PATCH', f"/registros/{ana['id']}", {'nombre': 'Ana María'})
+        assert (estado, datos['nombre']) == (200, 'Ana María')
+        estado, datos = pedir(conexion, 'GET', '/registros?nombre=ana&limite=5')
+        assert (estado, datos['total'], datos['registros'][0]['nombre']) == (200, 1, 'Ana María')
+        assert pedir(conexion, 'DELETE', f"/registros/{ana['id']}") == \
+            (200, {'id': ana['id'], 'eliminado': True})
+        assert pedir(conexion, 'GET', f"/registros/{ana['id']}")[0] == 404
+
+        estado, beto = pedir(conexion, 'POST', '/registros',
+                             {'tipo': 'docente', 'nombre': 'Beto', 'correo': 'beto@uni.edu',
+                              'departamento': 'Ciencias', 'titulo': 'Doctor'})
+        assert estado == 201
+    finally:
+        conexion.close()
+
+    # Ctrl+C guarda los cambios pendientes antes de terminar
+    proceso.send_signal(signal.SIGINT)
+    salida, _ = proceso.communicate(timeout=30)
+    assert proceso.returncode == 0, salida
+    assert 'Guardando' in salida
+    sistema = RegistroAcademico()
+    try:
+        assert sistema.buscar_por_id(beto['id']).titulo == 'Doctor'
+        assert sistema.correo_registrado('ana@uni.edu') is None
+    finally:
+        sistema.cerrar()